@@ -0,0 +1,160 @@
+"""Microbenchmark: full json.loads vs field-selective decoding.
+
+    python -m benchmarks.bench_decode
+    python -m benchmarks.bench_decode --runs-file runs.json --repos-file repos.json
+
+Pass bodies recorded from /repos/{owner}/{repo}/actions/runs and
+/user/repos to measure real payloads. Without them, synthetic payloads
+with the same nesting and field counts are generated.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from gh_actions_notifier import models
+
+
+_USER_LINKS = (
+    "html",
+    "followers",
+    "following",
+    "gists",
+    "starred",
+    "subscriptions",
+    "organizations",
+    "repos",
+    "events",
+    "received_events",
+)
+
+
+def _user(i: int) -> dict:
+    user = {
+        "login": f"user{i}",
+        "id": 1000 + i,
+        "node_id": "MDQ6VXNlcjE=",
+        "avatar_url": "https://avatars.githubusercontent.com/u/1?v=4",
+        "gravatar_id": "",
+        "type": "User",
+        "site_admin": False,
+    }
+    for link in _USER_LINKS:
+        user[f"{link}_url"] = f"https://api.github.com/users/user{i}/{link}"
+    return user
+
+
+def _repo(i: int) -> dict:
+    repo = {
+        "id": i,
+        "node_id": "R_kgDOAAAAAA",
+        "name": f"repo{i}",
+        "full_name": f"bench/repo{i}",
+        "private": True,
+        "owner": _user(0),
+        "description": "A repository used to shape benchmark payloads " * 2,
+        "fork": False,
+        "created_at": "2020-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+        "pushed_at": "2024-06-01T00:00:00Z",
+        "archived": False,
+        "disabled": False,
+        "topics": ["ci", "python", "tools"],
+        "permissions": {"admin": True, "maintain": True, "push": True, "triage": True, "pull": True},
+        "license": {"key": "mit", "name": "MIT License", "spdx_id": "MIT", "url": None},
+    }
+    # The real object carries ~100 fields, most of them URL templates and counters
+    for j in range(60):
+        repo[f"field_{j}_url"] = f"https://api.github.com/repos/bench/repo{i}/field{j}{{/id}}"
+    for j in range(20):
+        repo[f"count_{j}"] = j
+    return repo
+
+
+def _run(i: int) -> dict:
+    return {
+        "id": 9_000_000 + i,
+        "name": "CI",
+        "node_id": "WFR_kwLOAAAAAA",
+        "head_branch": "main",
+        "head_sha": "0123456789abcdef0123456789abcdef01234567",
+        "path": ".github/workflows/ci.yml",
+        "display_title": "Update dependencies",
+        "run_number": i,
+        "event": "push",
+        "status": "completed",
+        "conclusion": "success",
+        "workflow_id": 42,
+        "check_suite_id": 7_000_000 + i,
+        "url": f"https://api.github.com/repos/bench/repo0/actions/runs/{9_000_000 + i}",
+        "html_url": f"https://github.com/bench/repo0/actions/runs/{9_000_000 + i}",
+        "pull_requests": [],
+        "created_at": "2024-06-01T00:00:00Z",
+        "updated_at": "2024-06-01T00:05:00Z",
+        "actor": _user(1),
+        "triggering_actor": _user(1),
+        "run_attempt": 1,
+        "run_started_at": "2024-06-01T00:00:00Z",
+        "head_commit": {
+            "id": "0123456789abcdef0123456789abcdef01234567",
+            "tree_id": "89abcdef0123456789abcdef0123456789abcdef",
+            "message": "Update dependencies\n\nLonger commit body text. " * 3,
+            "timestamp": "2024-06-01T00:00:00Z",
+            "author": {"name": "User", "email": "user@example.com"},
+            "committer": {"name": "GitHub", "email": "noreply@github.com"},
+        },
+        "repository": _repo(0),
+        "head_repository": _repo(0),
+    }
+
+
+def _bench(label: str, fn, payload: bytes, loops: int) -> None:
+    start = time.perf_counter()
+    for _ in range(loops):
+        fn(payload)
+    per_call = (time.perf_counter() - start) / loops
+
+    tracemalloc.start()
+    result = fn(payload)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(
+        f"  {label:<22} {per_call * 1e6:9.1f} us/call  "
+        f"peak {peak / 1024:8.1f} KiB  result {retained / 1024:8.1f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs-file", help="recorded /actions/runs response body")
+    parser.add_argument("--repos-file", help="recorded /user/repos response body")
+    parser.add_argument("--loops", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.runs_file:
+        with open(args.runs_file, "rb") as f:
+            runs = f.read()
+    else:
+        runs = json.dumps({"total_count": 25, "workflow_runs": [_run(i) for i in range(25)]}).encode()
+    if args.repos_file:
+        with open(args.repos_file, "rb") as f:
+            repos = f.read()
+    else:
+        repos = json.dumps([_repo(i) for i in range(100)]).encode()
+
+    backend = "msgspec" if models.msgspec is not None else "stdlib json (projection)"
+    print(f"Selective decoding backend: {backend}")
+    print(f"runs page ({len(runs) / 1024:.0f} KiB):")
+    _bench("json.loads", json.loads, runs, args.loops)
+    _bench("decode_runs_page", models.decode_runs_page, runs, args.loops)
+    print(f"repos page ({len(repos) / 1024:.0f} KiB):")
+    _bench("json.loads", json.loads, repos, args.loops)
+    _bench("decode_repos", models.decode_repos, repos, args.loops)
+
+
+if __name__ == "__main__":
+    main()
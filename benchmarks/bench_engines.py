@@ -0,0 +1,106 @@
+"""Compare the sync and async polling engines against a local fake API.
+
+    python -m benchmarks.bench_engines --repos 500 --latency 0.05
+
+Each engine polls every repo in one batch for a few cycles. The first
+cycle seeds state; the following cycles are the steady state, answered
+mostly with 304s.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fake_github import FakeGitHub
+
+
+class _NullNotifier:
+    def notify_run(self, **kwargs) -> None:
+        pass
+
+
+def _make_poller(engine: str, base_url: str, repos: int, workers: int, connections: int):
+    from gh_actions_notifier import poller as poller_mod
+    from gh_actions_notifier.github_api import GitHubClient
+    from gh_actions_notifier.state import StateManager
+
+    # Poll the whole account in a single batch
+    poller_mod.MAX_REPOS_PER_CYCLE = repos
+
+    state = StateManager()
+    state.token = "bench"
+    # Fixed batch, and every repo due every cycle
+    config = {
+        "allowlist": [],
+        "blocklist": [],
+        "poll_workers": workers,
+        "rate_budget": False,
+        "poll_interval": 0,
+        "max_repo_staleness": 0,
+    }
+    github = GitHubClient(state, pool_size=max(10, workers), base_url=base_url)
+    if engine == "async":
+        from gh_actions_notifier.github_async import AsyncGitHubClient
+
+        return poller_mod.AsyncPoller(
+            None,
+            config,
+            state,
+            github,
+            _NullNotifier(),
+            AsyncGitHubClient(github, max_connections=connections),
+        )
+    return poller_mod.Poller(None, config, state, github, _NullNotifier())
+
+
+def bench(
+    engine: str, fake: FakeGitHub, repos: int, workers: int, connections: int, cycles: int
+) -> list[float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["APPDATA"] = tmp
+        poller = _make_poller(engine, fake.base_url, repos, workers, connections)
+        timings = []
+        for _ in range(cycles):
+            start = time.perf_counter()
+            poller.poll_once()
+            timings.append(time.perf_counter() - start)
+        poller.close()
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=16, help="poll_workers for the sync engine")
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=4,
+        help="async_max_connections; the fake server speaks HTTP/1.1 only",
+    )
+    args = parser.parse_args()
+
+    fake = FakeGitHub(repos=args.repos, latency=args.latency)
+    fake.start()
+    try:
+        runs = [("sync", 1), ("sync", args.workers), ("async", 1)]
+        for engine, workers in runs:
+            fake.reset_counters()
+            timings = bench(engine, fake, args.repos, workers, args.connections, args.cycles)
+            label = f"{engine} (workers={workers})" if engine == "sync" else engine
+            print(
+                f"{label:<22} first={timings[0]:.2f}s "
+                f"steady={min(timings[1:], default=timings[0]):.2f}s "
+                f"requests={fake.request_count} 304s={fake.not_modified_count}"
+            )
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""Load-test the real poll loop against a simulated account.
+
+    python -m benchmarks.bench_load --repos 500 --rate 30 --duration 120 \\
+        --output results.json
+
+A fake GitHub API serves N repos while a simulator starts runs at a
+Poisson rate (mostly in a few hot repos) and completes each after a
+fixed duration. The poller runs headless, the way app.py drives it:
+a cycle, then the in-flight fast lane until the planned interval is up.
+The notifier is a stub that records when each run was announced.
+
+Reported per cycle: API calls, 304s, wall time and state-file writes.
+Overall: completion-to-notify latency, missed and duplicate
+notifications, peak Python memory and the faults served. Intervals are
+scaled down (see --poll-interval) so a short run covers many cycles.
+Results are written as JSON; --baseline prints the change against an
+earlier results file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.fake_github import FakeGitHub
+
+WARMUP_MAX_CYCLES = 200
+DRAIN_MAX_SECONDS = 600
+PARAMS = (
+    "engine",
+    "repos",
+    "rate",
+    "run_duration",
+    "hot_share",
+    "failure_rate",
+    "latency",
+    "error_rate",
+    "secondary_every",
+    "rate_limit",
+    "poll_interval",
+    "max_staleness",
+    "duration",
+    "seed",
+)
+
+
+class _RecordingNotifier:
+    """Notifier stub that timestamps each announced run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.notified: dict[int, list[float]] = {}
+
+    def notify_run(self, repo, workflow, branch, conclusion, url, head_sha=None) -> None:
+        run_id = int(url.rstrip("/").rsplit("/", 1)[-1])
+        with self._lock:
+            self.notified.setdefault(run_id, []).append(time.time())
+
+    def close(self) -> None:
+        pass
+
+
+class RunSimulator(threading.Thread):
+    """Starts runs at a Poisson rate and completes them after run_duration."""
+
+    def __init__(
+        self,
+        fake: FakeGitHub,
+        rate_per_minute: float,
+        run_duration: float,
+        hot_share: float,
+        failure_rate: float,
+        seed: int | None,
+    ) -> None:
+        super().__init__(name="simulator", daemon=True)
+        self._fake = fake
+        self._rate = rate_per_minute / 60
+        self._duration = run_duration
+        self._random = random.Random(seed)
+        self._failure_rate = failure_rate
+        names = fake.repo_names
+        self._hot = names[: max(1, len(names) // 10)]
+        self._hot_share = hot_share
+        self._stopping = threading.Event()
+        self._running: list[tuple[float, dict]] = []  # (completes at, run)
+        self.started: list[int] = []
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.join()
+
+    def _pick_repo(self) -> str:
+        pool = self._hot if self._random.random() < self._hot_share else self._fake.repo_names
+        return self._random.choice(pool)
+
+    def run(self) -> None:
+        if self._rate <= 0:
+            return
+        next_arrival = time.time() + self._random.expovariate(self._rate)
+        while not self._stopping.is_set():
+            now = time.time()
+            if now >= next_arrival:
+                run = self._fake.add_run(self._pick_repo(), conclusion=None, status="in_progress")
+                self.started.append(run["id"])
+                self._running.append((now + self._duration, run))
+                next_arrival += self._random.expovariate(self._rate)
+            while self._running and self._running[0][0] <= now:
+                _, run = self._running.pop(0)
+                failed = self._random.random() < self._failure_rate
+                self._fake.complete_run(run, "failure" if failed else "success")
+            wake = min(next_arrival, self._running[0][0] if self._running else next_arrival)
+            self._stopping.wait(max(0.0, min(wake - time.time(), 0.1)))
+
+
+def _snapshot_files(root: Path) -> dict[str, tuple[int, int]]:
+    """Map each file under root to (size, mtime_ns)."""
+    files = {}
+    for path in root.rglob("*"):
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+        if path.is_file():
+            files[str(path.relative_to(root))] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def _file_writes(
+    before: dict[str, tuple[int, int]], after: dict[str, tuple[int, int]]
+) -> tuple[int, int]:
+    """Return (files written, their bytes) between two snapshots."""
+    written = [name for name, stat in after.items() if before.get(name) != stat]
+    return len(written), sum(after[name][0] for name in written)
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _make_poller(engine: str, config: dict, base_url: str, notifier):
+    from gh_actions_notifier import poller as poller_mod
+    from gh_actions_notifier.github_api import GitHubClient
+    from gh_actions_notifier.state import open_state
+    from gh_actions_notifier.tokens import TokenPool
+
+    state = open_state(config)
+    state.token = "bench"
+    github = GitHubClient(
+        state,
+        pool_size=max(10, config.get("poll_workers", 1)),
+        base_url=base_url,
+        tokens=TokenPool(state, config.get("token_pool")),
+    )
+    github.exclude_pull_requests = config.get("exclude_pull_requests", True)
+    if engine == "async":
+        from gh_actions_notifier.github_async import AsyncGitHubClient
+
+        async_github = AsyncGitHubClient(
+            github, max_connections=config.get("async_max_connections", 4)
+        )
+        poller = poller_mod.AsyncPoller(None, config, state, github, notifier, async_github)
+    else:
+        poller = poller_mod.Poller(None, config, state, github, notifier)
+    return poller, state
+
+
+class LoadRun:
+    """One benchmark run: warm-up, load phase, drain."""
+
+    def __init__(self, args, fake: FakeGitHub, appdata: Path) -> None:
+        from gh_actions_notifier.config import DEFAULT_CONFIG
+
+        self.args = args
+        self.fake = fake
+        self.appdata = appdata
+        self.config = {
+            **DEFAULT_CONFIG,
+            "poll_interval": args.poll_interval,
+            "min_poll_interval": args.poll_interval / 3,
+            "inflight_poll_interval": args.poll_interval / 3,
+            "max_repo_staleness": args.max_staleness,
+            "event_sweep_interval": args.max_staleness,
+            **json.loads(args.config or "{}"),
+        }
+        self.notifier = _RecordingNotifier()
+        self.poller, self.state = _make_poller(
+            args.engine, self.config, fake.base_url, self.notifier
+        )
+        self.cycles: list[dict] = []
+        self.inflight_requests = 0
+
+    def _cycle(self) -> dict:
+        fake = self.fake
+        files = _snapshot_files(self.appdata)
+        requests, not_modified, faults = (
+            fake.request_count,
+            fake.not_modified_count,
+            fake.fault_count,
+        )
+        graphql = fake.graphql_count
+        start = time.perf_counter()
+        try:
+            self.poller.poll_once()
+        except Exception as e:
+            print(f"poll error: {e}")
+        wall = time.perf_counter() - start
+        writes, written = _file_writes(files, _snapshot_files(self.appdata))
+        return {
+            "wall_s": wall,
+            "requests": fake.request_count - requests,
+            "not_modified": fake.not_modified_count - not_modified,
+            "graphql": fake.graphql_count - graphql,
+            "faults": fake.fault_count - faults,
+            "state_writes": writes,
+            "state_bytes": written,
+            "next_interval_s": self.poller.next_interval,
+        }
+
+    def _wait(self, interval: float) -> None:
+        """Sleep until the next cycle, ticking the in-flight lane like app.py."""
+        deadline = time.monotonic() + interval
+        tick = self.config["inflight_poll_interval"]
+        while (remaining := deadline - time.monotonic()) > 0:
+            time.sleep(min(remaining, tick))
+            if self.config.get("track_inflight", True) and time.monotonic() < deadline:
+                before = self.fake.request_count
+                try:
+                    self.poller.poll_inflight()
+                except Exception as e:
+                    print(f"in-flight poll error: {e}")
+                self.inflight_requests += self.fake.request_count - before
+
+    def _polled_since(self, when: float) -> bool:
+        scheduler = self.poller._scheduler
+        return all(
+            scheduler.last_polled(f"{self.fake.owner}/{name}") > when
+            for name in self.fake.repo_names
+        )
+
+    def warm_up(self) -> int:
+        """Poll until every repo is seeded; return the cycles it took."""
+        names = [f"{self.fake.owner}/{n}" for n in self.fake.repo_names]
+        for cycle in range(1, WARMUP_MAX_CYCLES + 1):
+            self._cycle()
+            if not any(self.state.get_seen_window(n).is_empty for n in names):
+                return cycle
+        return WARMUP_MAX_CYCLES
+
+    def run(self) -> dict:
+        args = self.args
+        warmup_cycles = self.warm_up()
+        self.fake.reset_counters()
+        self.fake.completed_at.clear()
+        simulator = RunSimulator(
+            self.fake, args.rate, args.run_duration, args.hot_share, args.failure_rate, args.seed
+        )
+        tracemalloc.start()
+        start = time.monotonic()
+        simulator.start()
+        while time.monotonic() - start < args.duration:
+            self.cycles.append(self._cycle())
+            self._wait(self.poller.next_interval or args.poll_interval)
+        simulator.stop()
+        # Poll until every repo has been polled again, so a run that completed
+        # at the very end only counts as missed if the poller never finds it
+        stopped_at = time.time()
+        drain_until = time.monotonic() + DRAIN_MAX_SECONDS
+        while time.monotonic() < drain_until and not self._polled_since(stopped_at):
+            self._wait(self.poller.next_interval or args.poll_interval)
+            self.cycles.append(self._cycle())
+        elapsed = time.monotonic() - start
+        _, peak = tracemalloc.get_traced_memory()
+        package_bytes = sum(
+            stat.size
+            for stat in tracemalloc.take_snapshot().statistics("filename")
+            if "gh_actions_notifier" in stat.traceback[0].filename
+        )
+        tracemalloc.stop()
+        self.poller.close()
+        self.state.flush()
+        return self._report(simulator, warmup_cycles, elapsed, peak, package_bytes)
+
+    def _report(self, simulator, warmup_cycles, elapsed, peak, package_bytes) -> dict:
+        args = self.args
+        completed = dict(self.fake.completed_at)
+        notified = self.notifier.notified
+        latencies = [
+            notified[run_id][0] - done for run_id, done in completed.items() if run_id in notified
+        ]
+        missed = [run_id for run_id in completed if run_id not in notified]
+        duplicates = sum(len(times) - 1 for times in notified.values())
+        walls = [c["wall_s"] for c in self.cycles]
+        requests = [c["requests"] for c in self.cycles]
+        return {
+            "params": {
+                **{key: getattr(args, key) for key in PARAMS},
+                "config": json.loads(args.config or "{}"),
+            },
+            "summary": {
+                "elapsed_s": elapsed,
+                "warmup_cycles": warmup_cycles,
+                "cycles": len(self.cycles),
+                "runs_started": len(simulator.started),
+                "runs_completed": len(completed),
+                "notified": len(notified),
+                "missed": len(missed),
+                "duplicates": duplicates,
+                "requests": self.fake.request_count,
+                "requests_per_minute": self.fake.request_count / elapsed * 60,
+                "not_modified": self.fake.not_modified_count,
+                "graphql": self.fake.graphql_count,
+                "faults": self.fake.fault_count,
+                "inflight_requests": self.inflight_requests,
+                "requests_per_cycle_mean": statistics.fmean(requests) if requests else None,
+                "cycle_wall_mean_s": statistics.fmean(walls) if walls else None,
+                "cycle_wall_p50_s": _percentile(walls, 50),
+                "cycle_wall_p95_s": _percentile(walls, 95),
+                "notify_latency_p50_s": _percentile(latencies, 50),
+                "notify_latency_p95_s": _percentile(latencies, 95),
+                "notify_latency_max_s": max(latencies, default=None),
+                "memory_peak_bytes": peak,
+                "memory_package_bytes": package_bytes,
+                "state_writes": sum(c["state_writes"] for c in self.cycles),
+                "state_bytes_written": sum(c["state_bytes"] for c in self.cycles),
+                "rate_remaining": self.fake.rate_remaining,
+            },
+            "missed_run_ids": missed[:100],
+            "cycles": self.cycles,
+        }
+
+
+def _print_summary(summary: dict, baseline: dict | None) -> None:
+    for key, value in summary.items():
+        line = f"{key:<26} {value:.3f}" if isinstance(value, float) else f"{key:<26} {value}"
+        old = (baseline or {}).get(key)
+        if isinstance(value, (int, float)) and isinstance(old, (int, float)):
+            change = f"{(value - old) / old:+.1%}" if old else f"{value - old:+g}"
+            line += f"   (baseline {old:.6g}, {change})"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engine", choices=("sync", "async"), default="sync")
+    parser.add_argument("--repos", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=30, help="new runs per minute, account-wide")
+    parser.add_argument(
+        "--run-duration", type=float, default=5, help="seconds from start to completion"
+    )
+    parser.add_argument(
+        "--hot-share", type=float, default=0.8, help="share of runs in the busiest 10%% of repos"
+    )
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per API request")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="share of requests failing with 502"
+    )
+    parser.add_argument(
+        "--secondary-every", type=int, default=0, help="secondary-limit 403 every N requests"
+    )
+    parser.add_argument("--rate-limit", type=int, default=5000, help="primary limit per hour")
+    parser.add_argument("--poll-interval", type=float, default=3, help="scaled-down poll_interval")
+    parser.add_argument(
+        "--max-staleness", type=float, default=15, help="scaled-down max_repo_staleness"
+    )
+    parser.add_argument("--duration", type=float, default=60, help="seconds of simulated load")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--config", help="JSON object of extra config keys, e.g. '{\"event_feed\": true}'"
+    )
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    fake = FakeGitHub(
+        repos=args.repos,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        secondary_limit_every=args.secondary_every,
+        seed=args.seed,
+    )
+    fake.start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["APPDATA"] = tmp
+            results = LoadRun(args, fake, Path(tmp)).run()
+    finally:
+        fake.stop()
+
+    baseline = None
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())["summary"]
+    _print_summary(results["summary"], baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
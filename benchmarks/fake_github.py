@@ -0,0 +1,303 @@
+"""Local stand-in for the GitHub REST API used by the benchmarks.
+
+Serves just enough of the API for the poll loop: /user, /rate_limit,
+paginated /user/repos, /repos/{owner}/{repo}/actions/runs and the
+user's events feed, with ETags and X-RateLimit-* headers. POST /graphql
+answers the discovery query by its variables alone, reporting each repo's
+latest runs as check suites on the default branch. Every request sleeps
+for a fixed latency to approximate a real round trip.
+
+The primary rate limit is counted down by every response except 304s and
+answered with 403 once exhausted. Faults can be injected: a share of
+requests failing with 502, and a secondary-limit 403 with Retry-After
+every N requests.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class FakeGitHub:
+    """A threaded HTTP server simulating N repos with a few runs each."""
+
+    def __init__(
+        self,
+        repos: int = 100,
+        runs_per_repo: int = 5,
+        latency: float = 0.05,
+        owner: str = "bench",
+        rate_limit: int = 5000,
+        error_rate: float = 0.0,
+        secondary_limit_every: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        self.owner = owner
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_remaining = rate_limit
+        self.rate_reset = int(time.time()) + 3600
+        self.error_rate = error_rate
+        self.secondary_limit_every = secondary_limit_every
+        self._random = random.Random(seed)
+        # Run ID -> wall time it completed, for completion-to-notify latency
+        self.completed_at: dict[int, float] = {}
+        self.repo_names = [f"repo{i:05d}" for i in range(repos)]
+        self.runs: dict[str, list[dict]] = {}
+        self.events: list[dict] = []  # Newest first, like the API
+        self.event_poll_interval = 0
+        self._next_run_id = 1
+        self._next_event_id = 1
+        self._lock = threading.Lock()
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.graphql_count = 0
+        self.fault_count = 0
+        for name in self.repo_names:
+            for _ in range(runs_per_repo):
+                self.add_run(name)
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def add_run(
+        self, repo: str, conclusion: str | None = "success", status: str = "completed"
+    ) -> dict:
+        """Append a run to a repo and return it."""
+        with self._lock:
+            run_id = self._next_run_id
+            self._next_run_id += 1
+            now = time.time()
+            run = {
+                "id": run_id,
+                "name": "CI",
+                "head_branch": "main",
+                "head_sha": f"{run_id:040x}",
+                "status": status,
+                "conclusion": conclusion,
+                "html_url": f"https://github.com/{self.owner}/{repo}/actions/runs/{run_id}",
+                "created_at": datetime.fromtimestamp(now, timezone.utc).strftime(
+                    "%Y-%m-%dT%H:%M:%SZ"
+                ),
+            }
+            if status == "completed":
+                self.completed_at[run_id] = now
+            self.runs.setdefault(repo, []).insert(0, run)
+            # Each run is announced by the push that triggered it
+            self.events.insert(
+                0,
+                {
+                    "id": str(self._next_event_id),
+                    "type": "PushEvent",
+                    "repo": {"name": f"{self.owner}/{repo}"},
+                },
+            )
+            self._next_event_id += 1
+            return run
+
+    def complete_run(self, run: dict, conclusion: str = "success") -> None:
+        with self._lock:
+            run["status"] = "completed"
+            run["conclusion"] = conclusion
+            self.completed_at[run["id"]] = time.time()
+
+    def _fault(self) -> tuple[int, dict, dict] | None:
+        """Return an injected failure for the next request, if any (caller holds the lock)."""
+        if self.secondary_limit_every and self.request_count % self.secondary_limit_every == 0:
+            body = {"message": "You have exceeded a secondary rate limit."}
+            return 403, body, {"Retry-After": "1"}
+        if self.error_rate and self._random.random() < self.error_rate:
+            return 502, {"message": "Server Error"}, {}
+        return None
+
+    def _spend(self, not_modified: bool) -> bool:
+        """Count a request against the primary limit; False once it is exhausted."""
+        now = time.time()
+        if now >= self.rate_reset:
+            self.rate_remaining = self.rate_limit
+            self.rate_reset = int(now) + 3600
+        if not_modified:
+            return True
+        if self.rate_remaining <= 0:
+            return False
+        self.rate_remaining -= 1
+        return True
+
+    def _rate_headers(self) -> dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(self.rate_remaining, 0)),
+            "X-RateLimit-Reset": str(self.rate_reset),
+        }
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.request_count = 0
+            self.not_modified_count = 0
+            self.graphql_count = 0
+            self.fault_count = 0
+
+    def route(self, path: str, query: dict[str, list[str]]) -> tuple[int, object, dict]:
+        """Return (status, body, extra headers) for a GET request."""
+        if path == "/user":
+            return 200, {"login": self.owner}, {}
+        if path == "/rate_limit":
+            core = {
+                "limit": self.rate_limit,
+                "remaining": max(self.rate_remaining, 0),
+                "reset": self.rate_reset,
+            }
+            return 200, {"resources": {"core": core}, "rate": core}, {}
+        if path == "/user/repos":
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            start = (page - 1) * per_page
+            names = self.repo_names[start : start + per_page]
+            body = [
+                {"id": i + start, "full_name": f"{self.owner}/{n}"} for i, n in enumerate(names)
+            ]
+            headers = {}
+            if start + per_page < len(self.repo_names):
+                headers["Link"] = (
+                    f'<{self.base_url}/user/repos?per_page={per_page}&page={page + 1}>; rel="next"'
+                )
+            return 200, body, headers
+        if path == f"/users/{self.owner}/events":
+            per_page = int(query.get("per_page", ["30"])[0])
+            headers = {"X-Poll-Interval": str(self.event_poll_interval)}
+            return 200, self.events[:per_page], headers
+        parts = path.strip("/").split("/")
+        if len(parts) >= 5 and parts[0] == "repos" and parts[3:5] == ["actions", "runs"]:
+            runs = self.runs.get(parts[2], [])
+            if len(parts) == 6:
+                run = next((r for r in runs if str(r["id"]) == parts[5]), None)
+                return (200, run, {}) if run else (404, {"message": "Not Found"}, {})
+            status = query.get("status", [None])[0]
+            if status:
+                runs = [r for r in runs if r["status"] == status]
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            start = (page - 1) * per_page
+            headers = {}
+            if start + per_page < len(runs):
+                params = {k: v[0] for k, v in query.items() if k != "page"}
+                qs = "&".join(f"{k}={v}" for k, v in params.items())
+                headers["Link"] = f'<{self.base_url}{path}?{qs}&page={page + 1}>; rel="next"'
+            body = {"total_count": len(runs), "workflow_runs": runs[start : start + per_page]}
+            return 200, body, headers
+        return 404, {"message": "Not Found"}, {}
+
+    def graphql(self, variables: dict[str, str]) -> dict:
+        """Answer a discovery query: r{i} is the repo named by $o{i}/$n{i}."""
+        data: dict = {"rateLimit": {"cost": 1, "remaining": 4999, "resetAt": None}}
+        i = 0
+        while f"n{i}" in variables:
+            name = variables[f"n{i}"]
+            if variables[f"o{i}"] != self.owner or name not in self.runs:
+                data[f"r{i}"] = None
+            else:
+                suites = [
+                    {
+                        "status": r["status"].upper(),
+                        "conclusion": (r["conclusion"] or "").upper() or None,
+                        "workflowRun": {"databaseId": r["id"]},
+                    }
+                    for r in self.runs[name][:10]
+                ]
+                data[f"r{i}"] = {
+                    "defaultBranchRef": {"target": {"checkSuites": {"nodes": suites}}},
+                    "refs": {"nodes": []},
+                }
+            i += 1
+        return {"data": data}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakeGitHub
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        # Headers and body are written separately; avoid delayed-ACK stalls
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        fake = self.fake
+        time.sleep(fake.latency)
+        length = int(self.headers.get("Content-Length", "0"))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if urlsplit(self.path).path != "/graphql":
+            status, body = 404, {"message": "Not Found"}
+        else:
+            status, body = 200, fake.graphql(request.get("variables") or {})
+        with fake._lock:
+            fake.request_count += 1
+            fake.graphql_count += 1
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        fake = self.fake
+        time.sleep(fake.latency)
+        url = urlsplit(self.path)
+        with fake._lock:
+            fake.request_count += 1
+            fault = fake._fault()
+            if fault is not None:
+                fake.fault_count += 1
+        if fault is not None:
+            status, body, headers = fault
+        else:
+            status, body, headers = fake.route(url.path, parse_qs(url.query))
+        payload = json.dumps(body).encode()
+        etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+        with fake._lock:
+            not_modified = status == 200 and self.headers.get("If-None-Match") == etag
+            if not_modified:
+                fake.not_modified_count += 1
+            if not fake._spend(not_modified):
+                status, not_modified = 403, False
+                payload = json.dumps({"message": "API rate limit exceeded"}).encode()
+            rate_headers = fake._rate_headers()
+        self.send_response(304 if not_modified else status)
+        self.send_header("ETag", etag)
+        for k, v in {**rate_headers, **headers}.items():
+            self.send_header(k, v)
+        if not_modified:
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
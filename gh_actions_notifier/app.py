@@ -9,18 +9,27 @@ from __future__ import annotations
 import logging
 import os
 import threading
+import time
 from pathlib import Path
 
+from . import metrics, tracing
 from .auth import Authenticator
-from .config import load_config
+from .config import ConfigWatcher, load_config
 from .github_api import GitHubClient
+from .logsetup import LogPipeline
 from .notifier import Notifier
-from .poller import Poller
-from .state import StateManager
+from .poller import AsyncPoller, Poller
+from .state import open_state
+from .tokens import TokenPool
 from .tray import TrayIcon
+from .webhook import DEFAULT_HOST, DEFAULT_PORT, WebhookServer
 
 log = logging.getLogger(__name__)
 
+TRACE_FILE = "trace.json"
+PROFILE_FILE = "profile.prof"
+SHUTDOWN_TIMEOUT = 10  # Seconds Quit waits for a running poll cycle to finish
+
 
 def _log_dir() -> Path:
     return Path(os.environ.get("APPDATA", Path.home())) / "gh-actions-notifier"
@@ -30,45 +39,136 @@ class Application:
     """Top-level application coordinating all components."""
 
     def __init__(self) -> None:
-        self.log_path = self._setup_logging()
         self.config = load_config()
-        self.state = StateManager()
-        self.github = GitHubClient(self.state)
+        self._logs = LogPipeline(_log_dir() / "app.log")
+        self._logs.start(self.config)
+        self.log_path = self._logs.log_file
+        self.state = open_state(self.config)
+        # Every poll worker needs its own pooled connection
+        pool_size = max(self.config.get("http_pool_size", 10), self.config.get("poll_workers", 1))
+        tokens = TokenPool(self.state, self.config.get("token_pool", []))
+        self.github = GitHubClient(self.state, pool_size=pool_size, tokens=tokens)
+        self.github.exclude_pull_requests = self.config.get("exclude_pull_requests", True)
         self.auth = Authenticator(self.config, self.state, self.github)
         self.notifier = Notifier()
-        self.poller = Poller(self, self.config, self.state, self.github, self.notifier)
+        self.poller = self._create_poller()
+        self.webhook: WebhookServer | None = None
+        self.metrics_server: metrics.MetricsServer | None = None
+        self.config_watcher: ConfigWatcher | None = None
+        self.profiler = tracing.CycleProfiler()
         self.tray = TrayIcon(self)
 
+        self._loop_thread: threading.Thread | None = None
+        self._closed = False
+        self._close_lock = threading.Lock()
         self._stop_event = threading.Event()
         self._poll_now_event = threading.Event()
         self._auth_requested = threading.Event()
         self.status_text = "Disconnected"
+        # Non-empty while API requests are paused (outage or secondary limit)
+        self.api_status = ""
+        # Summary of the last poll cycle, shown once one has run
+        self.metrics_status = ""
 
-    def _setup_logging(self) -> Path:
-        log_dir = _log_dir()
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / "app.log"
-        logging.basicConfig(
-            level=logging.INFO,
-            format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-            handlers=[
-                logging.FileHandler(log_file, encoding="utf-8"),
-                logging.StreamHandler(),
-            ],
-        )
-        return log_file
+    def _create_poller(self) -> Poller:
+        """Build the polling engine selected by the "engine" config key."""
+        if self.config.get("engine", "sync") == "async":
+            try:
+                from .github_async import AsyncGitHubClient
+            except ImportError:
+                log.error("Async engine requires httpx; falling back to sync engine")
+            else:
+                async_github = AsyncGitHubClient(
+                    self.github, max_connections=self.config.get("async_max_connections", 4)
+                )
+                log.info("Using async polling engine")
+                return AsyncPoller(
+                    self, self.config, self.state, self.github, self.notifier, async_github
+                )
+        return Poller(self, self.config, self.state, self.github, self.notifier)
+
+    def _start_webhook(self) -> None:
+        """Start the webhook receiver if configured; polling then only reconciles."""
+        if not self.config.get("webhook"):
+            return
+        try:
+            self.webhook = WebhookServer(
+                self.poller,
+                self.config.get("webhook_secret", ""),
+                host=self.config.get("webhook_host", DEFAULT_HOST),
+                port=self.config.get("webhook_port", DEFAULT_PORT),
+            )
+            self.webhook.start()
+        except (ValueError, OSError) as e:
+            log.error("Webhook receiver not started, polling instead: %s", e)
+            self.webhook = None
+            return
+        self.poller.webhook_active = True
+
+    def _start_metrics(self) -> None:
+        """Serve metrics on localhost if configured."""
+        if not self.config.get("metrics_endpoint"):
+            return
+        try:
+            self.metrics_server = metrics.MetricsServer(
+                port=self.config.get("metrics_port", metrics.DEFAULT_PORT)
+            )
+            self.metrics_server.start()
+        except OSError as e:
+            log.error("Metrics endpoint not started: %s", e)
+            self.metrics_server = None
+
+    def _start_config_watcher(self) -> None:
+        """Reload config.json whenever it is saved, if configured."""
+        if not self.config.get("watch_config", True):
+            return
+        self.config_watcher = ConfigWatcher(self.reload_config)
+        self.config_watcher.start()
+
+    def set_tracing(self, enabled: bool) -> None:
+        """Start or stop span tracing, and cProfile sampling if configured."""
+        if enabled == tracing.TRACER.enabled:
+            return
+        if enabled:
+            tracing.TRACER.start(_log_dir() / TRACE_FILE)
+            cycles = self.config.get("profile_cycles", 0)
+            if cycles > 0:
+                self.profiler.arm(cycles, _log_dir() / PROFILE_FILE)
+            self.status_text = "Recording trace"
+        else:
+            path = tracing.TRACER.stop()
+            self.status_text = f"Trace saved to {path}" if path else "Trace not saved"
+        self.tray.update_menu()
+
+    def toggle_tracing(self) -> None:
+        self.set_tracing(not tracing.TRACER.enabled)
 
     def run(self) -> None:
         log.info("Starting GH Actions Notifier")
-        self.tray.run(setup_callback=self._on_tray_ready)
+        try:
+            self.tray.run(setup_callback=self._on_tray_ready)
+        finally:
+            # The icon is gone; let a cycle that outlasted Quit finish and close the state
+            if self._loop_thread is not None:
+                self._loop_thread.join()
+            self._logs.stop()
 
     def _on_tray_ready(self, icon) -> None:
         """Called by pystray in a background thread after the icon is visible."""
         icon.visible = True
         log.info("Tray icon visible")
-        threading.Thread(target=self._background_loop, daemon=True).start()
+        self._loop_thread = threading.Thread(
+            target=self._background_loop, name="poll-loop", daemon=True
+        )
+        self._loop_thread.start()
 
     def _background_loop(self) -> None:
+        self._start_webhook()
+        self._start_metrics()
+        self._start_config_watcher()
+        if self.config.get("trace"):
+            self.set_tracing(True)
+
         # Try to authenticate with existing token
         if self.state.token:
             user = self.github.get_user()
@@ -79,27 +179,64 @@ class Application:
                 self._set_disconnected("Token expired")
 
         while not self._stop_event.is_set():
-            # Handle auth requests
-            if self._auth_requested.is_set():
-                self._auth_requested.clear()
-                self._do_auth()
-
-            # Poll if connected
-            if self.state.token:
-                self.tray.set_icon("polling")
+            with tracing.span("loop"):
+                # Handle auth requests
+                if self._auth_requested.is_set():
+                    self._auth_requested.clear()
+                    self._do_auth()
+
+                # Poll if connected
+                if self.state.token:
+                    self.tray.set_icon("polling")
+                    self.profiler.begin_cycle()
+                    try:
+                        self.poller.poll_once()
+                        self.tray.set_icon("ok")
+                    except Exception as e:
+                        log.error("Poll error: %s", e)
+                        self.tray.set_icon("error")
+                        self.status_text = f"Error: {e}"
+                        self.tray.update_menu()
+                    self.profiler.end_cycle()
+                    self._update_tray_status()
+
+                # Interruptible sleep
+                interval = self.poller.next_interval or self.config.get("poll_interval", 30)
+                with tracing.span("wait", interval=interval):
+                    self._wait_for_next_cycle(interval)
+
+        self.profiler.finish()
+        self.poller.close()
+        self._close_resources()
+
+    def _update_tray_status(self) -> None:
+        """Reflect the circuit breaker and the last cycle's figures in the tray."""
+        status = self.github.breaker.status_text()
+        if status:
+            self.tray.set_icon("error")
+        summary = metrics.summary_text()
+        if status != self.api_status or summary != self.metrics_status:
+            self.api_status = status
+            self.metrics_status = summary
+            self.tray.update_menu()
+
+    def _wait_for_next_cycle(self, interval: float) -> None:
+        """Sleep until the next cycle, running the in-flight fast lane meanwhile."""
+        deadline = time.monotonic() + interval
+        while not self._stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            tick = self.config.get("inflight_poll_interval", 10)
+            if self._poll_now_event.wait(timeout=min(remaining, tick)):
+                break
+            if self.state.token and self.config.get("track_inflight", True):
                 try:
-                    self.poller.poll_once()
-                    self.tray.set_icon("ok")
+                    with tracing.span("poll_inflight"):
+                        self.poller.poll_inflight()
                 except Exception as e:
-                    log.error("Poll error: %s", e)
-                    self.tray.set_icon("error")
-                    self.status_text = f"Error: {e}"
-                    self.tray.update_menu()
-
-            # Interruptible sleep
-            interval = self.config.get("poll_interval", 30)
-            self._poll_now_event.wait(timeout=interval)
-            self._poll_now_event.clear()
+                    log.error("In-flight poll error: %s", e)
+        self._poll_now_event.clear()
 
     def _do_auth(self) -> None:
         self.status_text = "Authenticating..."
@@ -108,6 +245,8 @@ class Application:
         try:
             user = self.auth.authenticate(self._stop_event)
             if user:
+                # The token may belong to another account
+                self.poller.reset_identity()
                 self._set_connected(user)
             else:
                 self._set_disconnected("Auth failed")
@@ -135,16 +274,46 @@ class Application:
         self._poll_now_event.set()
 
     def reload_config(self) -> None:
+        old_trace = self.config.get("trace", False)
         self.config = load_config()
         self.poller.config = self.config
+        self.github.exclude_pull_requests = self.config.get("exclude_pull_requests", True)
         self.auth.config = self.config
-        self.poller.clear_repo_cache()
+        self._logs.apply_levels(self.config)
+        self.poller.refilter()
         log.info("Config reloaded")
         self.status_text = "Config reloaded"
         self.tray.update_menu()
+        if self.config.get("trace", False) != old_trace:
+            self.set_tracing(self.config.get("trace", False))
 
     def shutdown(self) -> None:
         log.info("Shutting down")
         self._stop_event.set()
         self._poll_now_event.set()
+        if self.webhook is not None:
+            self.webhook.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        tracing.TRACER.stop()
+        # Closing under a running cycle would mark runs seen that are never shown
+        thread = self._loop_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(SHUTDOWN_TIMEOUT)
+        if thread is not None and thread.is_alive():
+            log.warning("Poll cycle still running; state is closed once it ends")
+        else:
+            self._close_resources()
         self.tray.stop()
+
+    def _close_resources(self) -> None:
+        """Show queued toasts, then close the state and the HTTP session, once."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self.notifier.close()
+        self.state.close()
+        self.github.close()
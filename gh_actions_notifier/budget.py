@@ -0,0 +1,98 @@
+"""Rate-limit budget scheduling for poll cycles.
+
+Spreads the remaining core rate limit evenly over the time left until the
+window resets. Large accounts get a steady batch size instead of draining
+the budget and going silent until reset; small accounts poll more often
+than poll_interval when the budget allows it.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+
+log = logging.getLogger(__name__)
+
+SAFETY_MARGIN = 50  # Requests held back for auth checks and manual polls
+MIN_REQUEST_COST = 0.2  # Floor on the estimated cost of one request
+COST_SMOOTHING = 0.3  # EWMA weight of the latest cycle's miss ratio
+DEFAULT_WINDOW = 3600
+
+
+class RateBudget:
+    """Plans each cycle's request count from the client's rate-limit state."""
+
+    def __init__(self, github) -> None:
+        self._github = github
+        # Fraction of requests that cost budget; 304s are free on GitHub
+        self.request_cost = 1.0
+
+    def observe(self, hits: int, misses: int) -> None:
+        """Fold one cycle's cache hit/miss counts into the cost estimate."""
+        total = hits + misses
+        if not total:
+            return
+        ratio = misses / total
+        self.request_cost = max(
+            MIN_REQUEST_COST,
+            (1 - COST_SMOOTHING) * self.request_cost + COST_SMOOTHING * ratio,
+        )
+
+    def plan(
+        self,
+        repo_count: int,
+        max_interval: float,
+        min_interval: float,
+        reserve: int = 0,
+        now: float | None = None,
+    ) -> tuple[int | None, float]:
+        """Return (batch_size, interval) for the next cycle.
+
+        batch_size is None when the rate limit is still unknown, in which
+        case the caller should use its fixed default. reserve is the number
+        of requests to set aside for work due before the reset, such as
+        repo list re-pagination.
+        """
+        remaining = self._github.rate_remaining
+        if remaining is None or repo_count <= 0:
+            return None, max_interval
+        now = time.time() if now is None else now
+        window = self._github.rate_reset - now
+        if window <= 0:
+            # Reset has passed; assume a fresh window
+            remaining = self._github.rate_limit or remaining
+            window = DEFAULT_WINDOW
+
+        usable = remaining - SAFETY_MARGIN - reserve
+        if usable <= 0:
+            log.warning(
+                "Rate budget exhausted (%d remaining, %d reserved), pausing until reset",
+                remaining,
+                reserve,
+            )
+            return 0, max_interval
+
+        per_second = usable / window / self.request_cost
+        # Fastest interval at which the whole account fits the budget
+        interval = min(max(repo_count / per_second, min_interval), max_interval)
+        batch = max(1, min(repo_count, math.floor(per_second * interval)))
+        return batch, interval
+
+    def allowance(self, seconds: float, share: float, now: float | None = None) -> int | None:
+        """Requests side work may spend over the next `seconds`.
+
+        share is the fraction of the evenly spread budget the side work may
+        take. Returns None when the rate limit is unknown.
+        """
+        remaining = self._github.rate_remaining
+        if remaining is None:
+            return None
+        now = time.time() if now is None else now
+        window = self._github.rate_reset - now
+        if window <= 0:
+            return None
+        usable = remaining - SAFETY_MARGIN
+        if usable <= 0:
+            return 0
+        return max(1, math.floor(usable / window / self.request_cost * seconds * share))
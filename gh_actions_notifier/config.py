@@ -2,6 +2,7 @@
 
 Manages a simple JSON configuration file with poll interval and
 repo allowlist/blocklist settings. Missing keys are filled from defaults.
+ConfigWatcher reports edits to the file so they apply without a restart.
 """
 
 from __future__ import annotations
@@ -9,16 +10,54 @@ from __future__ import annotations
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 
 log = logging.getLogger(__name__)
 
+WATCH_INTERVAL = 2.0  # Seconds between checks of config.json for edits
+
 DEFAULT_CONFIG = {
     "poll_interval": 30,
+    "min_poll_interval": 10,
+    "rate_budget": True,
+    "max_repo_staleness": 1800,
+    "track_inflight": True,
+    "inflight_poll_interval": 10,
+    "exclude_pull_requests": True,
+    "event_feed": False,
+    "event_orgs": [],
+    "event_sweep_interval": 3600,
+    "webhook": False,
+    "webhook_host": "127.0.0.1",
+    "webhook_port": 8787,
+    "webhook_secret": "",
+    "webhook_reconcile_interval": 900,
     "allowlist": [],
     "blocklist": [],
+    "watch_config": True,
+    "token_pool": [],
+    "http_pool_size": 10,
+    "poll_workers": 1,
+    "engine": "sync",
+    "async_max_connections": 4,
+    "graphql_discovery": False,
+    "graphql_batch_size": 50,
+    "state_backend": "json",
+    "state_journal": False,
+    "metrics_endpoint": False,
+    "metrics_port": 9464,
+    "trace": False,
+    "profile_cycles": 0,
+    "log_level": "INFO",
+    "log_levels": {},
+    "log_format": "text",
+    "log_max_bytes": 10485760,
+    "log_backups": 5,
+    "log_rotate_days": 1,
 }
 
+
 def _config_dir() -> Path:
     return Path(os.environ.get("APPDATA", Path.home())) / "gh-actions-notifier"
 
@@ -48,3 +87,57 @@ def save_config(cfg: dict) -> None:
     with open(path, "w", encoding="utf-8") as f:
         json.dump(cfg, f, indent=2)
     log.info("Config saved to %s", path)
+
+
+class ConfigWatcher:
+    """Calls on_change from a daemon thread whenever config.json is edited.
+
+    Polls the file's modification time and size, which needs no platform
+    file-notification API. An edit that does not parse, such as a save
+    caught halfway, is skipped until the file changes again.
+    """
+
+    def __init__(self, on_change, path: Path | None = None, interval: float = WATCH_INTERVAL):
+        self._on_change = on_change
+        self._path = path or config_path()
+        self._interval = interval
+        self._signature = self._stat()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                continue
+            self._signature = signature
+            try:
+                with open(self._path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                log.warning("Config edit not applied: %s", e)
+                continue
+            if not isinstance(data, dict):
+                log.warning("Config edit not applied: not a JSON object")
+                continue
+            log.info("Config file changed, reloading")
+            try:
+                self._on_change()
+            except Exception as e:
+                log.error("Config reload failed: %s", e)
@@ -0,0 +1,118 @@
+"""Change detection from the GitHub events feeds.
+
+Rather than asking every repo's runs listing for news, the event feed
+reads the authenticated user's events and the events of configured orgs.
+Pushes, pull requests and similar events mark their repo dirty, and the
+scheduler polls dirty repos first. Each feed is a conditional GET on its
+ETag (a 304 costs no rate limit) and is not polled more often than its
+X-Poll-Interval allows.
+
+Feeds can lag and don't cover every trigger (scheduled and manually
+dispatched runs, pushes by other users to repos outside the listed orgs),
+so idle repos are still swept on a slow interval.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from .github_api import EVENTS_PER_PAGE
+
+log = logging.getLogger(__name__)
+
+# Event types that can start a workflow run
+ACTIVE_EVENT_TYPES = frozenset(
+    {
+        "PushEvent",
+        "PullRequestEvent",
+        "PullRequestReviewEvent",
+        "CreateEvent",
+        "DeleteEvent",
+        "ReleaseEvent",
+        "IssueCommentEvent",
+    }
+)
+
+
+class EventFeed:
+    """Polls the user and org events feeds and reports repos with new activity."""
+
+    def __init__(self, github, orgs: list[str] | None = None) -> None:
+        self._github = github
+        self._orgs = list(orgs or [])
+        self._login: str | None = None
+        # Per feed URL: newest event ID seen, and earliest time to poll again
+        self._last_ids: dict[str, int] = {}
+        self._next_poll: dict[str, float] = {}
+        # False while any feed is failing, so callers fall back to polling
+        self.healthy = False
+
+    def reset(self) -> None:
+        """Forget the user and feed positions, e.g. after a token change."""
+        self._login = None
+        self._last_ids.clear()
+        self._next_poll.clear()
+        self.healthy = False
+
+    def _urls(self) -> list[str]:
+        if self._login is None:
+            self._login = self._github.get_user()
+            if self._login is None:
+                return []
+        # The per-user org feed includes private repo events, unlike /orgs/{org}/events
+        return [f"/users/{self._login}/events"] + [
+            f"/users/{self._login}/events/orgs/{org}" for org in self._orgs
+        ]
+
+    def poll(self, now: float | None = None) -> set[str]:
+        """Return full names of repos with new activity since the last poll.
+
+        The first read of each feed only records its position. Feeds that
+        are not due yet are skipped.
+        """
+        now = time.time() if now is None else now
+        urls = self._urls()
+        if not urls:
+            self.healthy = False
+            return set()
+        dirty: set[str] = set()
+        healthy = True
+        for url in urls:
+            if now < self._next_poll.get(url, 0.0):
+                continue
+            result = self._github.get_events(url)
+            if result is None:
+                healthy = False
+                continue
+            events, interval = result
+            self._next_poll[url] = now + interval
+            dirty |= self._new_activity(url, events)
+        self.healthy = healthy
+        if dirty:
+            log.debug("Event feed marked %d repo(s) dirty", len(dirty))
+        return dirty
+
+    def _new_activity(self, url: str, events: list[dict]) -> set[str]:
+        last_id = self._last_ids.get(url)
+        newest = last_id or 0
+        oldest = None
+        dirty: set[str] = set()
+        for event in events:
+            try:
+                event_id = int(event.get("id", 0))
+            except (TypeError, ValueError):
+                continue
+            newest = max(newest, event_id)
+            oldest = event_id if oldest is None else min(oldest, event_id)
+            if last_id is None or event_id <= last_id:
+                continue
+            if event.get("type") in ACTIVE_EVENT_TYPES:
+                name = event.get("repo", {}).get("name")
+                if name:
+                    dirty.add(name)
+        moved_past = last_id is not None and oldest is not None and oldest > last_id
+        if moved_past and len(events) >= EVENTS_PER_PAGE:
+            log.info("Event feed %s moved by more than a page; the sweep will catch up", url)
+        self._last_ids[url] = newest
+        return dirty
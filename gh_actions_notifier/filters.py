@@ -0,0 +1,72 @@
+"""Repo filter rules, compiled once per config load.
+
+allowlist and blocklist entries are matched case-insensitively against
+"owner/repo" full names, in three forms:
+
+- "owner/repo": an exact name, looked up in a set
+- "owner/*": every repo of an owner, looked up in a set of owners
+- any other pattern with *, ? or [...], e.g. "owner/api-*" or "*/infra-*":
+  a glob; all globs of a list are combined into one regex
+
+A repo is monitored when the allowlist is empty or matches it, and the
+blocklist does not match it. The blocklist always wins, so an allowlist
+of "owner/*" can still leave out "owner/legacy".
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+class RuleSet:
+    """One compiled allowlist or blocklist."""
+
+    __slots__ = ("exact", "owners", "_pattern")
+
+    def __init__(self, rules) -> None:
+        self.exact: set[str] = set()
+        self.owners: set[str] = set()
+        globs: list[str] = []
+        for rule in rules:
+            rule = str(rule).strip().lower()
+            if not rule:
+                continue
+            owner, _, name = rule.partition("/")
+            if not _GLOB_CHARS.search(rule):
+                self.exact.add(rule)
+            elif name == "*" and not _GLOB_CHARS.search(owner):
+                self.owners.add(owner)
+            else:
+                globs.append(fnmatch.translate(rule))
+        self._pattern = re.compile("|".join(globs)) if globs else None
+
+    def __bool__(self) -> bool:
+        return bool(self.exact or self.owners or self._pattern)
+
+    def matches(self, full_name: str) -> bool:
+        name = full_name.lower()
+        if name in self.exact:
+            return True
+        if self.owners and name.partition("/")[0] in self.owners:
+            return True
+        return self._pattern is not None and self._pattern.match(name) is not None
+
+
+class RepoFilter:
+    """Decides which repos are monitored, from an allowlist and a blocklist."""
+
+    def __init__(self, allowlist=(), blocklist=()) -> None:
+        self._allow = RuleSet(allowlist)
+        self._block = RuleSet(blocklist)
+
+    @classmethod
+    def from_config(cls, config: dict) -> RepoFilter:
+        return cls(config.get("allowlist", []), config.get("blocklist", []))
+
+    def matches(self, full_name: str) -> bool:
+        if self._allow and not self._allow.matches(full_name):
+            return False
+        return not self._block.matches(full_name)
@@ -1,28 +1,144 @@
-"""GitHub REST API client with pagination and rate limit awareness."""
+"""GitHub REST API client with pagination and rate limit awareness.
+
+Transient failures are retried and a circuit breaker pauses requests
+during outages and secondary rate limits (see resilience.py).
+
+For GET responses carrying an ETag or Last-Modified validator, the
+validators, the Link header and the decoded body are cached per URL (never
+the raw body). Repeat requests are sent conditionally and a 304 is answered
+from the cache; GitHub does not count 304s against the primary rate limit.
+
+GraphQL queries (POST /graphql) draw on a separate point-based limit,
+tracked from the rateLimit field each query asks for.
+"""
 
 from __future__ import annotations
 
 import logging
+import threading
 import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime, timezone
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from . import __version__
+from . import __version__, metrics, tracing
+from .graphql import build_discovery_query, parse_discovery
+from .models import decode_events, decode_json, decode_repos, decode_run, decode_runs_page
+from .repo_index import parse_timestamp
+from .resilience import (
+    MAX_RETRIES,
+    RETRY_STATUSES,
+    CircuitBreaker,
+    backoff_delay,
+    throttle_delay,
+)
+from .tokens import TokenPool, TokenSlot
 
 log = logging.getLogger(__name__)
 
 API_BASE = "https://api.github.com"
 USER_AGENT = f"gh-actions-notifier/{__version__}"
 RUNS_PER_PAGE = 25
+MAX_RUN_PAGES = 10  # Pages fetched per listing before giving up on reaching since_id
+REPOS_PER_PAGE = 100
+EVENTS_PER_PAGE = 100
+DEFAULT_EVENTS_POLL_INTERVAL = 60
+GRAPHQL_BATCH_SIZE = 50  # Repos per discovery query
+CACHE_MAX_ENTRIES = 2048
+DEFAULT_POOL_SIZE = 10
+# Response headers kept in the cache, the only ones read from a cached response
+CACHED_HEADERS = ("ETag", "Last-Modified", "Link", "X-Poll-Interval")
+
+
+class CachedResponse:
+    """What the cache keeps of a 200 response: a few headers and the decoded body.
+
+    Stands in for the response when a request is answered by a 304.
+    """
+
+    __slots__ = ("headers", "decoded", "decoder")
+    status_code = 200
+
+    def __init__(self, headers, decoded, decoder) -> None:
+        self.headers = {name: headers[name] for name in CACHED_HEADERS if name in headers}
+        self.decoded = decoded
+        self.decoder = decoder
+
+
+class RunCollector:
+    """Accumulates runs newer than since_id across listing pages."""
+
+    __slots__ = ("since_id", "until_id", "runs", "_ids")
+
+    def __init__(self, since_id: int, until_id: int | None = None) -> None:
+        self.since_id = since_id
+        self.until_id = since_id if until_id is None else until_id
+        # Always a new list: decoded pages may be shared with the cache
+        self.runs: list[dict] = []
+        self._ids: set[int] = set()
+
+    def add_page(self, page: list[dict]) -> bool:
+        """Add a page of runs; return True if the next page is still needed.
+
+        Listings stop at a page that reaches until_id, and unseeded ones
+        (until_id 0) after one page.
+        """
+        if not page:
+            return False
+        crossed = False
+        for run in page:
+            if run["id"] <= self.until_id:
+                crossed = True
+            if run["id"] > self.since_id and run["id"] not in self._ids:
+                # Runs created mid-pagination shift older ones onto the next page
+                self._ids.add(run["id"])
+                self.runs.append(run)
+        return bool(self.until_id) and not crossed
 
 
 class GitHubClient:
     """Thin wrapper around the GitHub REST API for workflow run monitoring."""
 
-    def __init__(self, state) -> None:
+    def __init__(
+        self,
+        state,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        base_url: str = API_BASE,
+        tokens: TokenPool | None = None,
+    ) -> None:
         self._state = state
+        # The stored token plus any extra ones, each with its own rate limit
+        self.tokens = tokens or TokenPool(state)
+        self._base_url = base_url.rstrip("/")
+        # Keep-alive connection pool shared by every request from this client
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session_token: str | None = None
+        # Fresh responses awaiting decoding -> their cache key
+        self._pending: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # Guards the session headers, response cache and counters across poll workers
+        self._lock = threading.Lock()
+        # Opens during outages and server-requested pauses
+        self.breaker = CircuitBreaker()
+        # Rate limit summed over the token pool
         self.rate_remaining: int | None = None
         self.rate_reset: float = 0
+        self.rate_limit: int | None = None
+        # Ask run listings to leave out the (unused) pull_requests arrays
+        self.exclude_pull_requests = True
+        # GraphQL points left and spent since the last reset_cache_stats
+        self.graphql_remaining: int | None = None
+        self.graphql_reset: float = 0
+        self.graphql_cost = 0
+        # Prepared URL -> last decoded 200 response that carried a validator
+        self._cache: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def _headers(self) -> dict[str, str]:
         h = {
@@ -35,81 +151,576 @@ class GitHubClient:
             h["Authorization"] = f"Bearer {token}"
         return h
 
-    def _update_rate_limit(self, resp: requests.Response) -> None:
-        remaining = resp.headers.get("X-RateLimit-Remaining")
-        if remaining is not None:
-            self.rate_remaining = int(remaining)
-        reset = resp.headers.get("X-RateLimit-Reset")
-        if reset is not None:
-            self.rate_reset = float(reset)
-
-    def _check_rate_limit(self) -> bool:
-        """Return True if we should proceed, False if rate limited."""
-        if self.rate_remaining is not None and self.rate_remaining < 10:
+    def _sync_session(self) -> None:
+        """Rebuild the session headers if the stored token has changed."""
+        token = self._state.token
+        with self._lock:
+            if token == self._session_token:
+                return
+            self._session.headers.pop("Authorization", None)
+            self._session.headers.update(self._headers())
+            # Cached bodies belong to the previous identity
+            self._cache.clear()
+            self._session_token = token
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
+
+    def _update_rate_limit(self, resp: requests.Response, slot: TokenSlot) -> None:
+        self.tokens.update(
+            slot,
+            remaining=resp.headers.get("X-RateLimit-Remaining"),
+            reset=resp.headers.get("X-RateLimit-Reset"),
+            limit=resp.headers.get("X-RateLimit-Limit"),
+        )
+        self.rate_remaining, self.rate_reset, self.rate_limit = self.tokens.totals()
+        if self.rate_remaining is not None:
+            metrics.RATE_REMAINING.set(self.rate_remaining)
+            metrics.RATE_LIMIT.set(self.rate_limit)
+
+    def _pick_token(self, url: str) -> TokenSlot | None:
+        """Choose the token for a request, or None if every candidate is rate limited."""
+        slot = self.tokens.pick(self._owner_of(url))
+        if slot is None:
             wait = max(0, self.rate_reset - time.time())
-            if wait > 0:
-                log.warning("Rate limited, reset in %.0fs", wait)
-                return False
+            log.warning("Rate limited, reset in %.0fs", wait)
+        return slot
+
+    def _api_path(self, url: str) -> str:
+        """The path of an API URL, without base URL or query."""
+        path = url[len(self._base_url) :] if url.startswith(self._base_url) else url
+        return path.split("?", 1)[0]
+
+    def _owner_of(self, url: str) -> str | None:
+        """The repo owner a request is about, if any."""
+        parts = self._api_path(url).lstrip("/").split("/", 2)
+        if len(parts) >= 2 and parts[0] == "repos":
+            return parts[1]
+        return None
+
+    def _auth_headers(self, slot: TokenSlot) -> dict[str, str]:
+        """Authorization override for a non-primary token (the session carries the primary)."""
+        if slot is self.tokens.primary:
+            return {}
+        return {"Authorization": f"Bearer {self.tokens.token_of(slot)}"}
+
+    @staticmethod
+    def _cache_key(url: str, params: dict | None) -> str:
+        return requests.Request("GET", url, params=params).prepare().url
+
+    def _conditional_headers(self, key: str) -> dict[str, str]:
+        """Return If-None-Match/If-Modified-Since for a cached response, if any."""
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is None:
+            return {}
+        h = {}
+        etag = cached.headers.get("ETag")
+        if etag:
+            h["If-None-Match"] = etag
+        last_modified = cached.headers.get("Last-Modified")
+        if last_modified:
+            h["If-Modified-Since"] = last_modified
+        return h
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def reset_cache_stats(self) -> tuple[int, int]:
+        """Return (hits, misses) since the last call and reset the counters.
+
+        Also resets the GraphQL points counter.
+        """
+        with self._lock:
+            stats = (self.cache_hits, self.cache_misses)
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.graphql_cost = 0
+        return stats
+
+    def _full_url(self, url: str) -> str:
+        return url if url.startswith("http") else f"{self._base_url}{url}"
+
+    def _handle_response(
+        self, key: str, resp, use_cache: bool = True, slot: TokenSlot | None = None
+    ):
+        """Apply rate-limit and cache bookkeeping to a response.
+
+        Works with any response object exposing status_code and headers, so
+        the async client shares this path. Returns the response to hand to
+        the caller (the CachedResponse on 304), or None on failure. A 200
+        with a validator is cached once _decode has decoded it. Without
+        use_cache, a 304 is returned as is. slot is the token the request
+        was sent with (default: the primary token).
+        """
+        slot = slot or self.tokens.primary
+        self._update_rate_limit(resp, slot)
+        if resp.status_code == 304 and not use_cache:
+            with self._lock:
+                self.cache_hits += 1
+            return resp
+        if resp.status_code == 304:
+            with self._lock:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self.cache_hits += 1
+            if cached is not None:
+                return cached
+            log.warning("Got 304 for %s with no cached response", key)
+            return None
+        if resp.status_code == 401:
+            if slot is self.tokens.primary:
+                log.error("Token invalid (401)")
+            else:
+                self.tokens.disable(slot)
+            return None
+        if resp.status_code >= 400:
+            log.error("API request failed: %d for %s", resp.status_code, key)
+            return None
+        with self._lock:
+            self.cache_misses += 1
+        if use_cache and (resp.headers.get("ETag") or resp.headers.get("Last-Modified")):
+            with self._lock:
+                self._pending[resp] = key
+        return resp
+
+    def _get(
+        self,
+        url: str,
+        params: dict | None = None,
+        etag: str | None = None,
+        slot: TokenSlot | None = None,
+    ) -> requests.Response | None:
+        """Make a GET request to the GitHub API. Returns None on failure.
+
+        A 304 Not Modified is answered with the CachedResponse for the URL,
+        so callers always get a body to decode. Passing etag bypasses
+        the response cache: the request is made conditional on that ETag
+        and a 304 response is returned to the caller. The token is picked
+        from the pool unless slot is given.
+        """
+        return self._fetch(url, params, etag, slot)[0]
+
+    def _fetch(
+        self,
+        url: str,
+        params: dict | None = None,
+        etag: str | None = None,
+        slot: TokenSlot | None = None,
+    ) -> tuple[requests.Response | None, TokenSlot | None]:
+        """Like _get, but also returns the token that answered.
+
+        An extra token refused with 403 or 404 may just not reach the repo,
+        so the request is sent again with the primary token.
+        """
+        full_url = self._full_url(url)
+        slot = slot or self._pick_token(full_url)
+        # Checked after picking a token: allow() may hand out the breaker's one
+        # probe, which only the outcome of a sent request gives back
+        if slot is None or not self.breaker.allow():
+            return None, slot
+        key = self._cache_key(full_url, params)
+        self._sync_session()
+        use_cache = etag is None
+        headers = self._conditional_headers(key) if use_cache else {"If-None-Match": etag}
+        headers.update(self._auth_headers(slot))
+        path = self._api_path(full_url)
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                resp = self._send(path, full_url, headers, params)
+            except requests.RequestException as e:
+                failure = str(e) or type(e).__name__
+            else:
+                if self._throttled(resp, slot):
+                    return None, slot
+                if resp.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    primary = self._fallback_token(resp, slot, path)
+                    if primary is not None:
+                        return self._fetch(url, params, etag, primary)
+                    return self._handle_response(key, resp, use_cache=use_cache, slot=slot), slot
+                failure = f"HTTP {resp.status_code}"
+            if not self._should_retry(failure, attempt, key):
+                return None, slot
+            time.sleep(backoff_delay(attempt))
+        return None, slot
+
+    def _send(self, path: str, full_url: str, headers: dict, params: dict | None):
+        """Send one GET attempt, recording its metrics and trace span."""
+        start = time.perf_counter()
+        with tracing.span("GET", path=path) as span:
+            try:
+                resp = self._session.get(full_url, headers=headers, params=params, timeout=15)
+            except requests.RequestException:
+                metrics.observe_request(path, "error", time.perf_counter() - start)
+                raise
+            # requests has no per-phase hooks; elapsed runs until the headers arrived
+            span["status"] = resp.status_code
+            span["headers_ms"] = resp.elapsed.total_seconds() * 1000
+        metrics.observe_request(
+            path, resp.status_code, time.perf_counter() - start, len(resp.content)
+        )
+        return resp
+
+    def _throttled(self, resp, slot: TokenSlot) -> bool:
+        """If resp asks us to back off, pause all requests and return True."""
+        delay = throttle_delay(resp)
+        if delay is None:
+            return False
+        self._update_rate_limit(resp, slot)
+        reason = "rate limited" if resp.status_code == 429 else "secondary rate limit"
+        self.breaker.trip(delay, reason)
         return True
 
-    def _get(self, url: str, params: dict | None = None) -> requests.Response | None:
-        """Make a GET request to the GitHub API. Returns None on failure."""
-        if not self._check_rate_limit():
+    def _fallback_token(self, resp, slot: TokenSlot, path: str) -> TokenSlot | None:
+        """The primary token, if resp refused an extra token access to path."""
+        if slot is self.tokens.primary or resp.status_code not in (403, 404):
             return None
-        try:
-            resp = requests.get(
-                url if url.startswith("http") else f"{API_BASE}{url}",
-                headers=self._headers(),
-                params=params,
-                timeout=15,
+        self._update_rate_limit(resp, slot)
+        primary = self.tokens.pick(None)
+        if primary is not None:
+            log.debug(
+                "Token %r got %d for %s, using the primary token",
+                slot.name,
+                resp.status_code,
+                path,
             )
-            self._update_rate_limit(resp)
-            if resp.status_code == 401:
-                log.error("Token invalid (401)")
+        return primary
+
+    def _should_retry(self, failure: str, attempt: int, key: str) -> bool:
+        """Record a transient failure and decide whether to try again."""
+        self.breaker.record_failure(failure)
+        if attempt >= MAX_RETRIES or not self.breaker.allow():
+            log.error("API request failed: %s for %s", failure, key)
+            return False
+        log.debug("Retrying %s after %s", key, failure)
+        return True
+
+    def _post_graphql(self, query: str, variables: dict) -> dict | None:
+        """Run a GraphQL query and return its data, or None on failure.
+
+        Errors for individual fields (e.g. a repo that no longer exists)
+        are logged and leave those fields null in the returned data.
+        """
+        if self.graphql_remaining is not None and self.graphql_remaining < 10:
+            wait = self.graphql_reset - time.time()
+            if wait > 0:
+                log.warning("GraphQL rate limited, reset in %.0fs", wait)
                 return None
-            resp.raise_for_status()
-            return resp
+        if not self.breaker.allow():
+            return None
+        self._sync_session()
+        start = time.perf_counter()
+        try:
+            with tracing.span("POST", path="/graphql", repos=len(variables) // 2):
+                resp = self._session.post(
+                    self._full_url("/graphql"),
+                    json={"query": query, "variables": variables},
+                    timeout=30,
+                )
         except requests.RequestException as e:
-            log.error("API request failed: %s", e)
+            metrics.observe_request("/graphql", "error", time.perf_counter() - start)
+            self.breaker.record_failure(str(e) or type(e).__name__)
+            log.error("GraphQL request failed: %s", e)
             return None
+        metrics.observe_request(
+            "/graphql", resp.status_code, time.perf_counter() - start, len(resp.content)
+        )
+        if self._throttled(resp, self.tokens.primary):
+            return None
+        if resp.status_code in RETRY_STATUSES:
+            self.breaker.record_failure(f"HTTP {resp.status_code}")
+        else:
+            self.breaker.record_success()
+        if resp.status_code != 200:
+            log.error("GraphQL request failed: %d", resp.status_code)
+            return None
+        try:
+            with tracing.span("decode", decoder="graphql"):
+                body = resp.json()
+        except ValueError as e:
+            log.error("Unexpected GraphQL payload: %s", e)
+            return None
+        for error in body.get("errors") or []:
+            log.warning("GraphQL error: %s", error.get("message"))
+        data = body.get("data")
+        if not isinstance(data, dict):
+            return None
+        rate = data.get("rateLimit") or {}
+        with self._lock:
+            if "remaining" in rate:
+                self.graphql_remaining = int(rate["remaining"])
+                self.graphql_reset = parse_timestamp(rate.get("resetAt"))
+            self.graphql_cost += int(rate.get("cost", 0))
+        return data
+
+    def _decode(self, resp, decoder):
+        """Decode a response body with a models decoder. Returns None on bad payloads.
+
+        A CachedResponse returns its stored value. Decoding a fresh response
+        with a validator caches the result, so a later 304 costs no parsing.
+        """
+        if isinstance(resp, CachedResponse):
+            if resp.decoder is decoder:
+                return resp.decoded
+            # Same URL read as another shape; cannot happen with the current callers
+            log.error("Cached %s body requested as %s", resp.decoder.__name__, decoder.__name__)
+            return None
+        try:
+            with tracing.span("decode", decoder=decoder.__name__):
+                decoded = decoder(resp.content)
+        except (ValueError, TypeError, AttributeError) as e:
+            log.error("Unexpected API payload: %s", e)
+            return None
+        with self._lock:
+            key = self._pending.pop(resp, None)
+        if key is not None:
+            self._remember(key, CachedResponse(resp.headers, decoded, decoder))
+        return decoded
 
     def get_user(self) -> str | None:
         """Validate token and return the authenticated username, or None."""
         resp = self._get("/user")
         if resp is None:
             return None
-        return resp.json().get("login")
+        user = self._decode(resp, decode_json)
+        return user.get("login") if isinstance(user, dict) else None
+
+    def refresh_rate_limit(self) -> bool:
+        """Load each token's core rate-limit state from /rate_limit (which is free).
+
+        Returns True if any token's state was updated.
+        """
+        updated = False
+        for slot in self.tokens.slots:
+            if slot.disabled:
+                continue
+            resp = self._get("/rate_limit", slot=slot)
+            if resp is None:
+                continue
+            body = self._decode(resp, decode_json)
+            if not isinstance(body, dict):
+                continue
+            core = body.get("resources", {}).get("core", {})
+            if "remaining" in core:
+                self.tokens.update(slot, core["remaining"], core.get("reset"), core.get("limit"))
+                updated = True
+        self.rate_remaining, self.rate_reset, self.rate_limit = self.tokens.totals()
+        return updated
 
     def get_repos(self) -> list[dict]:
         """Get all repos the authenticated user has access to (paginated)."""
         repos: list[dict] = []
         url: str | None = "/user/repos"
-        params: dict | None = {"per_page": 100, "sort": "pushed"}
+        params: dict | None = {"per_page": REPOS_PER_PAGE, "sort": "pushed"}
 
         while url:
             resp = self._get(url, params=params)
             if resp is None:
                 break
-            repos.extend(resp.json())
+            page = self._decode(resp, decode_repos)
+            if page is None:
+                break
+            repos.extend(page)
             # Subsequent pages carry params in the Link URL itself
             params = None
             url = self._next_page_url(resp)
 
         return repos
 
-    def get_completed_runs(self, owner: str, repo: str, since_id: int = 0) -> list[dict]:
-        """Get recent completed workflow runs, optionally filtered to those newer than since_id."""
-        resp = self._get(
-            f"/repos/{owner}/{repo}/actions/runs",
-            params={"status": "completed", "per_page": RUNS_PER_PAGE},
+    def get_repo_pages(
+        self,
+        etags: list[str | None],
+        page_sizes: list[int],
+        pushed_after: float | None = None,
+    ) -> list[tuple[str | None, list[dict] | None]] | None:
+        """Paginate /user/repos, making each page conditional on a known ETag.
+
+        etags and page_sizes describe the previously saved pages. Returns
+        one (etag, repos) item per page, where repos is None if the page is
+        unchanged (304), or None if any page could not be fetched.
+
+        With pushed_after set, pagination stops early: after an unchanged
+        page, or after the first page holding a repo last pushed at or
+        before that time. Since the list is sorted by push time, later
+        pages hold no newer pushes.
+        """
+        pages: list[tuple[str | None, list[dict] | None]] = []
+        page = 1
+        while True:
+            i = page - 1
+            known = etags[i] if i < len(etags) else None
+            resp = self._get(
+                "/user/repos",
+                params={"per_page": REPOS_PER_PAGE, "sort": "pushed", "page": page},
+                etag=known or None,
+            )
+            if resp is None:
+                # A partial list would drop repos; keep the saved index instead
+                return None
+            if resp.status_code == 304:
+                pages.append((known, None))
+                has_next = i < len(page_sizes) and page_sizes[i] >= REPOS_PER_PAGE
+            else:
+                repos = self._decode(resp, decode_repos)
+                if repos is None:
+                    return None
+                pages.append((resp.headers.get("ETag"), repos))
+                has_next = self._next_page_url(resp) is not None
+                if pushed_after is not None and any(
+                    parse_timestamp(r.get("pushed_at")) <= pushed_after for r in repos
+                ):
+                    return pages
+            if not has_next or (pushed_after is not None and resp.status_code == 304):
+                return pages
+            page += 1
+
+    def get_completed_runs(
+        self,
+        owner: str,
+        repo: str,
+        since_id: int = 0,
+        per_page: int = RUNS_PER_PAGE,
+        created_after: float | None = None,
+        until_id: int | None = None,
+    ) -> list[dict] | None:
+        """Get completed workflow runs newer than since_id, newest first.
+
+        Pages are fetched until one reaches a run at or below until_id
+        (default since_id; typically the newest run already seen), so a
+        burst larger than a page is not cut off. Returns None if a page
+        could not be fetched. created_after
+        (epoch seconds) narrows the listing server-side; it is rounded down
+        to the day so the URL, and with it the cached ETag, stays stable.
+        """
+        return self._list_runs(
+            owner, repo, "completed", since_id, per_page, created_after, until_id
         )
+
+    def get_recent_runs(
+        self,
+        owner: str,
+        repo: str,
+        since_id: int = 0,
+        per_page: int = RUNS_PER_PAGE,
+        created_after: float | None = None,
+        until_id: int | None = None,
+    ) -> list[dict] | None:
+        """Like get_completed_runs, but includes queued and in-progress runs."""
+        return self._list_runs(owner, repo, None, since_id, per_page, created_after, until_id)
+
+    def _list_runs(
+        self,
+        owner: str,
+        repo: str,
+        status: str | None,
+        since_id: int,
+        per_page: int,
+        created_after: float | None,
+        until_id: int | None,
+    ) -> list[dict] | None:
+        url: str | None = self._runs_url(owner, repo)
+        params: dict | None = self._runs_params(status, per_page, created_after)
+        runs = RunCollector(since_id, until_id)
+        slot = None
+        for _ in range(MAX_RUN_PAGES):
+            # Later pages come as /repositories/{id} URLs, which name no owner
+            # to pick a token for: keep the token that could read page 1
+            resp, slot = self._fetch(url, params=params, slot=slot)
+            page = self._page_runs(resp)
+            # A gap in the listing would hide runs below it
+            if page is None:
+                return None
+            if not runs.add_page(page):
+                break
+            # Subsequent pages carry params in the Link URL itself
+            url, params = self._next_page_url(resp), None
+            if url is None:
+                break
+        return runs.runs
+
+    def get_run(self, owner: str, repo: str, run_id: int) -> dict | None:
+        """Get a single workflow run by ID, or None on failure."""
+        resp = self._get(f"{self._runs_url(owner, repo)}/{run_id}")
         if resp is None:
-            return []
+            return None
+        return self._decode(resp, decode_run)
+
+    def get_events(self, url: str) -> tuple[list[dict], int] | None:
+        """Get the first page of an events feed, newest first.
 
-        runs = resp.json().get("workflow_runs", [])
-        if since_id:
-            runs = [r for r in runs if r["id"] > since_id]
-        return runs
+        Returns (events, poll_interval), where poll_interval is the
+        X-Poll-Interval the server asks clients to wait between polls, or
+        None on failure. An unchanged feed (304) is free and returns the
+        cached events.
+        """
+        resp = self._get(url, params={"per_page": EVENTS_PER_PAGE})
+        if resp is None:
+            return None
+        events = self._decode(resp, decode_events)
+        if events is None:
+            return None
+        try:
+            interval = int(resp.headers.get("X-Poll-Interval", DEFAULT_EVENTS_POLL_INTERVAL))
+        except ValueError:
+            interval = DEFAULT_EVENTS_POLL_INTERVAL
+        return events, interval
+
+    def get_latest_runs(
+        self, repos: list[str], batch_size: int = GRAPHQL_BATCH_SIZE
+    ) -> dict[str, list[dict]] | None:
+        """Get the latest workflow runs of many repos via batched GraphQL.
+
+        Returns {full_name: [{id, status, conclusion}, ...]} covering the
+        head commits of each repo's default branch and most recently
+        updated branches. Repos that could not be resolved are missing.
+        Returns None if every batch failed.
+        """
+        result: dict[str, list[dict]] = {}
+        ok = False
+        for start in range(0, len(repos), batch_size):
+            chunk = repos[start : start + batch_size]
+            data = self._post_graphql(*build_discovery_query(chunk))
+            if data is None:
+                continue
+            ok = True
+            result.update(parse_discovery(data, chunk))
+        return result if ok else None
+
+    @staticmethod
+    def _runs_url(owner: str, repo: str) -> str:
+        return f"/repos/{owner}/{repo}/actions/runs"
+
+    def _runs_params(
+        self,
+        status: str | None = "completed",
+        per_page: int = RUNS_PER_PAGE,
+        created_after: float | None = None,
+    ) -> dict:
+        params: dict = {"per_page": per_page}
+        if status:
+            params["status"] = status
+        if created_after:
+            day = datetime.fromtimestamp(created_after, timezone.utc).date()
+            params["created"] = f">={day.isoformat()}"
+        if self.exclude_pull_requests:
+            params["exclude_pull_requests"] = "true"
+        return params
+
+    def _page_runs(self, resp) -> list[dict] | None:
+        """Return the runs on one listing page, or None on failure."""
+        if resp is None:
+            return None
+        page = self._decode(resp, decode_runs_page)
+        if page is None:
+            return None
+        return page.get("workflow_runs", [])
 
     @staticmethod
     def _next_page_url(resp: requests.Response) -> str | None:
@@ -0,0 +1,168 @@
+"""Asynchronous GitHub client for the async polling engine.
+
+All requests go through one httpx.AsyncClient, so a whole batch is
+multiplexed over a few connections (HTTP/2 when the server supports it).
+Headers, the validator cache, rate-limit accounting and the circuit breaker
+are shared with the synchronous GitHubClient, so both engines draw on the
+same budget.
+
+Requires httpx (and h2 for HTTP/2); importing this module raises
+ImportError when httpx is not installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import httpx
+
+from . import metrics, tracing
+from .github_api import MAX_RUN_PAGES, RUNS_PER_PAGE, RunCollector
+from .resilience import MAX_RETRIES, RETRY_STATUSES, backoff_delay
+from .tokens import TokenSlot
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 4
+
+
+class AsyncGitHubClient:
+    """Async transport over a GitHubClient's shared state."""
+
+    def __init__(self, github, max_connections: int = DEFAULT_MAX_CONNECTIONS) -> None:
+        self._github = github
+        self._max_connections = max_connections
+        self._client: httpx.AsyncClient | None = None
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is not None:
+            return self._client
+        limits = httpx.Limits(
+            max_connections=self._max_connections,
+            max_keepalive_connections=self._max_connections,
+        )
+        # Wait for a free connection/stream instead of timing out in the pool
+        timeout = httpx.Timeout(15, pool=None)
+        try:
+            self._client = httpx.AsyncClient(http2=True, limits=limits, timeout=timeout)
+        except ImportError:
+            log.warning("h2 not installed, async engine falling back to HTTP/1.1")
+            self._client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _fetch(
+        self, url: str, params: dict | None = None, slot: TokenSlot | None = None
+    ) -> tuple[httpx.Response | None, TokenSlot | None]:
+        """Async counterpart of GitHubClient._fetch: (response or None, token slot)."""
+        gh = self._github
+        full_url = gh._full_url(url)
+        slot = slot or gh._pick_token(full_url)
+        if slot is None or not gh.breaker.allow():
+            return None, slot
+        key = gh._cache_key(full_url, params)
+        gh._sync_session()
+        headers = {**gh._headers(), **gh._conditional_headers(key), **gh._auth_headers(slot)}
+        path = gh._api_path(full_url)
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                resp = await self._send(path, full_url, headers, params)
+            except httpx.HTTPError as e:
+                failure = str(e) or type(e).__name__
+            else:
+                if gh._throttled(resp, slot):
+                    return None, slot
+                if resp.status_code not in RETRY_STATUSES:
+                    gh.breaker.record_success()
+                    primary = gh._fallback_token(resp, slot, path)
+                    if primary is not None:
+                        return await self._fetch(url, params, primary)
+                    return gh._handle_response(key, resp, slot=slot), slot
+                failure = f"HTTP {resp.status_code}"
+            if not gh._should_retry(failure, attempt, key):
+                return None, slot
+            await asyncio.sleep(backoff_delay(attempt))
+        return None, slot
+
+    async def _send(
+        self, path: str, full_url: str, headers: dict, params: dict | None
+    ) -> httpx.Response:
+        """Send one GET attempt, recording its metrics and trace span."""
+        start = time.perf_counter()
+        with tracing.async_span("GET", path=path) as span:
+            # With tracing on, httpx reports connect/TLS/send/wait phases to the span
+            extensions = {"trace": span.httpx_trace} if span.httpx_trace else None
+            try:
+                resp = await self._ensure_client().get(
+                    full_url, headers=headers, params=params, extensions=extensions
+                )
+            except httpx.HTTPError:
+                metrics.observe_request(path, "error", time.perf_counter() - start)
+                raise
+            span["status"] = resp.status_code
+        metrics.observe_request(
+            path, resp.status_code, time.perf_counter() - start, len(resp.content)
+        )
+        return resp
+
+    async def get_completed_runs(
+        self,
+        owner: str,
+        repo: str,
+        since_id: int = 0,
+        per_page: int = RUNS_PER_PAGE,
+        created_after: float | None = None,
+        until_id: int | None = None,
+    ) -> list[dict] | None:
+        """Async counterpart of GitHubClient.get_completed_runs."""
+        return await self._list_runs(
+            owner, repo, "completed", since_id, per_page, created_after, until_id
+        )
+
+    async def get_recent_runs(
+        self,
+        owner: str,
+        repo: str,
+        since_id: int = 0,
+        per_page: int = RUNS_PER_PAGE,
+        created_after: float | None = None,
+        until_id: int | None = None,
+    ) -> list[dict] | None:
+        """Like get_completed_runs, but includes queued and in-progress runs."""
+        return await self._list_runs(
+            owner, repo, None, since_id, per_page, created_after, until_id
+        )
+
+    async def _list_runs(
+        self,
+        owner: str,
+        repo: str,
+        status: str | None,
+        since_id: int,
+        per_page: int,
+        created_after: float | None,
+        until_id: int | None,
+    ) -> list[dict] | None:
+        gh = self._github
+        url: str | None = gh._runs_url(owner, repo)
+        params: dict | None = gh._runs_params(status, per_page, created_after)
+        runs = RunCollector(since_id, until_id)
+        slot = None
+        for _ in range(MAX_RUN_PAGES):
+            # Pinned like GitHubClient._list_runs: later pages name no owner
+            resp, slot = await self._fetch(url, params=params, slot=slot)
+            page = gh._page_runs(resp)
+            if page is None:
+                return None
+            if not runs.add_page(page):
+                break
+            url, params = gh._next_page_url(resp), None
+            if url is None:
+                break
+        return runs.runs
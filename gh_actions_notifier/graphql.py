@@ -0,0 +1,89 @@
+"""Batched GraphQL discovery of the latest workflow runs.
+
+One aliased query asks many repos at once for the check suites on the
+head commit of their default branch and of their most recently updated
+branches, including each suite's workflow run ID. The poller uses the
+answer to skip the REST runs listing for repos whose latest runs are all
+known, and lists the rest over REST for the details.
+
+Owners and names are passed as variables, so no repo name is ever
+spliced into the query text.
+"""
+
+from __future__ import annotations
+
+SUITES_PER_COMMIT = 10
+RECENT_BRANCHES = 3
+
+_SUITES_FRAGMENT = f"""
+fragment suites on Commit {{
+  checkSuites(last: {SUITES_PER_COMMIT}) {{
+    nodes {{ status conclusion workflowRun {{ databaseId }} }}
+  }}
+}}
+"""
+
+_REPO_FIELDS = f"""
+    defaultBranchRef {{ target {{ ...suites }} }}
+    refs(refPrefix: "refs/heads/", first: {RECENT_BRANCHES},
+         orderBy: {{field: TAG_COMMIT_DATE, direction: DESC}}) {{
+      nodes {{ target {{ ...suites }} }}
+    }}
+"""
+
+
+def build_discovery_query(repos: list[str]) -> tuple[str, dict[str, str]]:
+    """Return (query, variables) for a list of "owner/name" repos.
+
+    Repo i is aliased r{i}, with its owner and name in $o{i} and $n{i}.
+    """
+    params: list[str] = []
+    fields: list[str] = []
+    variables: dict[str, str] = {}
+    for i, full_name in enumerate(repos):
+        owner, name = full_name.split("/", 1)
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = name
+        params.append(f"$o{i}: String!, $n{i}: String!")
+        fields.append(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{{_REPO_FIELDS}  }}")
+    query = (
+        f"query Discover({', '.join(params)}) {{\n"
+        "  rateLimit { cost remaining resetAt }\n" + "\n".join(fields) + "\n}\n" + _SUITES_FRAGMENT
+    )
+    return query, variables
+
+
+def _commit_runs(target: dict | None) -> list[dict]:
+    suites = ((target or {}).get("checkSuites") or {}).get("nodes") or []
+    runs = []
+    for suite in suites:
+        run = (suite or {}).get("workflowRun")
+        if run and run.get("databaseId"):
+            runs.append(
+                {
+                    "id": int(run["databaseId"]),
+                    "status": (suite.get("status") or "").lower(),
+                    "conclusion": (suite.get("conclusion") or "").lower() or None,
+                }
+            )
+    return runs
+
+
+def parse_discovery(data: dict, repos: list[str]) -> dict[str, list[dict]]:
+    """Map each repo that resolved to its latest runs as {id, status, conclusion}.
+
+    Repos the query could not resolve (missing, no access) are left out.
+    """
+    result: dict[str, list[dict]] = {}
+    for i, full_name in enumerate(repos):
+        repo = data.get(f"r{i}")
+        if repo is None:
+            continue
+        targets = [(repo.get("defaultBranchRef") or {}).get("target")]
+        targets += [(ref or {}).get("target") for ref in (repo.get("refs") or {}).get("nodes") or []]
+        runs: dict[int, dict] = {}
+        for target in targets:
+            for run in _commit_runs(target):
+                runs[run["id"]] = run
+        result[full_name] = list(runs.values())
+    return result
@@ -0,0 +1,106 @@
+"""Tracker for queued and in-progress workflow runs.
+
+Runs seen before they complete are remembered here and checked on a fast
+lane (one conditional GET per run) so their completion is noticed without
+waiting for the repo's next turn in the scheduler. The tracker is bounded
+in size, expires runs that never finish, and persists through
+StateManager so long builds survive a restart. Runs it turns away when
+full, or stops following unfinished, are remembered as dropped, so the
+repo's listings page back far enough to report them when they complete.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+MAX_TRACKED_RUNS = 100
+RUN_TIMEOUT = 6 * 3600  # Stop tracking runs that haven't finished after this
+MAX_DROPPED_RUNS = 1000  # Oldest drops are forgotten beyond this
+
+
+class InflightTracker:
+    """Bounded set of unfinished runs, checked least-recently-checked first."""
+
+    def __init__(self, state) -> None:
+        self._state = state
+        # run_id -> {"repo", "id", "first_seen"}
+        self._runs: dict[int, dict] = {}
+        self._last_checked: dict[int, float] = {}
+        # Unfinished runs no longer tracked (run_id -> repo); not persisted,
+        # since the first listing after a restart pages back to the window anyway
+        self._dropped: dict[int, str] = {}
+        self._dirty = False
+        for entry in state.get_inflight_runs():
+            try:
+                self._runs[int(entry["id"])] = {
+                    "repo": entry["repo"],
+                    "id": int(entry["id"]),
+                    "first_seen": float(entry.get("first_seen", time.time())),
+                }
+            except (KeyError, TypeError, ValueError):
+                log.warning("Dropping malformed in-flight entry: %r", entry)
+        if self._runs:
+            log.info("Restored %d in-flight run(s)", len(self._runs))
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def __contains__(self, run_id: int) -> bool:
+        return run_id in self._runs
+
+    def track(self, repo: str, run_id: int, now: float | None = None) -> None:
+        """Start tracking an unfinished run.
+
+        When full, the new run is turned away rather than evicting a long
+        build already tracked; it is left to the repo's listing instead.
+        """
+        if run_id in self._runs or run_id in self._dropped:
+            return
+        if len(self._runs) >= MAX_TRACKED_RUNS:
+            log.warning("In-flight tracker full, leaving %s run %d to listings", repo, run_id)
+            self._drop(repo, run_id)
+            return
+        now = time.time() if now is None else now
+        self._runs[run_id] = {"repo": repo, "id": run_id, "first_seen": now}
+        self._dirty = True
+
+    def untrack(self, run_id: int) -> None:
+        """Stop tracking a run, e.g. because it completed."""
+        self._dropped.pop(run_id, None)
+        if self._runs.pop(run_id, None) is not None:
+            self._last_checked.pop(run_id, None)
+            self._dirty = True
+
+    def _drop(self, repo: str, run_id: int) -> None:
+        self._dropped[run_id] = repo
+        if len(self._dropped) > MAX_DROPPED_RUNS:
+            del self._dropped[next(iter(self._dropped))]
+
+    def oldest_dropped(self, repo: str, above: int) -> int | None:
+        """Lowest ID above `above` of a repo's unfinished runs that are no longer tracked."""
+        ids = [i for i, r in list(self._dropped.items()) if r == repo and i > above]
+        return min(ids, default=None)
+
+    def due(self, limit: int | None, now: float | None = None) -> list[dict]:
+        """Expire timed-out runs and return up to `limit` runs to check."""
+        now = time.time() if now is None else now
+        for entry in list(self._runs.values()):
+            if now - entry["first_seen"] > RUN_TIMEOUT:
+                log.info("Giving up on %s run %d after timeout", entry["repo"], entry["id"])
+                self.untrack(entry["id"])
+                self._drop(entry["repo"], entry["id"])
+        entries = sorted(self._runs.values(), key=lambda e: self._last_checked.get(e["id"], 0))
+        if limit is not None:
+            entries = entries[:limit]
+        for entry in entries:
+            self._last_checked[entry["id"]] = now
+        return entries
+
+    def flush(self) -> None:
+        """Persist the tracked runs if they changed."""
+        if self._dirty:
+            self._state.set_inflight_runs(list(self._runs.values()))
+            self._dirty = False
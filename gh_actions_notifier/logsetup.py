@@ -0,0 +1,161 @@
+"""Non-blocking logging to a rotating app.log.
+
+Log calls on any thread only put the record on an unbounded queue. A
+listener thread formats records and writes them, so a slow disk or an
+antivirus scan of the log file never stalls polling.
+
+app.log is rolled over when it reaches log_max_bytes or is older than
+log_rotate_days. Old logs are kept gzipped as app.log.1.gz (newest) up to
+app.log.<log_backups>.gz. With "log_format": "json", every line is one
+JSON object with ts, level, logger, thread and msg (and exc for errors).
+Levels can be set per logger with "log_levels".
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUPS = 5
+DEFAULT_ROTATE_DAYS = 1
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+log = logging.getLogger(__name__)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class RotatingLogHandler(logging.handlers.RotatingFileHandler):
+    """Rotates by size and by age, gzipping the rotated files."""
+
+    def __init__(
+        self,
+        filename: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+        rotate_days: float = DEFAULT_ROTATE_DAYS,
+    ) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        self.namer = lambda name: name + ".gz"
+        self.rotator = _gzip_rotator
+        self._interval = rotate_days * 86400
+        try:
+            opened = os.path.getmtime(filename)
+        except OSError:
+            opened = time.time()
+        self._rollover_at = opened + self._interval if self._interval else 0.0
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self._rollover_at and time.time() >= self._rollover_at:
+            if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+                return True
+            self._rollover_at = time.time() + self._interval  # Nothing to keep yet
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        if self._interval:
+            self._rollover_at = time.time() + self._interval
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records without formatting them on the calling thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merge the args now, since they may change after the call;
+        # timestamps, JSON and tracebacks are formatted by the listener.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class LogPipeline:
+    """Root logging through a queue to the rotating file and the console."""
+
+    def __init__(self, log_file: Path) -> None:
+        self.log_file = log_file
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener: logging.handlers.QueueListener | None = None
+        self._handler: logging.Handler | None = None
+        self._leveled: set[str] = set()  # Loggers given a level by log_levels
+
+    def start(self, config: dict) -> None:
+        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        if config.get("log_format", "text") == "json":
+            formatter: logging.Formatter = JsonFormatter()
+        else:
+            formatter = logging.Formatter(TEXT_FORMAT)
+        file_handler = RotatingLogHandler(
+            self.log_file,
+            max_bytes=config.get("log_max_bytes", DEFAULT_MAX_BYTES),
+            backups=config.get("log_backups", DEFAULT_BACKUPS),
+            rotate_days=config.get("log_rotate_days", DEFAULT_ROTATE_DAYS),
+        )
+        file_handler.setFormatter(formatter)
+        handlers: list[logging.Handler] = [file_handler]
+        if sys.stderr is not None:  # None under pythonw
+            console = logging.StreamHandler()
+            console.setFormatter(logging.Formatter(TEXT_FORMAT))
+            handlers.append(console)
+        self._listener = logging.handlers.QueueListener(
+            self._queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        self._handler = _QueueHandler(self._queue)
+        root = logging.getLogger()
+        root.addHandler(self._handler)
+        self.apply_levels(config)
+
+    def apply_levels(self, config: dict) -> None:
+        """Set the root level and per-logger levels from config."""
+        levels = {"": config.get("log_level", "INFO"), **config.get("log_levels", {})}
+        for name in self._leveled - levels.keys():
+            logging.getLogger(name).setLevel(logging.NOTSET)
+        for name, level in levels.items():
+            try:
+                logging.getLogger(name or None).setLevel(str(level).upper())
+            except ValueError:
+                log.warning("Unknown log level %r for %s", level, name or "root")
+        self._leveled = set(levels) - {""}
+
+    def stop(self) -> None:
+        """Write out queued records and close the log file."""
+        if self._listener is None:
+            return
+        logging.getLogger().removeHandler(self._handler)
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
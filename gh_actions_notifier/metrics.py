@@ -0,0 +1,335 @@
+"""In-process metrics: counters, gauges and histograms.
+
+The API clients, the poller, the state store and the notifier record into
+the module-level REGISTRY. The figures can be scraped in Prometheus text
+format from an optional localhost endpoint (MetricsServer), and the tray
+shows a one-line summary of the last cycle (summary_text).
+
+Everything here is plain Python with a lock per metric; recording a sample
+costs a dict lookup and an addition.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9464
+REQUEST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CYCLE_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SAVE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+# Path segments that name a repo, user, org or run, collapsed in endpoint labels
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"^/repos/[^/]+/[^/]+/actions/runs/\d+$"), "/repos/{repo}/actions/runs/{id}"),
+    (re.compile(r"^/repos/[^/]+/[^/]+/"), "/repos/{repo}/"),
+    # Link URLs of later listing pages name the repo by ID
+    (re.compile(r"^/repositories/\d+/"), "/repositories/{id}/"),
+    (re.compile(r"^/(users|orgs)/[^/]+/"), r"/\1/{name}/"),
+]
+
+
+def endpoint_label(path: str) -> str:
+    """Collapse an API path into a low-cardinality label, by the first pattern that matches."""
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        label, matched = pattern.subn(replacement, path, count=1)
+        if matched:
+            return label
+    return path
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: tuple[str, ...], value) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, optionally split by labels."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def total(self, **labels: str) -> float:
+        """Sum over every label set matching the given labels."""
+        want = {self.labels.index(name): str(v) for name, v in labels.items()}
+        with self._lock:
+            return sum(
+                v
+                for key, v in self._values.items()
+                if all(key[i] == value for i, value in want.items())
+            )
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float | None:
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets=REQUEST_BUCKETS
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last one is +Inf), then sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return sum(state[0]) if state else 0
+
+    def _render_value(self, key: tuple[str, ...], value) -> list[str]:
+        counts, total = value
+        names = (*self.labels, "le")
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), counts):
+            cumulative += count
+            labels = _format_labels(names, (*key, _format_value(bound)))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labels, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Named collection of metrics, rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets=REQUEST_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        """Every metric in Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+API_REQUESTS = REGISTRY.counter(
+    "ghan_api_requests_total",
+    "GitHub API requests by endpoint and HTTP status (error: no response)",
+    ("endpoint", "status"),
+)
+API_BYTES = REGISTRY.counter(
+    "ghan_api_response_bytes_total", "Response body bytes received", ("endpoint",)
+)
+API_LATENCY = REGISTRY.histogram(
+    "ghan_api_request_seconds", "GitHub API request latency", ("endpoint",)
+)
+RATE_REMAINING = REGISTRY.gauge(
+    "ghan_rate_limit_remaining", "Core rate limit left, summed over the token pool"
+)
+RATE_LIMIT = REGISTRY.gauge("ghan_rate_limit", "Core rate limit, summed over the token pool")
+CYCLE_SECONDS = REGISTRY.histogram(
+    "ghan_poll_cycle_seconds", "Wall time of a poll cycle", buckets=CYCLE_BUCKETS
+)
+CYCLE_LAST_SECONDS = REGISTRY.gauge("ghan_poll_cycle_last_seconds", "Wall time of the last cycle")
+CYCLE_REQUESTS = REGISTRY.gauge("ghan_poll_cycle_requests", "API requests made by the last cycle")
+CYCLE_NOT_MODIFIED = REGISTRY.gauge(
+    "ghan_poll_cycle_not_modified", "304 responses in the last cycle"
+)
+REPOS_POLLED = REGISTRY.counter("ghan_repos_polled_total", "Repos whose runs were listed")
+REPOS_SKIPPED = REGISTRY.counter(
+    "ghan_repos_skipped_total",
+    "Repos left out of a cycle (not due, over budget, or settled by GraphQL discovery)",
+)
+NOTICES_QUEUED = REGISTRY.counter("ghan_notifications_total", "Run notifications queued")
+NOTIFY_QUEUE_DEPTH = REGISTRY.gauge(
+    "ghan_notification_queue_depth", "Run notifications waiting to be shown"
+)
+TOASTS_SHOWN = REGISTRY.counter("ghan_toasts_total", "Toasts shown, by kind", ("kind",))
+STATE_WRITES = REGISTRY.counter("ghan_state_writes_total", "State snapshot writes or commits")
+STATE_WRITE_BYTES = REGISTRY.counter("ghan_state_write_bytes_total", "State snapshot bytes written")
+STATE_WRITE_SECONDS = REGISTRY.histogram(
+    "ghan_state_write_seconds", "Time to write or commit state", buckets=SAVE_BUCKETS
+)
+
+
+def observe_request(path: str, status: int | str, seconds: float, size: int = 0) -> None:
+    """Record one API request attempt."""
+    endpoint = endpoint_label(path)
+    API_REQUESTS.inc(endpoint=endpoint, status=str(status))
+    API_LATENCY.observe(seconds, endpoint=endpoint)
+    if size:
+        API_BYTES.inc(size, endpoint=endpoint)
+
+
+def request_counts() -> tuple[float, float]:
+    """(requests, 304s) so far, to diff around a cycle."""
+    return API_REQUESTS.total(), API_REQUESTS.total(status="304")
+
+
+def record_cycle(seconds: float, before: tuple[float, float]) -> None:
+    """Record a finished poll cycle, given request_counts() from its start."""
+    requests, not_modified = request_counts()
+    CYCLE_SECONDS.observe(seconds)
+    CYCLE_LAST_SECONDS.set(seconds)
+    CYCLE_REQUESTS.set(requests - before[0])
+    CYCLE_NOT_MODIFIED.set(not_modified - before[1])
+
+
+def summary_text() -> str:
+    """One line for the tray, or "" before the first cycle."""
+    seconds = CYCLE_LAST_SECONDS.value()
+    if seconds is None:
+        return ""
+    text = (
+        f"Last cycle: {seconds:.1f}s, {CYCLE_REQUESTS.value():.0f} requests "
+        f"({CYCLE_NOT_MODIFIED.value():.0f} cached)"
+    )
+    remaining = RATE_REMAINING.value()
+    if remaining is not None:
+        text += f", {remaining:.0f} left"
+    return text
+
+
+class MetricsServer:
+    """Serves REGISTRY at /metrics on localhost."""
+
+    def __init__(self, registry: Registry = REGISTRY, port: int = DEFAULT_PORT) -> None:
+        self._registry = registry
+        self._port = port
+        self._server: ThreadingHTTPServer | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def start(self) -> None:
+        handler = type("Handler", (_Handler,), {"registry": self._registry})
+        self._server = ThreadingHTTPServer(("127.0.0.1", self._port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="metrics", daemon=True
+        ).start()
+        log.info("Metrics endpoint at http://%s:%d/metrics", *self.address)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry: Registry
+
+    def log_message(self, format, *args) -> None:
+        log.debug("Metrics %s - %s", self.address_string(), format % args)
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,133 @@
+"""Field-selective decoding of GitHub API responses.
+
+Workflow run and repo objects from the API carry dozens of fields and
+nested objects the poller never reads. The TypedDicts below list the
+fields that are used, and decoding only ever materializes those.
+
+With msgspec installed, bodies are decoded straight into these shapes and
+the parser skips every other field without building Python objects for
+it. Without msgspec, the stdlib json parser is used and the result is
+projected down to the same fields, which saves retained memory but not
+parse time. Either way callers get plain dicts.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Optional, TypedDict
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional speedup
+    msgspec = None
+
+
+class WorkflowRun(TypedDict, total=False):
+    id: int
+    name: Optional[str]
+    status: Optional[str]
+    conclusion: Optional[str]
+    head_branch: Optional[str]
+    head_sha: Optional[str]
+    html_url: Optional[str]
+    created_at: Optional[str]
+
+
+class RunsPage(TypedDict, total=False):
+    total_count: int
+    workflow_runs: list[WorkflowRun]
+
+
+class Repo(TypedDict, total=False):
+    id: int
+    full_name: str
+    pushed_at: Optional[str]
+    archived: bool
+    disabled: bool
+
+
+class EventRepo(TypedDict, total=False):
+    name: str
+
+
+class Event(TypedDict, total=False):
+    id: str
+    type: str
+    repo: EventRepo
+    created_at: Optional[str]
+
+
+class RunEvent(TypedDict, total=False):
+    """A workflow_run webhook payload."""
+
+    action: str
+    workflow_run: WorkflowRun
+    repository: Repo
+
+
+_RUN_FIELDS = tuple(WorkflowRun.__annotations__)
+_REPO_FIELDS = tuple(Repo.__annotations__)
+_EVENT_FIELDS = tuple(Event.__annotations__)
+
+
+def _project(obj: dict, fields: tuple[str, ...]) -> dict:
+    return {k: obj[k] for k in fields if k in obj}
+
+
+def decode_json(content: bytes):
+    """Plain JSON, for small responses whose fields are read directly."""
+    return json.loads(content)
+
+
+if msgspec is not None:
+    _runs_page_decoder = msgspec.json.Decoder(RunsPage)
+    _run_decoder = msgspec.json.Decoder(WorkflowRun)
+    _repos_decoder = msgspec.json.Decoder(list[Repo])
+    _events_decoder = msgspec.json.Decoder(list[Event])
+    _run_event_decoder = msgspec.json.Decoder(RunEvent)
+
+    def decode_runs_page(content: bytes) -> RunsPage:
+        return _runs_page_decoder.decode(content)
+
+    def decode_run(content: bytes) -> WorkflowRun:
+        return _run_decoder.decode(content)
+
+    def decode_repos(content: bytes) -> list[Repo]:
+        return _repos_decoder.decode(content)
+
+    def decode_events(content: bytes) -> list[Event]:
+        return _events_decoder.decode(content)
+
+    def decode_run_event(content: bytes) -> RunEvent:
+        return _run_event_decoder.decode(content)
+
+else:
+
+    def decode_runs_page(content: bytes) -> RunsPage:
+        data = json.loads(content)
+        return {
+            "total_count": data.get("total_count", 0),
+            "workflow_runs": [_project(r, _RUN_FIELDS) for r in data.get("workflow_runs", [])],
+        }
+
+    def decode_run(content: bytes) -> WorkflowRun:
+        return _project(json.loads(content), _RUN_FIELDS)
+
+    def decode_repos(content: bytes) -> list[Repo]:
+        return [_project(r, _REPO_FIELDS) for r in json.loads(content)]
+
+    def decode_events(content: bytes) -> list[Event]:
+        events = [_project(e, _EVENT_FIELDS) for e in json.loads(content)]
+        for e in events:
+            if "repo" in e:
+                e["repo"] = {"name": e["repo"].get("name", "")}
+        return events
+
+    def decode_run_event(content: bytes) -> RunEvent:
+        data = json.loads(content)
+        event: RunEvent = {"action": data.get("action", "")}
+        if "workflow_run" in data:
+            event["workflow_run"] = _project(data["workflow_run"], _RUN_FIELDS)
+        if "repository" in data:
+            event["repository"] = _project(data["repository"], _REPO_FIELDS)
+        return event
@@ -1,56 +1,220 @@
-"""Windows toast notifications via winotify.
+"""Toast notifications, dispatched off the poll thread.
 
-Sends native Windows 10/11 toast notifications for completed GitHub Actions
-workflow runs, with clickable "View Run" buttons that open the run URL.
+Notifier.notify_run only queues a notice. A worker thread collects notices
+for COALESCE_SECONDS, groups runs of the same commit into one toast, and
+shows at most TOASTS_PER_MINUTE toasts. When a burst has more groups than
+that allows, the failures go first and the rest are folded into a
+summary toast. While the limit is used up, notices keep accumulating, so
+later cycles are aggregated with them instead of being dropped.
+
+Toasts go to a backend with a show(toast) method. WinotifyBackend shows
+native Windows 10/11 toasts with a "View Run" button; RecordingBackend
+keeps them in a list, for running without Windows.
 """
 
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+import time
+from collections import deque
 
-from winotify import Notification, audio
+from . import metrics, tracing
 
 log = logging.getLogger(__name__)
 
 APP_ID = "GH Actions Notifier"
+COALESCE_SECONDS = 2.0  # Wait this long after a notice for related ones
+TOASTS_PER_MINUTE = 6
+_STOP = object()
+
+
+class Toast:
+    """One notification as shown to the user."""
+
+    __slots__ = ("title", "body", "url", "failed")
+
+    def __init__(self, title: str, body: str, url: str = "", failed: bool = False) -> None:
+        self.title = title
+        self.body = body
+        self.url = url
+        self.failed = failed
+
+    def __repr__(self) -> str:
+        return f"Toast({self.title!r}, {self.body!r})"
+
+
+class WinotifyBackend:
+    """Shows toasts with winotify (imported on first use)."""
+
+    def __init__(self) -> None:
+        from winotify import Notification, audio
+
+        self._notification = Notification
+        self._audio = audio
+
+    def show(self, toast: Toast) -> None:
+        notification = self._notification(
+            app_id=APP_ID, title=toast.title, msg=toast.body, duration="short"
+        )
+        notification.set_audio(
+            self._audio.IM if toast.failed else self._audio.Default, loop=False
+        )
+        if toast.url:
+            notification.add_actions(label="View Run", launch=toast.url)
+        notification.show()
+
+
+class RecordingBackend:
+    """Keeps every toast in a list instead of showing it."""
+
+    def __init__(self) -> None:
+        self.toasts: list[Toast] = []
+
+    def show(self, toast: Toast) -> None:
+        self.toasts.append(toast)
+
+
+class _RunNotice:
+    __slots__ = ("repo", "workflow", "branch", "conclusion", "url", "head_sha")
+
+    def __init__(self, repo, workflow, branch, conclusion, url, head_sha) -> None:
+        self.repo = repo
+        self.workflow = workflow
+        self.branch = branch
+        self.conclusion = conclusion
+        self.url = url
+        self.head_sha = head_sha
+
+    @property
+    def failed(self) -> bool:
+        return self.conclusion != "success"
+
+
+def _group_toast(notices: list[_RunNotice]) -> Toast:
+    """One toast for runs of the same repo and commit."""
+    first = notices[0]
+    failed = [n for n in notices if n.failed]
+    url = (failed or notices)[0].url
+    title = f"{'[FAIL]' if failed else '[PASS]'} {first.repo}"
+    if len(notices) == 1:
+        status = "FAILED" if failed else "passed"
+        return Toast(title, f"{first.workflow} on {first.branch} {status}", url, bool(failed))
+    parts = []
+    if failed:
+        parts.append(f"{len(failed)} FAILED ({', '.join(n.workflow for n in failed)})")
+    if len(failed) < len(notices):
+        parts.append(f"{len(notices) - len(failed)} passed")
+    body = f"{len(notices)} workflows on {first.branch}: {', '.join(parts)}"
+    return Toast(title, body, url, bool(failed))
+
+
+def _summary_toast(groups: list[list[_RunNotice]]) -> Toast:
+    runs = sum(len(g) for g in groups)
+    repos = len({g[0].repo for g in groups})
+    failed = sum(1 for g in groups for n in g if n.failed)
+    body = f"...and {runs} more workflow run(s) completed in {repos} repo(s)"
+    if failed:
+        body += f", {failed} failed"
+    return Toast("GitHub Actions", body + ".", failed=bool(failed))
 
 
 class Notifier:
-    """Sends Windows toast notifications for workflow run completions."""
+    """Queues run notifications and shows them from a worker thread."""
 
-    def notify_run(self, repo: str, workflow: str, branch: str, conclusion: str, url: str) -> None:
-        """Show a toast notification for a single workflow run completion."""
-        status = "passed" if conclusion == "success" else "FAILED"
-        title = f"{'[PASS]' if conclusion == 'success' else '[FAIL]'} {repo}"
-        body = f"{workflow} on {branch} {status}"
+    def __init__(self, backend=None) -> None:
+        self._backend = backend
+        self._queue: queue.Queue = queue.Queue()
+        self._shown: deque[float] = deque()  # Monotonic times of recent toasts
+        self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+        self._thread.start()
 
-        try:
-            toast = Notification(
-                app_id=APP_ID,
-                title=title,
-                msg=body,
-                duration="short",
-            )
-            toast.set_audio(
-                audio.Default if conclusion == "success" else audio.IM,
-                loop=False,
-            )
-            if url:
-                toast.add_actions(label="View Run", launch=url)
-            toast.show()
-            log.info("Toast: %s — %s", title, body)
-        except Exception as e:
-            log.error("Failed to show toast: %s", e)
+    def notify_run(
+        self,
+        repo: str,
+        workflow: str,
+        branch: str,
+        conclusion: str,
+        url: str,
+        head_sha: str | None = None,
+    ) -> None:
+        """Queue a notification for a completed workflow run."""
+        metrics.NOTICES_QUEUED.inc()
+        metrics.NOTIFY_QUEUE_DEPTH.inc()
+        self._queue.put(_RunNotice(repo, workflow, branch, conclusion, url, head_sha))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Show whatever is still queued, then stop the worker."""
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        pending: list[_RunNotice] = []
+        first_at = 0.0
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, self._next_dispatch_at(first_at) - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._dispatch(pending)
+                pending = []
+                continue
+            if item is _STOP:
+                self._dispatch(pending, force=True)
+                return
+            if not pending:
+                first_at = time.monotonic()
+            pending.append(item)
 
-    def notify_summary(self, count: int) -> None:
-        """Show a summary toast when notifications are capped per cycle."""
+    def _next_dispatch_at(self, first_at: float) -> float:
+        """When pending notices may be shown: after coalescing and within the rate limit."""
+        self._prune_shown()
+        at = first_at + COALESCE_SECONDS
+        if len(self._shown) >= TOASTS_PER_MINUTE:
+            at = max(at, self._shown[0] + 60)
+        return at
+
+    def _prune_shown(self) -> None:
+        cutoff = time.monotonic() - 60
+        while self._shown and self._shown[0] <= cutoff:
+            self._shown.popleft()
+
+    def _dispatch(self, notices: list[_RunNotice], force: bool = False) -> None:
+        if not notices:
+            return
+        groups: dict[tuple, list[_RunNotice]] = {}
+        for n in notices:
+            groups.setdefault((n.repo, n.head_sha or n.branch), []).append(n)
+        # Failures first, then in arrival order
+        ordered = sorted(groups.values(), key=lambda g: not any(n.failed for n in g))
+        self._prune_shown()
+        slots = TOASTS_PER_MINUTE - len(self._shown)
+        if force:
+            slots = max(slots, 1)
+        summary = None
+        if len(ordered) > slots:
+            keep = max(slots - 1, 0)
+            summary = _summary_toast(ordered[keep:])
+            ordered = ordered[:keep]
+        toasts = [_group_toast(g) for g in ordered]
+        metrics.TOASTS_SHOWN.inc(len(toasts), kind="run")
+        if summary is not None:
+            toasts.append(summary)
+            metrics.TOASTS_SHOWN.inc(kind="summary")
+        metrics.NOTIFY_QUEUE_DEPTH.dec(len(notices))
+        for toast in toasts:
+            self._show(toast)
+
+    def _show(self, toast: Toast) -> None:
+        self._shown.append(time.monotonic())
         try:
-            toast = Notification(
-                app_id=APP_ID,
-                title="GitHub Actions",
-                msg=f"...and {count} more workflow run(s) completed.",
-                duration="short",
-            )
-            toast.show()
+            if self._backend is None:
+                self._backend = WinotifyBackend()
+            with tracing.span("toast", title=toast.title):
+                self._backend.show(toast)
+            log.info("Toast: %s — %s", toast.title, toast.body)
         except Exception as e:
-            log.error("Failed to show summary toast: %s", e)
+            log.error("Failed to show toast: %s", e)
@@ -7,14 +7,36 @@ for new completions. First-run seeding prevents notification floods.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import math
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics, tracing
+from .budget import RateBudget
+from .events import EventFeed
+from .filters import RepoFilter
+from .github_api import GRAPHQL_BATCH_SIZE, REPOS_PER_PAGE
+from .inflight import InflightTracker
+from .repo_index import RepoEntry, RepoIndex, index_path
+from .scheduler import RepoScheduler
+from .seen import SeenWindow
 
 log = logging.getLogger(__name__)
 
 REPO_CACHE_TTL = 600  # 10 minutes
-MAX_REPOS_PER_CYCLE = 30
-MAX_NOTIFICATIONS_PER_CYCLE = 5
+REPO_FULL_RESYNC = 6 * 3600  # Full re-pagination to catch deletions and access changes
+MAX_REPOS_PER_CYCLE = 30  # Batch size when the rate budget is unknown or disabled
+DEFAULT_MAX_STALENESS = 1800  # Longest a dormant repo goes unpolled, budget permitting
+DEFAULT_EVENT_SWEEP_INTERVAL = 3600  # Same, while the event feed is healthy
+DEFAULT_RECONCILE_INTERVAL = 900  # Seconds between cycles while webhooks deliver runs
+MAX_SEEDS_PER_CYCLE = 200  # Unseeded repos per cycle filling spare batch slots in concurrent mode
+ASYNC_MAX_IN_FLIGHT = 64  # Concurrent requests per batch in the async engine
+FAST_LANE_BUDGET_SHARE = 0.5  # Share of the spread rate budget the in-flight lane may use
+RUN_PAGE_SIZES = (10, 25, 100)  # Few sizes, so listing URLs and their ETags stay stable
+CREATED_LOOKBACK = 3 * 86400  # Oldest creation time, before the last poll, of a run still reported
 
 
 class Poller:
@@ -26,99 +48,520 @@ class Poller:
         self._state = state
         self._github = github
         self._notifier = notifier
-        self._repo_cache: list[dict] = []
-        self._repo_cache_time: float = 0
-        self._repo_offset: int = 0
+        # Unfiltered index (persisted) and the filtered view polled each cycle
+        self._index_path = index_path()
+        self._index = RepoIndex.load(self._index_path)
+        self._index_lock = threading.Lock()
+        self._refreshing = False
+        self._repo_cache: list[RepoEntry] = []
+        self._filter = RepoFilter.from_config(config)
+        self._scheduler = RepoScheduler()
+        self._apply_filter()
+        if self._index.pages:
+            log.info("Loaded %d repos from saved index", len(self._index.repos))
+        self._budget = RateBudget(github)
+        self._inflight = InflightTracker(state)
+        self._events = (
+            EventFeed(github, config.get("event_orgs", [])) if config.get("event_feed") else None
+        )
+        # Seconds until the next cycle, as planned by the budget
+        self.next_interval: float | None = None
+        # Set while a webhook receiver delivers runs; polling only reconciles
+        self.webhook_active = False
+        # Serializes dedup and notification between the poll loop and webhooks
+        self._handle_lock = threading.Lock()
 
-    def clear_repo_cache(self) -> None:
-        """Force a fresh repo list fetch on the next poll cycle."""
-        self._repo_cache = []
-        self._repo_cache_time = 0
+    def close(self) -> None:
+        """Release engine resources. Call from the polling thread."""
 
-    def _get_repos(self) -> list[dict]:
-        """Return the cached repo list, refreshing if stale."""
-        now = time.time()
-        if self._repo_cache and (now - self._repo_cache_time) < REPO_CACHE_TTL:
-            return self._repo_cache
+    def _concurrent(self) -> bool:
+        return self.config.get("poll_workers", 1) > 1
 
-        repos = self._github.get_repos()
-        if not repos:
-            return self._repo_cache  # Keep stale cache if API fails
+    def reset_identity(self) -> None:
+        """Forget what belonged to the previous token, after re-authenticating.
 
-        # Filter by allowlist/blocklist
-        allowlist = self.config.get("allowlist", [])
-        blocklist = self.config.get("blocklist", [])
+        The next cycle fully re-paginates the repo list, and the event feed
+        looks up the new login before reading its feeds.
+        """
+        with self._index_lock:
+            self._index.fetched_at = 0
+            self._index.synced_at = 0
+        if self._events is not None:
+            self._events.reset()
 
-        if allowlist:
-            repos = [r for r in repos if r["full_name"] in allowlist]
-        elif blocklist:
-            repos = [r for r in repos if r["full_name"] not in blocklist]
+    def refilter(self) -> None:
+        """Recompile the filter rules from config and re-filter the known repos.
 
+        Nothing is refetched: the unfiltered index already holds every repo.
+        """
+        repo_filter = RepoFilter.from_config(self.config)
+        with self._index_lock:
+            self._filter = repo_filter
+            self._apply_filter()
+        log.info("Monitoring %d of %d repos", len(self._repo_cache), len(self._index.repos))
+
+    def _apply_filter(self) -> None:
+        """Rebuild the filtered repo list from the index."""
+        matches = self._filter.matches
+        # Archived and disabled repos can't produce new runs
+        repos = [
+            r
+            for r in self._index.repos
+            if not (r.archived or r.disabled) and matches(r.full_name)
+        ]
         self._repo_cache = repos
-        self._repo_cache_time = now
-        self._repo_offset = 0
-        log.info("Refreshed repo list: %d repos", len(repos))
-        return repos
+        self._scheduler.prune(repos)
+
+    def _get_repos(self) -> list[RepoEntry]:
+        """Return the filtered repo list, revalidating it when stale.
+
+        With no repos yet the refresh runs inline; otherwise the current
+        list is returned immediately and refreshed on a background thread.
+        """
+        if time.time() - self._index.fetched_at < REPO_CACHE_TTL:
+            return self._repo_cache
+        if not self._index.pages:
+            self._refresh_repos()
+        elif not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=self._refresh_repos, daemon=True).start()
+        return self._repo_cache
+
+    def _refresh_repos(self) -> None:
+        """Revalidate the repo index and save it.
+
+        Usually only the leading pages with new pushes are fetched and
+        merged. A full resync runs every REPO_FULL_RESYNC seconds, or when
+        there is no index yet, to pick up deleted repos and access changes.
+        """
+        try:
+            now = time.time()
+            full = not self._index.pages or now - self._index.synced_at >= REPO_FULL_RESYNC
+            pages = self._github.get_repo_pages(
+                self._index.etags,
+                self._index.page_sizes(),
+                pushed_after=None if full else self._index.newest_push,
+            )
+            if pages is None:
+                return  # Keep the stale index if the API fails
+            # Reaching a short last page means the whole list came back
+            last = pages[-1][1] if pages else None
+            if last is not None and len(last) < REPOS_PER_PAGE:
+                full = True
+            with self._index_lock:
+                if full:
+                    self._index.apply_pages(pages, time.time())
+                    changed = sum(1 for _, repos in pages if repos is not None)
+                    summary = f"full resync, {changed} of {len(pages)} pages changed"
+                else:
+                    changed = self._index.merge_head(pages, REPOS_PER_PAGE, time.time())
+                    summary = f"incremental, {len(pages)} page(s), {changed} repo(s) updated"
+                self._apply_filter()
+                self._index.save(self._index_path)
+            log.info("Refreshed repo list: %d repos (%s)", len(self._repo_cache), summary)
+        finally:
+            self._refreshing = False
 
     def poll_once(self) -> None:
         """Run a single poll cycle across a batch of repos."""
         if not self._state.token:
             return
+        if self._github.rate_remaining is None:
+            self._github.refresh_rate_limit()
+        started = time.perf_counter()
+        requests_before = metrics.request_counts()
+        try:
+            with tracing.span("poll_once"):
+                self._poll_batch()
+        finally:
+            self._inflight.flush()
+            self._state.flush()
+            metrics.record_cycle(time.perf_counter() - started, requests_before)
+            graphql_cost = self._github.graphql_cost
+            hits, misses = self._github.reset_cache_stats()
+            if graphql_cost:
+                log.info("GraphQL discovery cost %d point(s) this cycle", graphql_cost)
+            self._budget.observe(hits, misses)
+            if hits or misses:
+                log.info("Response cache: %d hit(s), %d miss(es) this cycle", hits, misses)
+
+    def _interval_bounds(self) -> tuple[float, float]:
+        """Return (min, max) seconds between cycles."""
+        if self.webhook_active:
+            reconcile = self.config.get("webhook_reconcile_interval", DEFAULT_RECONCILE_INTERVAL)
+            return reconcile, reconcile
+        max_interval = self.config.get("poll_interval", 30)
+        return min(self.config.get("min_poll_interval", 10), max_interval), max_interval
+
+    def _plan_cycle(self, repo_count: int) -> int:
+        """Pick this cycle's batch size and set next_interval."""
+        min_interval, max_interval = self._interval_bounds()
+        if not self.config.get("rate_budget", True):
+            self.next_interval = max_interval
+            return MAX_REPOS_PER_CYCLE
 
+        now = time.time()
+        # Hold back enough for every repo list refresh due before reset
+        window = max(0.0, self._github.rate_reset - now)
+        pages = math.ceil(repo_count / REPOS_PER_PAGE) or 1
+        refreshes = math.ceil(window / REPO_CACHE_TTL)
+        batch, self.next_interval = self._budget.plan(
+            repo_count,
+            max_interval=max_interval,
+            min_interval=min_interval,
+            reserve=pages * refreshes,
+            now=now,
+        )
+        return MAX_REPOS_PER_CYCLE if batch is None else batch
+
+    def _poll_batch(self) -> None:
         repos = self._get_repos()
         if not repos:
             return
 
-        # Rate-limit-aware batching: poll a subset each cycle
-        batch = repos
-        if len(repos) > MAX_REPOS_PER_CYCLE:
-            start = self._repo_offset % len(repos)
-            batch = repos[start : start + MAX_REPOS_PER_CYCLE]
-            if len(batch) < MAX_REPOS_PER_CYCLE:
-                batch += repos[: MAX_REPOS_PER_CYCLE - len(batch)]
-            self._repo_offset = (start + MAX_REPOS_PER_CYCLE) % len(repos)
-
-        notification_count = 0
+        # Rate-limit-aware batching: poll the most overdue repos each cycle
+        batch_size = self._plan_cycle(len(repos))
+        if batch_size <= 0:
+            metrics.REPOS_SKIPPED.inc(len(repos))
+            return
+        if self._github.breaker.is_open:
+            log.info("Skipping poll cycle: %s", self._github.breaker.status_text())
+            metrics.REPOS_SKIPPED.inc(len(repos))
+            return
+        self._read_event_feed()
+        batch = self._scheduler.select(
+            repos,
+            batch_size,
+            now=time.time(),
+            cycle_interval=self.next_interval or self.config.get("poll_interval", 30),
+            max_staleness=self._max_staleness(),
+        )
 
+        targets: list[tuple[str, SeenWindow]] = []
         for repo in batch:
-            full_name = repo["full_name"]
+            full_name = repo.full_name
             if "/" not in full_name:
                 log.warning("Skipping repo with unexpected name: %s", full_name)
                 continue
-            owner, name = full_name.split("/", 1)
-            last_seen = self._state.get_last_seen_id(full_name)
+            targets.append((full_name, self._state.get_seen_window(full_name)))
+
+        # With a worker pool, spend batch slots the due repos left unused on
+        # seeding unseen repos, rather than waiting for the scheduler to reach
+        # them. Seeds count against the planned batch, so they stay in budget.
+        spare = min(batch_size - len(batch), MAX_SEEDS_PER_CYCLE)
+        if self._concurrent() and spare > 0 and len(batch) < len(repos):
+            in_batch = {name for name, _ in targets}
+            seeds = 0
+            for repo in repos:
+                if seeds >= spare:
+                    break
+                full_name = repo.full_name
+                if full_name in in_batch or "/" not in full_name:
+                    continue
+                window = self._state.get_seen_window(full_name)
+                if window.is_empty:
+                    targets.append((full_name, window))
+                    seeds += 1
+
+        with tracing.span("discover", repos=len(targets)):
+            targets = self._discover(targets)
+        metrics.REPOS_POLLED.inc(len(targets))
+        metrics.REPOS_SKIPPED.inc(max(0, len(repos) - len(targets)))
+        with tracing.span("fetch_runs", repos=len(targets)):
+            results = self._fetch_runs(targets)
+        with self._handle_lock, tracing.span("handle_results"):
+            self._handle_results(targets, results)
+
+    def _discover(self, targets: list[tuple[str, SeenWindow]]) -> list[tuple[str, SeenWindow]]:
+        """Drop targets whose latest runs are all known, per batched GraphQL.
+
+        Only used with in-flight tracking, which covers runs on commits
+        behind the branch heads the query looks at. Unseeded repos and
+        repos the query could not resolve are always listed over REST. So
+        are repos not listed for max staleness, since the query misses runs
+        off those heads (fork PRs, tags, dispatches on older branches).
+        """
+        if not self.config.get("graphql_discovery") or not self._tracking_inflight():
+            return targets
+        names = [name for name, window in targets if not window.is_empty]
+        if not names:
+            return targets
+        latest = self._github.get_latest_runs(
+            names, batch_size=self.config.get("graphql_batch_size", GRAPHQL_BATCH_SIZE)
+        )
+        if latest is None:
+            return targets  # Fall back to listing every repo
+        now = time.time()
+        max_staleness = self._max_staleness()
+        kept = []
+        for name, window in targets:
+            runs = latest.get(name)
+            if (
+                runs is not None
+                and not any(self._is_news(window, r) for r in runs)
+                and now - self._scheduler.last_listed(name) < max_staleness
+            ):
+                self._scheduler.record_poll(name, 0, now, listed=False)
+                continue
+            kept.append((name, window))
+        log.debug("GraphQL discovery: %d of %d repo(s) need listing", len(kept), len(targets))
+        return kept
+
+    def _is_news(self, window: SeenWindow, run: dict) -> bool:
+        """True if a discovered run is one the REST listing would report."""
+        if window.is_seen(run["id"]):
+            return False
+        # The fast lane checks tracked runs itself
+        return run["id"] not in self._inflight
+
+    def _handle_results(
+        self, targets: list[tuple[str, SeenWindow]], results: list[list[dict] | None]
+    ) -> None:
+        """Dedup fetched runs, update state and notify (caller holds _handle_lock)."""
+        polled_at = time.time()
+        for i, ((full_name, window), runs) in enumerate(zip(targets, results)):
+            if runs is None:
+                # Fetch failed: leave the repo due so the next cycle retries it
+                results[i] = []
+                continue
+            if not window.is_empty:
+                # A webhook may have delivered some of these since the fetch
+                window = self._state.get_seen_window(full_name)
+            if self._tracking_inflight():
+                runs = self._split_inflight(full_name, runs, polled_at)
+            # Completed runs above the low-water mark that aren't in the window
+            results[i] = runs = [r for r in runs if not window.is_seen(r["id"])]
+            # Seeding returns history, not new activity
+            self._scheduler.record_poll(
+                full_name, 0 if window.is_empty else len(runs), polled_at
+            )
+
+        # Results come back in batch order, so state updates and
+        # notifications are deterministic regardless of worker count.
+        notification_count = 0
 
-            runs = self._github.get_completed_runs(owner, name, since_id=last_seen)
+        for (full_name, window), runs in zip(targets, results):
             if not runs:
                 continue
 
-            # Update last seen to highest run ID
-            max_id = max(r["id"] for r in runs)
-            self._state.set_last_seen_id(full_name, max_id)
+            self._state.mark_seen(full_name, [r["id"] for r in runs])
 
             # First-run seeding: record baseline without notifying
-            if last_seen == 0:
-                log.info("Seeded %s with run ID %d", full_name, max_id)
+            if window.is_empty:
+                log.info("Seeded %s with %d run(s)", full_name, len(runs))
                 continue
 
+            for run in runs:
+                self._state.record_run(full_name, run)
+
             # Only notify on success and failure (skip cancelled, skipped, etc.)
-            notifiable = [r for r in runs if r.get("conclusion") in ("success", "failure")]
-
-            for i, run in enumerate(notifiable):
-                if notification_count >= MAX_NOTIFICATIONS_PER_CYCLE:
-                    remaining = len(notifiable) - i
-                    if remaining > 0:
-                        self._notifier.notify_summary(remaining)
-                    return
-
-                self._notifier.notify_run(
-                    repo=full_name,
-                    workflow=run.get("name", "Unknown"),
-                    branch=run.get("head_branch", "?"),
-                    conclusion=run["conclusion"],
-                    url=run.get("html_url", ""),
-                )
-                notification_count += 1
+            # The notifier coalesces and rate-limits bursts itself.
+            for run in runs:
+                if run.get("conclusion") in ("success", "failure"):
+                    self._notify_run(full_name, run)
+                    notification_count += 1
 
         if notification_count:
-            log.info("Sent %d notification(s) this cycle", notification_count)
+            log.info("Queued %d notification(s) this cycle", notification_count)
+
+    def _read_event_feed(self) -> None:
+        """Mark repos with new events dirty so this cycle polls them first."""
+        if self._events is None:
+            return
+        now = time.time()
+        for full_name in self._events.poll(now):
+            self._scheduler.mark_dirty(full_name, now)
+
+    def _max_staleness(self) -> float:
+        """Longest a dormant repo may go unpolled.
+
+        While the event feed is healthy it flags active repos, so dormant
+        ones only need a slow sweep.
+        """
+        if self._events is not None and self._events.healthy:
+            return self.config.get("event_sweep_interval", DEFAULT_EVENT_SWEEP_INTERVAL)
+        return self.config.get("max_repo_staleness", DEFAULT_MAX_STALENESS)
+
+    def _notify_run(self, full_name: str, run: dict) -> None:
+        self._notifier.notify_run(
+            repo=full_name,
+            workflow=run.get("name", "Unknown"),
+            branch=run.get("head_branch", "?"),
+            conclusion=run["conclusion"],
+            url=run.get("html_url", ""),
+            head_sha=run.get("head_sha"),
+        )
+
+    def _tracking_inflight(self) -> bool:
+        # Webhooks report completions directly
+        return self.config.get("track_inflight", True) and not self.webhook_active
+
+    def handle_run(self, full_name: str, run: dict) -> bool:
+        """Handle a run reported from outside the poll loop, e.g. by a webhook.
+
+        Goes through the same filters, dedup, state and notification path
+        as polled runs. Returns True if the run was new. Runs in repos that
+        have not been seeded yet are notified but left for the seeding poll
+        to record, so it still treats everything it finds as history.
+        """
+        if run.get("status") != "completed" or "id" not in run:
+            return False
+        if not self._filter.matches(full_name):
+            return False
+        with self._handle_lock:
+            window = self._state.get_seen_window(full_name)
+            if window.is_seen(run["id"]):
+                return False
+            self._inflight.untrack(run["id"])
+            if not window.is_empty:
+                self._state.mark_seen(full_name, [run["id"]])
+                self._state.record_run(full_name, run)
+            if run.get("conclusion") in ("success", "failure"):
+                self._notify_run(full_name, run)
+            self._inflight.flush()
+            self._state.flush()
+        return True
+
+    def _split_inflight(self, full_name: str, runs: list[dict], now: float) -> list[dict]:
+        """Track unfinished runs and return only the completed ones."""
+        completed = []
+        for run in runs:
+            if run.get("status") != "completed":
+                self._inflight.track(full_name, run["id"], now)
+            else:
+                # The listing reports it from here on
+                self._inflight.untrack(run["id"])
+                completed.append(run)
+        return completed
+
+    def poll_inflight(self) -> None:
+        """Fast lane: check tracked unfinished runs and notify on completion.
+
+        Each check is a conditional GET, and the number of checks per call
+        is capped to a share of the rate budget.
+        """
+        if not self._state.token or not len(self._inflight):
+            return
+        interval = self.config.get("inflight_poll_interval", 10)
+        limit = self._budget.allowance(interval, FAST_LANE_BUDGET_SHARE)
+        try:
+            for entry in self._inflight.due(limit):
+                owner, name = entry["repo"].split("/", 1)
+                run = self._github.get_run(owner, name, entry["id"])
+                if run is None or run.get("status") != "completed":
+                    continue
+                with self._handle_lock:
+                    if entry["id"] not in self._inflight:
+                        continue  # Handled by a webhook meanwhile
+                    self._inflight.untrack(entry["id"])
+                    # Marking it seen keeps the listing from reporting it again
+                    self._state.mark_seen(entry["repo"], [entry["id"]])
+                    self._state.record_run(entry["repo"], run)
+                    log.info("In-flight run %d in %s completed", entry["id"], entry["repo"])
+                    if run.get("conclusion") in ("success", "failure"):
+                        self._notify_run(entry["repo"], run)
+        finally:
+            self._inflight.flush()
+            self._state.flush()
+
+    def _fetch_runs(self, targets: list[tuple[str, SeenWindow]]) -> list[list[dict] | None]:
+        """Fetch runs above the low-water mark for each (full_name, window) target.
+
+        Uses a bounded thread pool when poll_workers > 1. The returned list
+        is always in the same order as targets, with None for failed fetches.
+        """
+        workers = max(1, int(self.config.get("poll_workers", 1)))
+        if workers == 1 or len(targets) < 2:
+            return [self._fetch_repo_runs(t) for t in targets]
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(targets)), thread_name_prefix="poll"
+        ) as pool:
+            return list(pool.map(self._fetch_repo_runs, targets))
+
+    def _listing_hints(self, full_name: str, window: SeenWindow) -> dict:
+        """Page size, creation cutoff and pagination stop for a repo's runs listing.
+
+        The page is sized for the runs the repo likely produced since its
+        last poll; bursts beyond it are paginated. Pagination stops at the
+        newest seen run only while every unseen run below it is tracked in
+        flight. Otherwise a lower-ID run that finishes after newer ones
+        could sit below that point, so the listing pages back to the
+        low-water mark (or to the oldest run the tracker dropped). A window
+        seeded from a single listing has no mark yet (low is 0, which would
+        mean one page only), so its oldest seen run stands in. Unseeded
+        repos get the default one-page listing, and repos not listed since
+        startup the default page size.
+        """
+        if window.is_empty:
+            return {}
+        floor = window.low or window.ids[0]
+        last_listed = self._scheduler.last_listed(full_name)
+        if not last_listed:
+            return {"until_id": floor}
+        expected = self._scheduler.expected_runs(full_name, time.time())
+        per_page = next((n for n in RUN_PAGE_SIZES if n >= 2 * expected), RUN_PAGE_SIZES[-1])
+        until_id = floor
+        if self._tracking_inflight():
+            dropped = self._inflight.oldest_dropped(full_name, window.low)
+            until_id = window.max_id if dropped is None else min(window.max_id, dropped - 1)
+        return {
+            "per_page": per_page,
+            "created_after": last_listed - CREATED_LOOKBACK,
+            "until_id": until_id,
+        }
+
+    def _fetch_repo_runs(self, target: tuple[str, SeenWindow]) -> list[dict] | None:
+        full_name, window = target
+        owner, name = full_name.split("/", 1)
+        fetch_runs = (
+            self._github.get_recent_runs
+            if self._tracking_inflight()
+            else self._github.get_completed_runs
+        )
+        return fetch_runs(
+            owner, name, since_id=window.low, **self._listing_hints(full_name, window)
+        )
+
+
+class AsyncPoller(Poller):
+    """Poller that fetches each batch on a single asyncio event loop.
+
+    The loop is created once and driven from the background polling thread,
+    so all per-repo requests in a cycle share one thread and the async
+    client's few multiplexed connections.
+    """
+
+    def __init__(self, app, config: dict, state, github, notifier, async_github) -> None:
+        super().__init__(app, config, state, github, notifier)
+        self._async_github = async_github
+        self._loop = asyncio.new_event_loop()
+
+    def close(self) -> None:
+        self._loop.run_until_complete(self._async_github.aclose())
+        self._loop.close()
+
+    def _concurrent(self) -> bool:
+        return True
+
+    def _fetch_runs(self, targets: list[tuple[str, SeenWindow]]) -> list[list[dict] | None]:
+        return self._loop.run_until_complete(self._fetch_runs_async(targets))
+
+    async def _fetch_runs_async(
+        self, targets: list[tuple[str, SeenWindow]]
+    ) -> list[list[dict] | None]:
+        sem = asyncio.Semaphore(ASYNC_MAX_IN_FLIGHT)
+
+        async def fetch(target: tuple[str, SeenWindow]) -> list[dict] | None:
+            full_name, window = target
+            owner, name = full_name.split("/", 1)
+            fetch_runs = (
+                self._async_github.get_recent_runs
+                if self._tracking_inflight()
+                else self._async_github.get_completed_runs
+            )
+            hints = self._listing_hints(full_name, window)
+            async with sem:
+                return await fetch_runs(owner, name, since_id=window.low, **hints)
+
+        # gather preserves input order
+        return list(await asyncio.gather(*(fetch(t) for t in targets)))
@@ -0,0 +1,227 @@
+"""Compact, disk-persisted index of the user's repos.
+
+Keeps only what the poller needs from /user/repos (ID, full name,
+pushed_at and the archived/disabled flags) in slotted RepoEntry objects,
+grouped by API page together with each page's ETag. The index is saved
+to repos.json next to state.json, so a restart can poll immediately from
+the saved list while it is revalidated in the background. A page that
+comes back 304 reuses its saved entries.
+
+Refreshes are normally incremental: only the leading pages of the
+pushed-sorted list that contain new pushes are fetched and merged in. A
+full resync, which also catches deleted repos and lost access, replaces
+the whole index now and then.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+_FLAG_ARCHIVED = 1
+_FLAG_DISABLED = 2
+
+
+def index_path() -> Path:
+    return Path(os.environ.get("APPDATA", Path.home())) / "gh-actions-notifier" / "repos.json"
+
+
+def parse_timestamp(value: str | None) -> float:
+    """Parse a GitHub ISO 8601 timestamp to epoch seconds (0 if missing)."""
+    if not value:
+        return 0.0
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class RepoEntry:
+    """One repo as the poller sees it."""
+
+    __slots__ = ("id", "full_name", "pushed_at", "archived", "disabled")
+
+    def __init__(
+        self,
+        id: int,
+        full_name: str,
+        pushed_at: float = 0.0,
+        archived: bool = False,
+        disabled: bool = False,
+    ) -> None:
+        self.id = id
+        self.full_name = full_name
+        self.pushed_at = pushed_at
+        self.archived = archived
+        self.disabled = disabled
+
+    @classmethod
+    def from_api(cls, repo: dict) -> RepoEntry:
+        return cls(
+            repo.get("id", 0),
+            repo["full_name"],
+            parse_timestamp(repo.get("pushed_at")),
+            bool(repo.get("archived")),
+            bool(repo.get("disabled")),
+        )
+
+    def __repr__(self) -> str:
+        return f"RepoEntry({self.full_name!r})"
+
+
+class RepoPage:
+    __slots__ = ("etag", "entries")
+
+    def __init__(self, etag: str | None, entries: list[RepoEntry]) -> None:
+        self.etag = etag
+        self.entries = entries
+
+
+class RepoIndex:
+    """All repos visible to the token, page by page."""
+
+    def __init__(
+        self,
+        pages: list[RepoPage] | None = None,
+        fetched_at: float = 0.0,
+        synced_at: float = 0.0,
+    ) -> None:
+        self.pages: list[RepoPage] = pages or []
+        self.fetched_at = fetched_at  # Last refresh of any kind
+        self.synced_at = synced_at  # Last full resync
+        self._repos: list[RepoEntry] | None = None
+
+    @property
+    def repos(self) -> list[RepoEntry]:
+        if self._repos is None:
+            self._repos = [e for page in self.pages for e in page.entries]
+        return self._repos
+
+    @property
+    def etags(self) -> list[str | None]:
+        return [page.etag for page in self.pages]
+
+    def page_sizes(self) -> list[int]:
+        return [len(page.entries) for page in self.pages]
+
+    @property
+    def newest_push(self) -> float:
+        return max((e.pushed_at for e in self.repos), default=0.0)
+
+    def _page(self, i: int, etag: str | None, repos: list[dict] | None) -> RepoPage | None:
+        if repos is None:
+            if i >= len(self.pages):
+                return None
+            return RepoPage(etag or self.pages[i].etag, self.pages[i].entries)
+        return RepoPage(etag, [RepoEntry.from_api(r) for r in repos])
+
+    def apply_pages(self, pages: list[tuple[str | None, list[dict] | None]], now: float) -> None:
+        """Replace the index with a fresh pagination result.
+
+        Each item is (etag, repos); repos is None for a page that came back
+        304 and keeps the saved entries for that position.
+        """
+        new_pages = [self._page(i, etag, repos) for i, (etag, repos) in enumerate(pages)]
+        self.pages = [p for p in new_pages if p is not None]
+        self.fetched_at = now
+        self.synced_at = now
+        self._repos = None
+
+    def merge_head(
+        self, pages: list[tuple[str | None, list[dict] | None]], page_size: int, now: float
+    ) -> int:
+        """Merge the leading pages of an incremental refresh.
+
+        The fetched pages replace the head of the index. Every other saved
+        entry is kept in push order behind them, and their pages lose their
+        ETags because they no longer line up with the server's pages.
+        Returns the number of repos that are new or were pushed since.
+        """
+        head = [self._page(i, etag, repos) for i, (etag, repos) in enumerate(pages)]
+        head = [p for p in head if p is not None]
+        if all(repos is None for _, repos in pages):
+            self.fetched_at = now
+            return 0
+        old = {e.id: e.pushed_at for e in self.repos}
+        changed = sum(1 for page in head for e in page.entries if old.get(e.id) != e.pushed_at)
+        fresh = {e.id for page in head for e in page.entries}
+        rest = [e for e in self.repos if e.id not in fresh]
+        tail = [RepoPage(None, rest[i : i + page_size]) for i in range(0, len(rest), page_size)]
+        self.pages = head + tail
+        self.fetched_at = now
+        self._repos = None
+        return changed
+
+    def save(self, path: Path) -> None:
+        data = {
+            "version": INDEX_VERSION,
+            "fetched_at": self.fetched_at,
+            "synced_at": self.synced_at,
+            "pages": [
+                {
+                    "etag": page.etag,
+                    # [id, full_name, pushed_at, flags]
+                    "repos": [
+                        [
+                            e.id,
+                            e.full_name,
+                            int(e.pushed_at),
+                            (_FLAG_ARCHIVED if e.archived else 0)
+                            | (_FLAG_DISABLED if e.disabled else 0),
+                        ]
+                        for e in page.entries
+                    ],
+                }
+                for page in self.pages
+            ],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            log.error("Failed to save repo index: %s", e)
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    @classmethod
+    def load(cls, path: Path) -> RepoIndex:
+        """Load a saved index, or return an empty one."""
+        if not path.exists():
+            return cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                return cls()
+            pages = [
+                RepoPage(
+                    page.get("etag"),
+                    [
+                        RepoEntry(
+                            repo_id,
+                            name,
+                            float(pushed),
+                            bool(flags & _FLAG_ARCHIVED),
+                            bool(flags & _FLAG_DISABLED),
+                        )
+                        for repo_id, name, pushed, flags in page["repos"]
+                    ],
+                )
+                for page in data.get("pages", [])
+            ]
+            return cls(pages, float(data.get("fetched_at", 0)), float(data.get("synced_at", 0)))
+        except (json.JSONDecodeError, OSError, KeyError, TypeError, ValueError) as e:
+            log.error("Failed to load repo index: %s", e)
+            return cls()
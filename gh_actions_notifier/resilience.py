@@ -0,0 +1,129 @@
+"""Retries, backoff and a circuit breaker for GitHub API requests.
+
+Timeouts, connection errors and 5xx responses are retried a couple of
+times with jittered exponential backoff. Throttling responses (429, or a
+403 carrying Retry-After or a secondary rate limit message) are never
+retried: the breaker opens for as long as GitHub asks, since retrying
+early extends a secondary limit. An exhausted primary limit is left to
+the token pool, which stops using that token until its reset.
+
+The breaker opens after FAILURE_THRESHOLD consecutive failures, and every
+request fails fast while it is open, which ends a cycle early during an
+outage. After the cool-down one request probes the API: success closes
+the breaker, failure reopens it for twice as long.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+log = logging.getLogger(__name__)
+
+MAX_RETRIES = 2
+BACKOFF_BASE = 0.5  # Seconds before the first retry (before jitter)
+BACKOFF_MAX = 8.0
+FAILURE_THRESHOLD = 5  # Consecutive failures that open the breaker
+OPEN_SECONDS = 30.0  # First cool-down; doubles on each failed probe
+OPEN_SECONDS_MAX = 900.0
+SECONDARY_LIMIT_WAIT = 60.0  # GitHub's advice when a secondary limit gives no Retry-After
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for retry number attempt (0-based)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+def throttle_delay(resp, now: float | None = None) -> float | None:
+    """Seconds GitHub asks us to wait, or None if resp is not a throttling response."""
+    if resp.status_code not in (403, 429):
+        return None
+    now = time.time() if now is None else now
+    retry_after = resp.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+    try:
+        body = resp.text
+    except Exception:
+        body = ""
+    if resp.status_code == 429 or "secondary rate limit" in body.lower():
+        return SECONDARY_LIMIT_WAIT
+    return None
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker shared by every request to one API host."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._cooldown = OPEN_SECONDS
+        self._probing = False
+        self.reason = ""
+
+    @property
+    def is_open(self) -> bool:
+        return self._open_until > time.time()
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        with self._lock:
+            if not self._open_until:
+                return True
+            if time.time() < self._open_until or self._probing:
+                return False
+            # Cool-down over: let one probe through
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._open_until:
+                log.info("GitHub API reachable again, closing circuit breaker")
+            self._failures = 0
+            self._open_until = 0.0
+            self._cooldown = OPEN_SECONDS
+            self._probing = False
+            self.reason = ""
+
+    def record_failure(self, reason: str) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing:
+                self._cooldown = min(self._cooldown * 2, OPEN_SECONDS_MAX)
+            elif self._failures < FAILURE_THRESHOLD:
+                return
+            self._open(self._cooldown, reason)
+
+    def trip(self, seconds: float, reason: str) -> None:
+        """Open the breaker for a server-requested wait (e.g. Retry-After)."""
+        with self._lock:
+            self._open(max(seconds, 1.0), reason)
+
+    def _open(self, seconds: float, reason: str) -> None:
+        until = time.time() + seconds
+        if until > self._open_until:
+            log.warning("Pausing GitHub API requests for %.0fs: %s", seconds, reason)
+            self._open_until = until
+        self._probing = False
+        self.reason = reason
+
+    def status_text(self) -> str:
+        """Short description for the tray, or "" while requests flow normally."""
+        wait = self._open_until - time.time()
+        if not self._open_until:
+            return ""
+        if wait <= 0:
+            return f"API: retrying ({self.reason})"
+        return f"API paused {wait:.0f}s ({self.reason})"
@@ -0,0 +1,143 @@
+"""Activity-weighted repo scheduling.
+
+Each repo gets a target poll interval derived from how recently it saw
+activity (its pushed_at from the repo index, or the last time we found a new
+run) and how often it produces runs. Repos active in the last few minutes
+are polled every cycle; dormant ones back off to max_staleness. Each cycle
+polls the repos that are most overdue relative to their target, so no repo
+starves while budget allows. Repos marked dirty (e.g. by the event feed)
+jump the queue on the next cycle.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+
+from .repo_index import RepoEntry
+
+log = logging.getLogger(__name__)
+
+ACTIVITY_BACKOFF = 10  # Target interval = time since last activity / this
+POLLS_PER_RUN = 4  # Aim to poll a busy repo this many times per run it produces
+RUN_RATE_SMOOTHING = 0.3
+DUE_SLACK = 0.9  # Treat a repo as due slightly early to absorb timer jitter
+
+
+class _RepoStats:
+    __slots__ = ("last_polled", "last_listed", "last_activity", "run_rate", "dirty")
+
+    def __init__(self) -> None:
+        self.last_polled = 0.0
+        self.last_listed = 0.0  # Last REST listing; discovery alone doesn't count
+        self.last_activity = 0.0
+        self.run_rate = 0.0  # EWMA of new runs per hour
+        self.dirty = False
+
+
+class RepoScheduler:
+    """Chooses which repos to poll each cycle by activity and staleness."""
+
+    def __init__(self) -> None:
+        self._stats: dict[str, _RepoStats] = {}
+
+    def _stats_for(self, full_name: str) -> _RepoStats:
+        stats = self._stats.get(full_name)
+        if stats is None:
+            stats = self._stats[full_name] = _RepoStats()
+        return stats
+
+    def target_interval(
+        self, repo: RepoEntry, now: float, cycle_interval: float, max_staleness: float
+    ) -> float:
+        """Seconds this repo may go between polls."""
+        stats = self._stats.get(repo.full_name)
+        activity = repo.pushed_at
+        if stats is not None:
+            activity = max(activity, stats.last_activity)
+        target = (now - activity) / ACTIVITY_BACKOFF
+        if stats is not None and stats.run_rate > 0:
+            target = min(target, 3600 / (stats.run_rate * POLLS_PER_RUN))
+        return min(max(target, cycle_interval), max(max_staleness, cycle_interval))
+
+    def select(
+        self,
+        repos: list[RepoEntry],
+        batch_size: int,
+        now: float,
+        cycle_interval: float,
+        max_staleness: float,
+    ) -> list[RepoEntry]:
+        """Return up to batch_size due repos, most overdue first.
+
+        Repos never polled or marked dirty come first. Repos that are not
+        yet due are skipped, so quiet accounts spend less of the budget.
+        """
+        scored: list[tuple[float, int, RepoEntry]] = []
+        for i, repo in enumerate(repos):
+            stats = self._stats.get(repo.full_name)
+            if stats is None or not stats.last_polled or stats.dirty:
+                scored.append((math.inf, i, repo))
+                continue
+            target = self.target_interval(repo, now, cycle_interval, max_staleness)
+            overdue = (now - stats.last_polled) / target if target > 0 else math.inf
+            if overdue >= DUE_SLACK:
+                scored.append((overdue, i, repo))
+        # Ties keep repo list order (most recently pushed first)
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [repo for _, _, repo in scored[:batch_size]]
+
+    def record_poll(self, full_name: str, new_runs: int, now: float, listed: bool = True) -> None:
+        """Update a repo's stats after it was polled.
+
+        listed is False when only GraphQL discovery looked at the repo.
+        """
+        stats = self._stats_for(full_name)
+        if stats.last_polled:
+            hours = max(now - stats.last_polled, 1.0) / 3600
+            stats.run_rate = (1 - RUN_RATE_SMOOTHING) * stats.run_rate + RUN_RATE_SMOOTHING * (
+                new_runs / hours
+            )
+        if new_runs:
+            stats.last_activity = now
+        stats.last_polled = now
+        if listed:
+            stats.last_listed = now
+        stats.dirty = False
+
+    def mark_dirty(self, full_name: str, now: float) -> bool:
+        """Poll a repo on the next cycle and treat it as recently active.
+
+        Returns False for repos that have never been polled, which are
+        first in line anyway.
+        """
+        stats = self._stats.get(full_name)
+        if stats is None:
+            return False
+        stats.dirty = True
+        stats.last_activity = max(stats.last_activity, now)
+        return True
+
+    def last_polled(self, full_name: str) -> float:
+        """When the repo was last polled (0 if never, since startup)."""
+        stats = self._stats.get(full_name)
+        return stats.last_polled if stats is not None else 0.0
+
+    def last_listed(self, full_name: str) -> float:
+        """When the repo's runs were last listed over REST (0 if never, since startup)."""
+        stats = self._stats.get(full_name)
+        return stats.last_listed if stats is not None else 0.0
+
+    def expected_runs(self, full_name: str, now: float) -> float:
+        """New runs the repo has likely produced since its last poll."""
+        stats = self._stats.get(full_name)
+        if stats is None or not stats.last_polled:
+            return 0.0
+        return stats.run_rate * (now - stats.last_polled) / 3600
+
+    def prune(self, repos: list[RepoEntry]) -> None:
+        """Drop stats for repos no longer in the list."""
+        names = {r.full_name for r in repos}
+        for name in list(self._stats):
+            if name not in names:
+                del self._stats[name]
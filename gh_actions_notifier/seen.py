@@ -0,0 +1,78 @@
+"""Per-repo window of already-handled workflow run IDs.
+
+A window is a low-water mark plus a sorted list of the IDs seen above it.
+Every ID at or below the mark counts as seen. Tracking individual IDs
+above it means a long run that finishes after a newer, shorter one (and
+so has a lower ID) is still reported. The list is capped; when it grows
+past the cap, the mark moves up over the oldest entries.
+
+On disk a window is one flat list, [low, d1, d2, ...], where each d is
+the gap from the previous ID. A plain integer from the old single
+last-seen-ID format also loads as a window.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+
+WINDOW_SIZE = 64
+
+
+class SeenWindow:
+    """Run IDs already handled for one repo."""
+
+    __slots__ = ("low", "ids")
+
+    def __init__(self, low: int = 0, ids: list[int] | None = None) -> None:
+        self.low = low
+        self.ids: list[int] = ids or []
+
+    @property
+    def is_empty(self) -> bool:
+        """True if nothing has ever been recorded (the repo is unseeded)."""
+        return not self.low and not self.ids
+
+    @property
+    def max_id(self) -> int:
+        return self.ids[-1] if self.ids else self.low
+
+    def is_seen(self, run_id: int) -> bool:
+        if run_id <= self.low:
+            return True
+        i = bisect_left(self.ids, run_id)
+        return i < len(self.ids) and self.ids[i] == run_id
+
+    def add(self, run_ids) -> None:
+        """Record run IDs as seen, then prune to WINDOW_SIZE."""
+        for run_id in run_ids:
+            if not self.is_seen(run_id):
+                insort(self.ids, run_id)
+        if len(self.ids) > WINDOW_SIZE:
+            cut = len(self.ids) - WINDOW_SIZE
+            self.low = self.ids[cut - 1]
+            del self.ids[:cut]
+
+    def copy(self) -> SeenWindow:
+        return SeenWindow(self.low, list(self.ids))
+
+    def to_json(self) -> list[int]:
+        encoded = [self.low]
+        prev = self.low
+        for run_id in self.ids:
+            encoded.append(run_id - prev)
+            prev = run_id
+        return encoded
+
+    @classmethod
+    def from_json(cls, data) -> SeenWindow:
+        if isinstance(data, int):
+            return cls(low=data)
+        if not data:
+            return cls()
+        low = int(data[0])
+        ids = []
+        prev = low
+        for delta in data[1:]:
+            prev += int(delta)
+            ids.append(prev)
+        return cls(low, ids)
@@ -1,8 +1,15 @@
-"""Thread-safe token + last-seen run IDs persistence.
+"""Thread-safe token + seen run IDs persistence.
 
 State is stored at %APPDATA%\\gh-actions-notifier\\state.json and includes
-the GitHub PAT and a mapping of repo full names to their last-seen run IDs.
-Writes are atomic (write to temp file, then rename) to prevent corruption.
+the GitHub PAT and, per repo, a compact window of already-seen run IDs
+(see seen.py). Writes are atomic (write to temp file, then rename) to
+prevent corruption.
+
+Updates only mark the state dirty; callers flush() once per poll cycle so
+a cycle costs at most one snapshot write. With journaling enabled, each
+update is instead appended to state.journal (O(1) I/O) and the snapshot is
+rewritten only when the journal is compacted. On load the journal is
+replayed over the snapshot; a torn final line from a crash is ignored.
 """
 
 import json
@@ -10,10 +17,16 @@ import logging
 import os
 import tempfile
 import threading
+import time
 from pathlib import Path
 
+from . import metrics, tracing
+from .seen import SeenWindow
+
 log = logging.getLogger(__name__)
 
+JOURNAL_COMPACT_ENTRIES = 1000
+
 
 def _state_path() -> Path:
     return (
@@ -21,14 +34,31 @@ def _state_path() -> Path:
     )
 
 
+def open_state(config: dict):
+    """Create the state store selected by the "state_backend" config key."""
+    if config.get("state_backend", "json") == "sqlite":
+        from .state_sqlite import SqliteStateManager
+
+        return SqliteStateManager()
+    return StateManager(journal=config.get("state_journal", False))
+
+
 class StateManager:
     """Manages persistent state with thread-safe access and atomic writes."""
 
-    def __init__(self) -> None:
+    def __init__(self, journal: bool = False) -> None:
         self._lock = threading.Lock()
         self._path = _state_path()
-        self._data: dict = {"token": "", "last_seen_run_ids": {}}
+        self._journal_path = self._path.with_suffix(".journal")
+        self._journal_enabled = journal
+        self._journal_file = None
+        self._journal_entries = 0
+        self._dirty = False
+        self._data: dict = {"token": "", "seen_runs": {}}
+        # Decoded windows, filled lazily from _data["seen_runs"]
+        self._windows: dict[str, SeenWindow] = {}
         self._load()
+        self._replay_journal()
 
     def _load(self) -> None:
         if not self._path.exists():
@@ -38,14 +68,75 @@ class StateManager:
                 self._data = json.load(f)
         except (json.JSONDecodeError, OSError) as e:
             log.error("Failed to load state: %s", e)
+            return
+        # Migrate single last-seen IDs to seen windows
+        legacy = self._data.pop("last_seen_run_ids", None)
+        if legacy:
+            seen = self._data.setdefault("seen_runs", {})
+            for repo, run_id in legacy.items():
+                seen.setdefault(repo, [run_id])
+
+    def _replay_journal(self) -> None:
+        if not self._journal_path.exists():
+            return
+        applied = 0
+        try:
+            with open(self._journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        log.warning("Ignoring torn state journal entry")
+                        break
+                    self._apply(entry)
+                    applied += 1
+        except OSError as e:
+            log.error("Failed to replay state journal: %s", e)
+        if applied:
+            log.info("Replayed %d state journal entries", applied)
+        # Fold the entries into a fresh snapshot so new appends never follow
+        # a torn line
+        try:
+            self._save()
+        except OSError as e:
+            log.error("Failed to compact state journal: %s", e)
+
+    def _apply(self, entry: dict) -> None:
+        op = entry.get("op")
+        if op == "seen":
+            window = self._window(entry["repo"])
+            window.add(entry["ids"])
+            self._data.setdefault("seen_runs", {})[entry["repo"]] = window.to_json()
+        elif op == "inflight":
+            self._data["inflight_runs"] = entry["runs"]
+
+    def _record(self, entry: dict) -> None:
+        """Apply an update in memory and make it durable (caller holds the lock)."""
+        self._apply(entry)
+        self._dirty = True
+        if not self._journal_enabled:
+            return
+        try:
+            if self._journal_file is None:
+                self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+                self._journal_file = open(self._journal_path, "a", encoding="utf-8")
+            self._journal_file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._journal_file.flush()
+            self._journal_entries += 1
+        except OSError as e:
+            log.error("Failed to append to state journal: %s", e)
 
     def _save(self) -> None:
+        started = time.perf_counter()
         self._path.parent.mkdir(parents=True, exist_ok=True)
         # Atomic write: write to temp file, then rename
         fd, tmp = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
         try:
-            with os.fdopen(fd, "w", encoding="utf-8") as f:
-                json.dump(self._data, f, indent=2)
+            with tracing.span("state.save"), os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
             os.replace(tmp, self._path)
         except OSError:
             # Clean up temp file on failure
@@ -54,6 +145,44 @@ class StateManager:
             except OSError:
                 pass
             raise
+        self._dirty = False
+        self._truncate_journal()
+        metrics.STATE_WRITES.inc()
+        metrics.STATE_WRITE_BYTES.inc(size)
+        metrics.STATE_WRITE_SECONDS.observe(time.perf_counter() - started)
+
+    def _truncate_journal(self) -> None:
+        """Drop journal entries now covered by the snapshot."""
+        if self._journal_file is not None:
+            self._journal_file.close()
+            self._journal_file = None
+        if self._journal_entries or self._journal_path.exists():
+            try:
+                self._journal_path.unlink(missing_ok=True)
+            except OSError as e:
+                log.error("Failed to truncate state journal: %s", e)
+        self._journal_entries = 0
+
+    def flush(self) -> None:
+        """Write pending updates to disk.
+
+        Without a journal this writes the snapshot if anything changed.
+        With one, updates are already durable, so the snapshot is only
+        rewritten once the journal needs compacting.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            if self._journal_enabled and self._journal_entries < JOURNAL_COMPACT_ENTRIES:
+                return
+            self._save()
+
+    def close(self) -> None:
+        """Write a final snapshot and close the journal."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+            self._truncate_journal()
 
     @property
     def token(self) -> str:
@@ -66,13 +195,37 @@ class StateManager:
             self._data["token"] = value
             self._save()
 
-    def get_last_seen_id(self, repo_full_name: str) -> int:
-        """Return the last-seen workflow run ID for a repo, or 0 if unseen."""
+    def _window(self, repo_full_name: str) -> SeenWindow:
+        window = self._windows.get(repo_full_name)
+        if window is None:
+            raw = self._data.get("seen_runs", {}).get(repo_full_name)
+            window = SeenWindow.from_json(raw)
+            self._windows[repo_full_name] = window
+        return window
+
+    def get_seen_window(self, repo_full_name: str) -> SeenWindow:
+        """Return a copy of the seen-run window for a repo (empty if unseen)."""
         with self._lock:
-            return self._data.get("last_seen_run_ids", {}).get(repo_full_name, 0)
+            return self._window(repo_full_name).copy()
 
-    def set_last_seen_id(self, repo_full_name: str, run_id: int) -> None:
-        """Record the highest workflow run ID seen for a repo."""
+    def mark_seen(self, repo_full_name: str, run_ids) -> None:
+        """Record workflow run IDs as handled for a repo. Call flush() to persist."""
         with self._lock:
-            self._data.setdefault("last_seen_run_ids", {})[repo_full_name] = run_id
-            self._save()
+            self._record({"op": "seen", "repo": repo_full_name, "ids": list(run_ids)})
+
+    def get_inflight_runs(self) -> list[dict]:
+        """Return the persisted in-flight run tracker entries."""
+        with self._lock:
+            return list(self._data.get("inflight_runs", []))
+
+    def set_inflight_runs(self, runs: list[dict]) -> None:
+        """Replace the in-flight run tracker entries. Call flush() to persist."""
+        with self._lock:
+            self._record({"op": "inflight", "runs": runs})
+
+    def record_run(self, repo_full_name: str, run: dict) -> None:
+        """Add a completed run to the run history. The JSON backend keeps none."""
+
+    def recent_runs(self, limit: int = 20) -> list[dict]:
+        """Return the most recently completed runs. The JSON backend keeps none."""
+        return []
@@ -0,0 +1,217 @@
+"""SQLite-backed state store with the same API as StateManager.
+
+State lives in %APPDATA%\\gh-actions-notifier\\state.db, in WAL mode, with
+one indexed row per repo for its seen-run window, one row per tracked
+in-flight run, and a bounded history of completed runs. Nothing is loaded
+up front. Windows are read on first use and each update touches only its
+own rows, so startup and update costs don't grow with the number of
+tracked repos.
+
+Updates go into an open transaction that flush() commits, which gives
+the same once-per-cycle write pattern as the JSON backend. An existing
+state.json is imported on first start and renamed to state.json.migrated.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from . import metrics, tracing
+from .seen import SeenWindow
+
+log = logging.getLogger(__name__)
+
+HISTORY_MAX_ROWS = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seen_runs (
+    repo TEXT PRIMARY KEY,
+    low INTEGER NOT NULL,
+    ids TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS inflight_runs (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    first_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_history (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    workflow TEXT,
+    branch TEXT,
+    conclusion TEXT,
+    url TEXT,
+    completed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS run_history_completed_at ON run_history (completed_at);
+CREATE INDEX IF NOT EXISTS run_history_repo ON run_history (repo, completed_at);
+"""
+
+
+def _state_dir() -> Path:
+    return Path(os.environ.get("APPDATA", Path.home())) / "gh-actions-notifier"
+
+
+class SqliteStateManager:
+    """Manages persistent state in SQLite with thread-safe access."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        state_dir = _state_dir()
+        state_dir.mkdir(parents=True, exist_ok=True)
+        self._path = state_dir / "state.db"
+        is_new = not self._path.exists()
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._windows: dict[str, SeenWindow] = {}
+        self._history_added = 0
+        if is_new:
+            self._migrate_json(state_dir / "state.json")
+
+    def _migrate_json(self, json_path: Path) -> None:
+        """Import an existing state.json (and its journal) into the database."""
+        if not json_path.exists():
+            return
+        from .state import StateManager
+
+        legacy = StateManager()
+        data = legacy._data
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('token', ?)",
+                (data.get("token", ""),),
+            )
+            for repo, raw in data.get("seen_runs", {}).items():
+                self._write_window(repo, SeenWindow.from_json(raw))
+            for entry in data.get("inflight_runs", []):
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO inflight_runs (id, repo, first_seen) VALUES (?, ?, ?)",
+                    (entry["id"], entry["repo"], entry.get("first_seen", time.time())),
+                )
+        legacy.close()
+        os.replace(json_path, json_path.with_name("state.json.migrated"))
+        log.info("Migrated %d repo(s) from state.json to SQLite", len(data.get("seen_runs", {})))
+
+    def flush(self) -> None:
+        """Commit pending updates and trim the run history."""
+        with self._lock:
+            if self._history_added:
+                self._conn.execute(
+                    "DELETE FROM run_history WHERE id IN ("
+                    "SELECT id FROM run_history ORDER BY completed_at DESC LIMIT -1 OFFSET ?)",
+                    (HISTORY_MAX_ROWS,),
+                )
+                self._history_added = 0
+            if not self._conn.in_transaction:
+                return
+            started = time.perf_counter()
+            with tracing.span("state.commit"):
+                self._conn.commit()
+            metrics.STATE_WRITES.inc()
+            metrics.STATE_WRITE_SECONDS.observe(time.perf_counter() - started)
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def token(self) -> str:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'token'").fetchone()
+            return row[0] if row else ""
+
+    @token.setter
+    def token(self, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('token', ?)", (value,)
+            )
+            self._conn.commit()
+
+    def _window(self, repo_full_name: str) -> SeenWindow:
+        window = self._windows.get(repo_full_name)
+        if window is None:
+            row = self._conn.execute(
+                "SELECT low, ids FROM seen_runs WHERE repo = ?", (repo_full_name,)
+            ).fetchone()
+            window = SeenWindow.from_json([row[0], *json.loads(row[1])]) if row else SeenWindow()
+            self._windows[repo_full_name] = window
+        return window
+
+    def _write_window(self, repo_full_name: str, window: SeenWindow) -> None:
+        encoded = window.to_json()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO seen_runs (repo, low, ids) VALUES (?, ?, ?)",
+            (repo_full_name, encoded[0], json.dumps(encoded[1:], separators=(",", ":"))),
+        )
+
+    def get_seen_window(self, repo_full_name: str) -> SeenWindow:
+        """Return a copy of the seen-run window for a repo (empty if unseen)."""
+        with self._lock:
+            return self._window(repo_full_name).copy()
+
+    def mark_seen(self, repo_full_name: str, run_ids) -> None:
+        """Record workflow run IDs as handled for a repo. Call flush() to persist."""
+        with self._lock:
+            window = self._window(repo_full_name)
+            window.add(run_ids)
+            self._write_window(repo_full_name, window)
+
+    def get_inflight_runs(self) -> list[dict]:
+        """Return the persisted in-flight run tracker entries."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, repo, first_seen FROM inflight_runs").fetchall()
+        return [{"repo": repo, "id": run_id, "first_seen": first} for run_id, repo, first in rows]
+
+    def set_inflight_runs(self, runs: list[dict]) -> None:
+        """Replace the in-flight run tracker entries. Call flush() to persist."""
+        with self._lock:
+            self._conn.execute("DELETE FROM inflight_runs")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO inflight_runs (id, repo, first_seen) VALUES (?, ?, ?)",
+                [(e["id"], e["repo"], e["first_seen"]) for e in runs],
+            )
+
+    def record_run(self, repo_full_name: str, run: dict) -> None:
+        """Add a completed run to the bounded history. Call flush() to persist."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO run_history "
+                "(id, repo, workflow, branch, conclusion, url, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run["id"],
+                    repo_full_name,
+                    run.get("name"),
+                    run.get("head_branch"),
+                    run.get("conclusion"),
+                    run.get("html_url"),
+                    time.time(),
+                ),
+            )
+            self._history_added += 1
+
+    def recent_runs(self, limit: int = 20) -> list[dict]:
+        """Return the most recently completed runs, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, repo, workflow, branch, conclusion, url, completed_at "
+                "FROM run_history ORDER BY completed_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        keys = ("id", "repo", "workflow", "branch", "conclusion", "url", "completed_at")
+        return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,122 @@
+"""Pool of API tokens with per-token rate-limit accounting.
+
+The primary token is the one stored in state (set by authenticating) and
+can reach every repo. Extra tokens from the "token_pool" config key, such
+as PATs or GitHub App installation tokens for particular orgs, add their
+own rate limit. Each can be limited to a set of owners. Every request
+goes out with the token that can access the repo's owner and has the
+most budget left. The client retries a 403 or 404 from an extra token
+with the primary one, and keeps a listing's token across its pages.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+RATE_FLOOR = 10  # Stop using a token below this many remaining requests
+DEFAULT_LIMIT = 5000  # Assumed budget of a token not yet seen in a response
+
+
+class TokenSlot:
+    """One token and its last known rate-limit state."""
+
+    __slots__ = ("name", "token", "owners", "remaining", "reset", "limit", "disabled")
+
+    def __init__(self, name: str, token: str | None = None, owners=None) -> None:
+        self.name = name
+        self.token = token  # None for the primary slot: read from state
+        self.owners: frozenset[str] | None = (
+            frozenset(o.lower() for o in owners) if owners else None
+        )
+        self.remaining: int | None = None
+        self.reset: float = 0
+        self.limit: int | None = None
+        self.disabled = False  # Set after a 401
+
+    def can_access(self, owner: str | None) -> bool:
+        return self.owners is None or (owner is not None and owner.lower() in self.owners)
+
+    def headroom(self, now: float) -> float:
+        """Requests this token can still make before its reset."""
+        if self.remaining is None or self.reset <= now:
+            return self.limit or DEFAULT_LIMIT
+        return self.remaining
+
+
+class TokenPool:
+    """The primary token plus any extra configured tokens."""
+
+    def __init__(self, state, entries: list[dict] | None = None) -> None:
+        self._state = state
+        self._lock = threading.Lock()
+        self.primary = TokenSlot("primary")
+        self.extra = [slot for slot in map(self._slot_from_config, entries or []) if slot]
+
+    @staticmethod
+    def _slot_from_config(entry: dict) -> TokenSlot | None:
+        """Build a slot from {"name", "token" or "token_env", "owners"}."""
+        name = entry.get("name") or "token"
+        token = entry.get("token") or os.environ.get(entry.get("token_env") or "", "")
+        if not token:
+            log.warning("Token pool entry %r has no token, skipping", name)
+            return None
+        return TokenSlot(name, token, entry.get("owners"))
+
+    @property
+    def slots(self) -> list[TokenSlot]:
+        return [self.primary, *self.extra]
+
+    def token_of(self, slot: TokenSlot) -> str:
+        return self._state.token if slot.token is None else slot.token
+
+    def pick(self, owner: str | None, now: float | None = None) -> TokenSlot | None:
+        """Return the usable token for owner with the most headroom, or None.
+
+        Requests without an owner (user endpoints) use the primary token.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if owner is None:
+                candidates = [self.primary]
+            else:
+                candidates = [s for s in self.slots if not s.disabled and s.can_access(owner)]
+            best = max(candidates, key=lambda s: s.headroom(now), default=None)
+        if best is None or best.headroom(now) < RATE_FLOOR:
+            return None
+        return best
+
+    def update(self, slot: TokenSlot, remaining=None, reset=None, limit=None) -> None:
+        with self._lock:
+            if remaining is not None:
+                slot.remaining = int(remaining)
+            if reset is not None:
+                slot.reset = float(reset)
+            if limit is not None:
+                slot.limit = int(limit)
+
+    def disable(self, slot: TokenSlot) -> None:
+        """Stop routing requests to an extra token (e.g. after a 401)."""
+        if slot is not self.primary:
+            log.error("Token %r was rejected; removing it from the pool", slot.name)
+            slot.disabled = True
+
+    def totals(self, now: float | None = None) -> tuple[int | None, float, int | None]:
+        """Return (remaining, reset, limit) summed over the usable tokens.
+
+        remaining is None until some token has been seen in a response.
+        reset is the latest reset, so budgets spread over it stay safe.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            slots = [s for s in self.slots if not s.disabled]
+            if all(s.remaining is None for s in slots):
+                return None, max((s.reset for s in slots), default=0), None
+            remaining = sum(int(s.headroom(now)) for s in slots)
+            reset = max(s.reset for s in slots)
+            limit = sum(s.limit or DEFAULT_LIMIT for s in slots)
+        return remaining, reset, limit
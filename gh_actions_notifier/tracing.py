@@ -0,0 +1,236 @@
+"""Optional span tracing and cProfile sampling of poll cycles.
+
+While tracing is on, span() records how long each instrumented block took,
+on which thread, as Chrome trace events. stop() writes them to a JSON file
+that chrome://tracing or https://ui.perfetto.dev opens as a timeline.
+Requests of the async engine overlap on one thread, so they are recorded
+as async spans (one track per request), split into connect, TLS, send
+and wait phases from httpx's trace hooks.
+
+While tracing is off, span() returns a shared no-op context, so the
+instrumented hot paths cost one attribute check.
+
+CycleProfiler runs cProfile over the next N poll cycles on the polling
+thread and dumps the stats for pstats or snakeviz. Worker threads of the
+sync engine are not profiled; their requests still show up as spans.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+MAX_EVENTS = 200_000  # Oldest events are dropped beyond this
+# httpx/httpcore trace hooks, by event prefix, as phases of a request
+_HTTPX_PHASES = {
+    "connection.connect_tcp": "connect",
+    "connection.start_tls": "tls",
+    "http11.send_request_headers": "send",
+    "http2.send_request_headers": "send",
+    "http11.receive_response_headers": "wait",
+    "http2.receive_response_headers": "wait",
+    "http11.receive_response_body": "body",
+    "http2.receive_response_body": "body",
+}
+
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000
+
+
+class _NullSpan:
+    """Stand-in span while tracing is off."""
+
+    __slots__ = ()
+    httpx_trace = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def __setitem__(self, key, value) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_args", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, args: dict) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._args = args
+
+    def __enter__(self):
+        self._start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self._args["error"] = exc_type.__name__
+        self._tracer._complete(self._name, self._start, _now_us() - self._start, self._args)
+
+    def __setitem__(self, key, value) -> None:
+        self._args[key] = value
+
+
+class _AsyncSpan(_Span):
+    """Span for a coroutine, which shares its thread with others in flight."""
+
+    __slots__ = ("_id",)
+
+    def __enter__(self):
+        self._id = next(self._tracer._ids)
+        self._start = _now_us()
+        self._tracer._async(self._name, "b", self._id, self._start, self._args)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self._args["error"] = exc_type.__name__
+        self._tracer._async(self._name, "e", self._id, _now_us(), self._args)
+
+    async def httpx_trace(self, event: str, info: dict) -> None:
+        """httpx "trace" extension hook: record request phases inside this span."""
+        prefix, _, stage = event.rpartition(".")
+        phase = _HTTPX_PHASES.get(prefix)
+        if phase is None or stage not in ("started", "complete", "failed"):
+            return
+        self._tracer._async(phase, "b" if stage == "started" else "e", self._id, _now_us(), {})
+
+
+class Tracer:
+    """Collects spans as Chrome trace events while enabled."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._events: deque[dict] = deque(maxlen=MAX_EVENTS)
+        self._threads: dict[int, str] = {}
+        self._ids = itertools.count(1)
+        self._pid = os.getpid()
+        self.path: Path | None = None
+
+    def start(self, path: Path) -> None:
+        with self._lock:
+            self._events.clear()
+            self._threads.clear()
+            self.path = Path(path)
+            self.enabled = True
+        log.info("Tracing started, writing to %s on stop", path)
+
+    def stop(self) -> Path | None:
+        """Stop tracing and write the trace file; returns its path."""
+        with self._lock:
+            if not self.enabled:
+                return None
+            self.enabled = False
+            events = list(self._events)
+            threads = dict(self._threads)
+            self._events.clear()
+        meta = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": n}}
+            for tid, n in threads.items()
+        ]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f)
+        except OSError as e:
+            log.error("Failed to write trace: %s", e)
+            return None
+        log.info("Wrote %d trace event(s) to %s", len(events), self.path)
+        return self.path
+
+    def span(self, name: str, **args):
+        """Context manager timing a block; item assignment adds args."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def async_span(self, name: str, **args):
+        """Like span(), for blocks that interleave with others on one thread."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _AsyncSpan(self, name, args)
+
+    def _record(self, event: dict) -> None:
+        thread = threading.current_thread()
+        event["pid"] = self._pid
+        event["tid"] = thread.ident
+        with self._lock:
+            if thread.ident not in self._threads:
+                self._threads[thread.ident] = thread.name
+            self._events.append(event)
+
+    def _complete(self, name: str, start: float, duration: float, args: dict) -> None:
+        self._record({"name": name, "ph": "X", "ts": start, "dur": duration, "args": args})
+
+    def _async(self, name: str, phase: str, span_id: int, ts: float, args: dict) -> None:
+        self._record(
+            {"name": name, "cat": "request", "ph": phase, "id": span_id, "ts": ts, "args": args}
+        )
+
+
+TRACER = Tracer()
+span = TRACER.span
+async_span = TRACER.async_span
+
+
+class CycleProfiler:
+    """Runs cProfile over the next N poll cycles of the calling thread."""
+
+    def __init__(self) -> None:
+        self._profile: cProfile.Profile | None = None
+        self._remaining = 0
+        self._path: Path | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._remaining > 0
+
+    def arm(self, cycles: int, path: Path) -> None:
+        self._remaining = cycles
+        self._path = Path(path)
+        log.info("Profiling the next %d poll cycle(s)", cycles)
+
+    def begin_cycle(self) -> None:
+        if not self._remaining:
+            return
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def end_cycle(self) -> None:
+        if self._profile is None:
+            return
+        self._profile.disable()
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self.finish()
+
+    def finish(self) -> None:
+        """Write whatever has been profiled so far."""
+        profile, self._profile, self._remaining = self._profile, None, 0
+        if profile is None:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(self._path)
+        except OSError as e:
+            log.error("Failed to write profile: %s", e)
+            return
+        log.info("Wrote profile to %s (python -m pstats %s)", self._path, self._path)
@@ -7,7 +7,7 @@ import os
 
 import pystray
 
-from . import icons
+from . import icons, tracing
 from .config import config_path
 from .startup import is_startup_enabled, enable_startup, disable_startup
 
@@ -24,6 +24,18 @@ class TrayIcon:
     def _build_menu(self) -> pystray.Menu:
         return pystray.Menu(
             pystray.MenuItem(self._app.status_text, lambda: None, enabled=False),
+            pystray.MenuItem(
+                self._app.api_status,
+                lambda: None,
+                enabled=False,
+                visible=bool(self._app.api_status),
+            ),
+            pystray.MenuItem(
+                self._app.metrics_status,
+                lambda: None,
+                enabled=False,
+                visible=bool(self._app.metrics_status),
+            ),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("Authenticate", self._on_authenticate),
             pystray.MenuItem("Poll Now", self._on_poll_now),
@@ -31,6 +43,11 @@ class TrayIcon:
             pystray.MenuItem("Open Config", self._on_open_config),
             pystray.MenuItem("Reload Config", self._on_reload_config),
             pystray.MenuItem("Open Log", self._on_open_log),
+            pystray.MenuItem(
+                "Record Trace",
+                self._on_toggle_trace,
+                checked=lambda _: tracing.TRACER.enabled,
+            ),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem(
                 "Start with Windows",
@@ -91,6 +108,9 @@ class TrayIcon:
         if log_path and log_path.exists():
             os.startfile(str(log_path))
 
+    def _on_toggle_trace(self, icon, item) -> None:
+        self._app.toggle_tracing()
+
     def _on_toggle_startup(self, icon, item) -> None:
         if is_startup_enabled():
             disable_startup()
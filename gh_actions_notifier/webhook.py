@@ -0,0 +1,147 @@
+"""Local receiver for GitHub workflow_run webhooks.
+
+A small HTTP listener that accepts webhook deliveries (typically relayed
+to this machine, e.g. with `gh webhook forward` or a tunnel), checks each
+body against X-Hub-Signature-256 with the configured secret, and hands
+completed runs to Poller.handle_run. Polling then only reconciles, on a
+slow interval, in case deliveries are missed.
+
+Deliveries without a valid signature are rejected, so the receiver never
+starts without a secret.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .models import decode_run_event
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+MAX_BODY_BYTES = 25 * 1024 * 1024  # GitHub caps payloads at 25 MB
+MAX_DELIVERY_IDS = 1024  # Recent X-GitHub-Delivery IDs kept to drop redeliveries
+
+
+def sign(secret: str, body: bytes) -> str:
+    """Return the X-Hub-Signature-256 header value for a body."""
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+class WebhookServer:
+    """Threaded HTTP server feeding workflow_run deliveries to a poller."""
+
+    def __init__(
+        self, poller, secret: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+    ) -> None:
+        if not secret:
+            raise ValueError("A webhook secret is required")
+        self._poller = poller
+        self._secret = secret
+        self._host = host
+        self._port = port
+        self._server: ThreadingHTTPServer | None = None
+        self._deliveries: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.server_address[:2]
+
+    def start(self) -> None:
+        handler = type("Handler", (_Handler,), {"receiver": self})
+        self._server = ThreadingHTTPServer((self._host, self._port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(
+            target=self._server.serve_forever, name="webhook", daemon=True
+        ).start()
+        log.info("Webhook receiver listening on %s:%d", *self.address)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def verify(self, body: bytes, signature: str | None) -> bool:
+        if not signature:
+            return False
+        # As bytes: compare_digest rejects non-ASCII str, and the header is untrusted
+        expected = sign(self._secret, body).encode()
+        return hmac.compare_digest(expected, signature.encode("latin-1", "replace"))
+
+    def _first_delivery(self, delivery_id: str | None) -> bool:
+        """Return False if this delivery ID was already handled."""
+        if not delivery_id:
+            return True
+        with self._lock:
+            if delivery_id in self._deliveries:
+                return False
+            self._deliveries[delivery_id] = None
+            while len(self._deliveries) > MAX_DELIVERY_IDS:
+                self._deliveries.popitem(last=False)
+        return True
+
+    def handle(self, event: str | None, delivery_id: str | None, body: bytes) -> int:
+        """Process a verified delivery and return the HTTP status to send."""
+        if event == "ping":
+            return 200
+        if event != "workflow_run":
+            return 202  # Not interesting, but not an error either
+        try:
+            payload = decode_run_event(body)
+        except (ValueError, TypeError) as e:
+            log.warning("Bad workflow_run payload: %s", e)
+            return 400
+        run = payload.get("workflow_run")
+        full_name = payload.get("repository", {}).get("full_name")
+        if payload.get("action") != "completed" or not run or not full_name:
+            return 202
+        if not self._first_delivery(delivery_id):
+            return 200
+        if self._poller.handle_run(full_name, dict(run)):
+            log.info("Webhook: run %s in %s completed", run.get("id"), full_name)
+        return 200
+
+
+class _Handler(BaseHTTPRequestHandler):
+    receiver: WebhookServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        log.debug("Webhook %s - %s", self.address_string(), format % args)
+
+    def _reply(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            self.close_connection = True
+            self._reply(413 if length > 0 else 400)
+            return
+        body = self.rfile.read(length)
+        if not self.receiver.verify(body, self.headers.get("X-Hub-Signature-256")):
+            log.warning("Rejected webhook with a missing or bad signature")
+            self._reply(401)
+            return
+        try:
+            status = self.receiver.handle(
+                self.headers.get("X-GitHub-Event"), self.headers.get("X-GitHub-Delivery"), body
+            )
+        except Exception as e:
+            log.error("Webhook handling failed: %s", e)
+            status = 500
+        self._reply(status)
@@ -0,0 +1,181 @@
+"""Shared fixtures: an isolated app data dir and in-memory API fakes."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from gh_actions_notifier.github_api import GitHubClient, RunCollector
+from gh_actions_notifier.poller import Poller
+from gh_actions_notifier.resilience import CircuitBreaker
+from gh_actions_notifier.state import StateManager
+from gh_actions_notifier.tokens import TokenPool
+
+REPO = "octo/app"
+API = "http://api.test"
+
+
+@pytest.fixture(autouse=True)
+def appdata(tmp_path, monkeypatch):
+    """Keep state, config and the repo index of every test in a temp dir."""
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.time, shared by the breaker, token pool and client."""
+
+    class Clock:
+        now = 1_000_000.0
+
+        def advance(self, seconds: float) -> None:
+            self.now += seconds
+
+    c = Clock()
+    monkeypatch.setattr("time.time", lambda: c.now)
+    return c
+
+
+def api_response(status: int = 200, body=None, headers: dict | None = None) -> requests.Response:
+    """A requests.Response as the session would return it."""
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers = CaseInsensitiveDict(headers or {})
+    resp._content = json.dumps({} if body is None else body).encode()
+    resp.encoding = "utf-8"
+    return resp
+
+
+@pytest.fixture
+def make_client(appdata):
+    """Build a GitHubClient whose session answers every GET with handler(url, token).
+
+    The client's sent requests are recorded in client.sent as (url, token) pairs.
+    """
+
+    def make(handler, token_pool=None):
+        state = StateManager()
+        state.token = "primary-token"
+        client = GitHubClient(state, base_url=API, tokens=TokenPool(state, token_pool))
+        client.sent = []
+
+        def get(url, headers=None, params=None, timeout=None):
+            token = (headers or {}).get("Authorization") or client._session.headers.get(
+                "Authorization"
+            )
+            token = token.removeprefix("Bearer ")
+            client.sent.append((url, token))
+            return handler(url, token)
+
+        client._session.get = get
+        return client
+
+    return make
+
+
+class FakeGitHub:
+    """Serves repos and run listings from memory, paginated like the REST API."""
+
+    def __init__(self, repos: list[str]) -> None:
+        self.repos = repos
+        self.runs: dict[str, dict[int, dict]] = {name: {} for name in repos}
+        self.listings: list[dict] = []  # Arguments of every runs listing
+        self.breaker = CircuitBreaker()
+        self.rate_remaining = None
+        self.rate_reset = 0.0
+        self.rate_limit = None
+        self.graphql_cost = 0
+
+    def add_run(self, repo: str, run_id: int, status: str = "completed", conclusion="success"):
+        self.runs[repo][run_id] = {
+            "id": run_id,
+            "name": f"CI {run_id}",
+            "status": status,
+            "conclusion": conclusion if status == "completed" else None,
+            "head_branch": "main",
+            "head_sha": f"sha{run_id}",
+            "html_url": f"https://github.com/{repo}/actions/runs/{run_id}",
+        }
+
+    def complete(self, repo: str, run_id: int, conclusion: str = "success") -> None:
+        self.runs[repo][run_id].update(status="completed", conclusion=conclusion)
+
+    def refresh_rate_limit(self) -> bool:
+        return False
+
+    def reset_cache_stats(self) -> tuple[int, int]:
+        return 0, 0
+
+    def get_user(self) -> str:
+        return "octocat"
+
+    def get_repo_pages(self, etags, page_sizes, pushed_after=None):
+        repos = [
+            {"id": i, "full_name": name, "pushed_at": None, "archived": False, "disabled": False}
+            for i, name in enumerate(self.repos, 1)
+        ]
+        return [("etag", repos)]
+
+    def get_completed_runs(self, owner, repo, since_id=0, per_page=25, **hints):
+        return self._list_runs(f"{owner}/{repo}", "completed", since_id, per_page, **hints)
+
+    def get_recent_runs(self, owner, repo, since_id=0, per_page=25, **hints):
+        return self._list_runs(f"{owner}/{repo}", None, since_id, per_page, **hints)
+
+    def _list_runs(self, full_name, status, since_id, per_page, created_after=None, until_id=None):
+        self.listings.append({"repo": full_name, "since_id": since_id, "until_id": until_id})
+        runs = sorted(self.runs[full_name].values(), key=lambda r: -r["id"])
+        if status:
+            runs = [r for r in runs if r["status"] == status]
+        collector = RunCollector(since_id, until_id)
+        for start in range(0, len(runs), per_page):
+            if not collector.add_page([dict(r) for r in runs[start : start + per_page]]):
+                break
+        return collector.runs
+
+    def get_run(self, owner, repo, run_id):
+        run = self.runs[f"{owner}/{repo}"].get(run_id)
+        return dict(run) if run else None
+
+
+class RecordingNotifier:
+    """Collects notify_run calls."""
+
+    def __init__(self) -> None:
+        self.runs: list[dict] = []
+
+    def notify_run(self, **run) -> None:
+        self.runs.append(run)
+
+    @property
+    def run_ids(self) -> list[int]:
+        return [int(r["url"].rsplit("/", 1)[1]) for r in self.runs]
+
+
+@pytest.fixture
+def fake_github():
+    return FakeGitHub([REPO])
+
+
+@pytest.fixture
+def notifier():
+    return RecordingNotifier()
+
+
+@pytest.fixture
+def make_poller(appdata, fake_github, notifier):
+    """Build a Poller over saved state holding the given seen window for REPO."""
+
+    def make(window=None, **config):
+        state_dir = appdata / "gh-actions-notifier"
+        state_dir.mkdir(parents=True, exist_ok=True)
+        seen = {REPO: window.to_json()} if window is not None else {}
+        (state_dir / "state.json").write_text(json.dumps({"token": "t", "seen_runs": seen}))
+        config = {"rate_budget": False, **config}
+        return Poller(None, config, StateManager(), fake_github, notifier)
+
+    return make
@@ -0,0 +1,31 @@
+"""In-flight run tracker bounds."""
+
+from __future__ import annotations
+
+from gh_actions_notifier.inflight import MAX_TRACKED_RUNS, RUN_TIMEOUT, InflightTracker
+from gh_actions_notifier.state import StateManager
+
+
+def test_full_tracker_keeps_long_builds_and_turns_new_runs_away():
+    tracker = InflightTracker(StateManager())
+    for run_id in range(1, MAX_TRACKED_RUNS + 1):
+        tracker.track("octo/app", run_id, now=1000.0 + run_id)
+
+    tracker.track("octo/other", 500, now=5000.0)
+
+    assert 1 in tracker  # The oldest, longest build is still tracked
+    assert 500 not in tracker
+    assert tracker.oldest_dropped("octo/other", above=0) == 500
+    assert tracker.oldest_dropped("octo/app", above=0) is None
+
+
+def test_completed_dropped_run_is_forgotten():
+    tracker = InflightTracker(StateManager())
+    tracker.track("octo/app", 7, now=0.0)
+    tracker.due(None, now=RUN_TIMEOUT + 1)
+    assert 7 not in tracker
+    assert tracker.oldest_dropped("octo/app", above=0) == 7
+
+    tracker.untrack(7)  # A listing reported it completed
+
+    assert tracker.oldest_dropped("octo/app", above=0) is None
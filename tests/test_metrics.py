@@ -0,0 +1,28 @@
+"""Endpoint labels of request metrics."""
+
+from __future__ import annotations
+
+import pytest
+
+from gh_actions_notifier.metrics import endpoint_label
+
+
+@pytest.mark.parametrize(
+    ("path", "label"),
+    [
+        ("/user", "/user"),
+        ("/user/repos", "/user/repos"),
+        ("/repos/octo/app/actions/runs", "/repos/{repo}/actions/runs"),
+        ("/repos/octo/app/actions/runs/123", "/repos/{repo}/actions/runs/{id}"),
+        ("/repositories/4242/actions/runs", "/repositories/{id}/actions/runs"),
+        ("/users/octocat/events", "/users/{name}/events"),
+        ("/orgs/octo/events", "/orgs/{name}/events"),
+    ],
+)
+def test_endpoint_label_collapses_names_and_ids(path, label):
+    assert endpoint_label(path) == label
+
+
+def test_listing_pages_of_every_repo_share_a_label():
+    paths = [f"/repositories/{repo_id}/actions/runs" for repo_id in range(1, 100)]
+    assert {endpoint_label(path) for path in paths} == {"/repositories/{id}/actions/runs"}
@@ -0,0 +1,81 @@
+"""Toast coalescing and rate limiting, shown through RecordingBackend."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from gh_actions_notifier import notifier as notifier_module
+from gh_actions_notifier.notifier import Notifier, RecordingBackend
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    monkeypatch.setattr(notifier_module, "COALESCE_SECONDS", 0.1)
+    monkeypatch.setattr(notifier_module, "TOASTS_PER_MINUTE", 3)
+    return RecordingBackend()
+
+
+def _notify(n: Notifier, repo: str, workflow: str, conclusion="success", sha="abc") -> None:
+    url = f"https://github.com/{repo}/actions/runs/{workflow}"
+    n.notify_run(repo, workflow, "main", conclusion, url, head_sha=sha)
+
+
+def _wait_for(backend: RecordingBackend, count: int, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while len(backend.toasts) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_runs_of_one_commit_share_a_toast(backend):
+    n = Notifier(backend)
+    _notify(n, "octo/app", "Build")
+    _notify(n, "octo/app", "Lint", conclusion="failure")
+    _notify(n, "octo/app", "Test")
+    _notify(n, "octo/app", "Build", sha="def")
+
+    _wait_for(backend, 2)
+    n.close()
+
+    assert len(backend.toasts) == 2
+    grouped, single = backend.toasts
+    assert grouped.title == "[FAIL] octo/app"
+    assert grouped.body == "3 workflows on main: 1 FAILED (Lint), 2 passed"
+    assert grouped.url.endswith("/Lint")  # Links to the failure
+    assert grouped.failed
+    assert (single.title, single.body) == ("[PASS] octo/app", "Build on main passed")
+
+
+def test_burst_beyond_the_limit_folds_into_a_summary_failures_first(backend):
+    n = Notifier(backend)
+    for i in range(4):
+        _notify(n, f"octo/repo{i}", "CI", sha=f"s{i}")
+    _notify(n, "octo/broken", "CI", conclusion="failure", sha="bad")
+
+    _wait_for(backend, 3)
+    n.close()
+
+    titles = [t.title for t in backend.toasts]
+    assert titles == ["[FAIL] octo/broken", "[PASS] octo/repo0", "GitHub Actions"]
+    assert backend.toasts[-1].body == "...and 3 more workflow run(s) completed in 3 repo(s)."
+
+
+def test_notices_wait_while_the_limit_is_used_up(backend):
+    n = Notifier(backend)
+    for i in range(3):
+        _notify(n, f"octo/repo{i}", "CI", sha=f"s{i}")
+    _wait_for(backend, 3)
+    assert len(backend.toasts) == 3
+
+    _notify(n, "octo/late", "CI", conclusion="failure")
+    _notify(n, "octo/later", "CI")
+    time.sleep(0.3)
+    assert len(backend.toasts) == 3  # Held back, not dropped
+
+    n.close()  # Shows what is left even over the limit
+
+    assert len(backend.toasts) == 4
+    summary = backend.toasts[-1]
+    assert summary.body == "...and 2 more workflow run(s) completed in 2 repo(s), 1 failed."
+    assert summary.failed
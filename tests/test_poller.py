@@ -0,0 +1,132 @@
+"""Poll cycles against an in-memory API."""
+
+from __future__ import annotations
+
+import time
+
+from gh_actions_notifier.inflight import RUN_TIMEOUT
+from gh_actions_notifier.seen import SeenWindow
+
+REPO = "octo/app"  # The fake_github fixture's only repo
+
+
+def _late_run_window(github) -> SeenWindow:
+    """Runs 100..130 completed except 105, which is still running; all but 105 seen."""
+    for run_id in range(100, 131):
+        github.add_run(REPO, run_id, status="in_progress" if run_id == 105 else "completed")
+    return SeenWindow(100, [i for i in range(101, 131) if i != 105])
+
+
+def _finish_late_run(github) -> None:
+    github.complete(REPO, 105)
+    github.add_run(REPO, 131)
+    github.add_run(REPO, 132)
+
+
+def _poll_again(poller) -> None:
+    """Poll REPO now, as if an event had flagged it."""
+    poller._scheduler.mark_dirty(REPO, time.time())
+    poller.poll_once()
+
+
+def test_late_run_below_newest_seen_is_found_without_inflight_tracking(
+    make_poller, fake_github, notifier
+):
+    window = _late_run_window(fake_github)
+    poller = make_poller(window, track_inflight=False)
+    poller.poll_once()  # Nothing new; the repo now has a poll history and small pages
+    assert notifier.run_ids == []
+
+    _finish_late_run(fake_github)
+    _poll_again(poller)
+
+    assert sorted(notifier.run_ids) == [105, 131, 132]
+    assert fake_github.listings[-1]["until_id"] == 100
+
+
+def test_late_run_dropped_by_tracker_is_found(make_poller, fake_github, notifier):
+    window = _late_run_window(fake_github)
+    poller = make_poller(window, track_inflight=True)
+    poller.poll_once()
+    assert 105 in poller._inflight
+    # The tracker gives up on the run before it finishes
+    poller._inflight.due(None, now=time.time() + RUN_TIMEOUT + 1)
+    assert 105 not in poller._inflight
+
+    _finish_late_run(fake_github)
+    _poll_again(poller)
+
+    assert sorted(notifier.run_ids) == [105, 131, 132]
+
+
+def test_tracked_late_run_stops_listing_at_newest_seen(make_poller, fake_github, notifier):
+    window = _late_run_window(fake_github)
+    poller = make_poller(window, track_inflight=True)
+    poller.poll_once()
+
+    _finish_late_run(fake_github)
+    _poll_again(poller)
+    poller.poll_inflight()
+
+    assert fake_github.listings[-1]["until_id"] == 130
+    assert sorted(notifier.run_ids) == [105, 131, 132]
+
+
+def test_reset_identity_reads_the_new_users_event_feed(make_poller, fake_github, notifier):
+    poller = make_poller(event_feed=True)
+    fake_github.get_events = lambda url: fake_github.event_urls.append(url) or ([], 60)
+    fake_github.event_urls = []
+    poller.poll_once()
+    assert fake_github.event_urls == ["/users/octocat/events"]
+
+    fake_github.get_user = lambda: "hubot"
+    poller.reset_identity()
+    poller.poll_once()
+
+    assert fake_github.event_urls[-1] == "/users/hubot/events"
+
+
+def test_discovery_settled_repo_is_still_listed_once_stale(make_poller, fake_github, notifier):
+    fake_github.add_run(REPO, 101)
+    fake_github.get_latest_runs = lambda names, batch_size: {name: [] for name in names}
+    poller = make_poller(
+        SeenWindow(100, [101]), graphql_discovery=True, max_repo_staleness=3600
+    )
+    poller.poll_once()  # Never listed since startup: listed despite discovery
+    assert len(fake_github.listings) == 1
+
+    # A tag build the discovery query can't see
+    fake_github.add_run(REPO, 102, conclusion="failure")
+    _poll_again(poller)
+    assert len(fake_github.listings) == 1
+    assert notifier.run_ids == []
+
+    poller._scheduler._stats[REPO].last_listed -= 3600
+    _poll_again(poller)
+
+    assert len(fake_github.listings) == 2
+    assert notifier.run_ids == [102]
+
+
+def test_burst_after_seeding_is_paged_back_to_the_seeded_runs(make_poller, fake_github, notifier):
+    for run_id in range(1, 26):
+        fake_github.add_run(REPO, run_id)
+    poller = make_poller(track_inflight=False)
+    poller.poll_once()  # Seeds 1..25 (low-water mark 0) without notifying
+    assert notifier.run_ids == []
+
+    # More than the smallest page, which the fresh repo's zero run rate asks for
+    for run_id in range(26, 56):
+        fake_github.add_run(REPO, run_id)
+    _poll_again(poller)
+
+    assert sorted(notifier.run_ids) == list(range(26, 56))
+
+
+def test_first_listing_after_restart_pages_back_to_the_window(make_poller, fake_github, notifier):
+    for run_id in range(1, 56):
+        fake_github.add_run(REPO, run_id)
+    poller = make_poller(SeenWindow(0, list(range(1, 26))), track_inflight=False)
+    poller.poll_once()
+
+    assert sorted(notifier.run_ids) == list(range(26, 56))
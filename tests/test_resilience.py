@@ -0,0 +1,133 @@
+"""Backoff, throttling, the circuit breaker, and how the client retries."""
+
+from __future__ import annotations
+
+import pytest
+import requests
+from conftest import api_response
+
+from gh_actions_notifier import github_api, resilience
+from gh_actions_notifier.resilience import (
+    BACKOFF_MAX,
+    FAILURE_THRESHOLD,
+    MAX_RETRIES,
+    OPEN_SECONDS,
+    SECONDARY_LIMIT_WAIT,
+    CircuitBreaker,
+    backoff_delay,
+    throttle_delay,
+)
+
+RUN_URL = "/repos/octo/app/actions/runs/1"
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(github_api, "backoff_delay", lambda attempt: 0)
+
+
+def test_backoff_delay_is_jittered_and_capped(monkeypatch):
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: high)
+    assert [backoff_delay(n) for n in range(3)] == [0.5, 1.0, 2.0]
+    assert backoff_delay(20) == BACKOFF_MAX
+
+
+@pytest.mark.parametrize(
+    ("status", "headers", "body", "expected"),
+    [
+        (200, {}, {}, None),
+        (403, {}, {"message": "Resource not accessible"}, None),
+        (403, {"Retry-After": "12"}, {}, 12.0),
+        (403, {}, {"message": "You have exceeded a secondary rate limit"}, SECONDARY_LIMIT_WAIT),
+        (429, {}, {}, SECONDARY_LIMIT_WAIT),
+        (429, {"Retry-After": "Thu, 01 Jan 1970 00:01:40 GMT"}, {}, 40.0),
+    ],
+)
+def test_throttle_delay(status, headers, body, expected):
+    assert throttle_delay(api_response(status, body, headers), now=60.0) == expected
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker()
+    for _ in range(FAILURE_THRESHOLD - 1):
+        breaker.record_failure("HTTP 502")
+    breaker.record_success()
+    for _ in range(FAILURE_THRESHOLD - 1):
+        breaker.record_failure("HTTP 502")
+    assert breaker.allow()
+    breaker.record_failure("HTTP 502")
+    assert not breaker.allow()
+    assert breaker.status_text() == f"API paused {OPEN_SECONDS:.0f}s (HTTP 502)"
+
+
+def test_breaker_lets_one_probe_through_after_the_cool_down(clock):
+    breaker = CircuitBreaker()
+    breaker.trip(OPEN_SECONDS, "outage")
+    clock.advance(OPEN_SECONDS)
+    assert breaker.allow()
+    assert not breaker.allow()  # Only one probe at a time
+
+    breaker.record_failure("HTTP 502")  # Failed probe: twice the cool-down
+    clock.advance(OPEN_SECONDS)
+    assert not breaker.allow()
+    clock.advance(OPEN_SECONDS)
+    assert breaker.allow()
+
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+    assert breaker.status_text() == ""
+
+
+def test_transient_failures_are_retried(make_client):
+    answers = iter([requests.ConnectionError("reset"), api_response(502), api_response(200)])
+
+    def handler(url, token):
+        answer = next(answers)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    client = make_client(handler)
+    assert client._get(RUN_URL) is not None
+    assert len(client.sent) == 3
+    assert client.breaker.allow()
+
+
+def test_retries_stop_after_max_retries(make_client):
+    client = make_client(lambda url, token: api_response(503))
+    assert client._get(RUN_URL) is None
+    assert len(client.sent) == MAX_RETRIES + 1
+
+
+def test_open_breaker_fails_fast(make_client, clock):
+    client = make_client(lambda url, token: api_response(502))
+    client._get(RUN_URL)
+    client._get(RUN_URL)  # Opens the breaker partway through its retries
+    assert len(client.sent) == FAILURE_THRESHOLD
+
+    assert client._get(RUN_URL) is None
+    assert len(client.sent) == FAILURE_THRESHOLD
+
+
+def test_throttling_response_pauses_without_retrying(make_client, clock):
+    client = make_client(lambda url, token: api_response(429, headers={"Retry-After": "30"}))
+    assert client._get(RUN_URL) is None
+    assert len(client.sent) == 1
+    assert client.breaker.status_text() == "API paused 30s (rate limited)"
+
+
+def test_probe_is_not_lost_while_every_token_is_rate_limited(make_client, clock):
+    reset = clock.now + 3600
+    exhausted = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)}
+    answers = iter([api_response(429, headers=exhausted), api_response(200)])
+    client = make_client(lambda url, token: next(answers))
+    assert client._get(RUN_URL) is None
+
+    clock.advance(SECONDARY_LIMIT_WAIT + 1)  # Breaker cool-down over, token still exhausted
+    assert client._get(RUN_URL) is None
+    assert len(client.sent) == 1
+
+    clock.now = reset + 1
+    assert client._get(RUN_URL) is not None
+    assert len(client.sent) == 2
+    assert client.breaker.status_text() == ""
@@ -0,0 +1,76 @@
+"""Seen-run windows: pruning, on-disk format and migration."""
+
+from __future__ import annotations
+
+import json
+
+from gh_actions_notifier.seen import WINDOW_SIZE, SeenWindow
+from gh_actions_notifier.state import StateManager
+
+
+def test_late_lower_id_is_not_seen_until_added():
+    window = SeenWindow()
+    window.add([10, 12, 13])
+    assert window.is_seen(12)
+    assert not window.is_seen(11)
+    assert window.max_id == 13
+
+    window.add([11])
+
+    assert window.is_seen(11)
+    assert window.ids == [10, 11, 12, 13]
+
+
+def test_prune_moves_low_water_mark_over_oldest_ids():
+    window = SeenWindow()
+    window.add(range(1, WINDOW_SIZE + 11))
+
+    assert len(window.ids) == WINDOW_SIZE
+    assert window.low == 10
+    assert window.ids[0] == 11
+    # Everything at or below the mark counts as seen, gaps included
+    assert window.is_seen(3)
+    assert not window.is_seen(WINDOW_SIZE + 11)
+
+
+def test_prune_keeps_gaps_above_the_mark_unseen():
+    window = SeenWindow()
+    window.add([i for i in range(1, WINDOW_SIZE + 3) if i != 40])
+
+    assert window.low == 1
+    assert not window.is_seen(40)
+
+
+def test_json_round_trip():
+    window = SeenWindow(1000, [1003, 1004, 1010])
+
+    encoded = window.to_json()
+    restored = SeenWindow.from_json(json.loads(json.dumps(encoded)))
+
+    assert encoded == [1000, 3, 1, 6]
+    assert (restored.low, restored.ids) == (1000, [1003, 1004, 1010])
+
+
+def test_from_json_accepts_legacy_and_empty_values():
+    assert SeenWindow.from_json(42).low == 42
+    assert SeenWindow.from_json(None).is_empty
+    assert SeenWindow.from_json([]).is_empty
+
+
+def test_state_migrates_legacy_last_seen_run_ids(appdata):
+    state_dir = appdata / "gh-actions-notifier"
+    state_dir.mkdir()
+    legacy = {"token": "t", "last_seen_run_ids": {"octo/app": 500, "octo/lib": 7}}
+    (state_dir / "state.json").write_text(json.dumps(legacy))
+
+    state = StateManager()
+
+    window = state.get_seen_window("octo/app")
+    assert (window.low, window.ids) == (500, [])
+    assert state.get_seen_window("octo/lib").low == 7
+    assert state.get_seen_window("octo/new").is_empty
+    state.mark_seen("octo/app", [501])
+    state.close()
+    saved = json.loads((state_dir / "state.json").read_text())
+    assert "last_seen_run_ids" not in saved
+    assert saved["seen_runs"]["octo/app"] == [500, 1]
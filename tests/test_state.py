@@ -0,0 +1,71 @@
+"""State journal replay and compaction."""
+
+from __future__ import annotations
+
+import json
+
+from gh_actions_notifier import state as state_module
+from gh_actions_notifier.state import StateManager
+
+
+def _paths(appdata):
+    state_dir = appdata / "gh-actions-notifier"
+    return state_dir / "state.json", state_dir / "state.journal"
+
+
+def test_updates_are_journaled_until_flush_compacts(appdata, monkeypatch):
+    monkeypatch.setattr(state_module, "JOURNAL_COMPACT_ENTRIES", 3)
+    snapshot, journal = _paths(appdata)
+    state = StateManager(journal=True)
+
+    state.mark_seen("octo/app", [1])
+    state.mark_seen("octo/app", [2])
+    state.flush()
+    assert len(journal.read_text().splitlines()) == 2
+    assert not snapshot.exists() or "octo/app" not in snapshot.read_text()
+
+    state.mark_seen("octo/app", [3])
+    state.flush()
+
+    assert not journal.exists()
+    saved = json.loads(snapshot.read_text())
+    assert saved["seen_runs"]["octo/app"] == [0, 1, 1, 1]
+
+
+def test_replay_ignores_torn_last_line(appdata):
+    snapshot, journal = _paths(appdata)
+    state = StateManager(journal=True)
+    state.mark_seen("octo/app", [10])
+    state.mark_seen("octo/app", [11])
+    # Simulate a crash halfway through the next append
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('{"op":"seen","repo":"octo/app","ids":[1')
+
+    restored = StateManager(journal=True)
+
+    window = restored.get_seen_window("octo/app")
+    assert window.ids == [10, 11]
+    assert not window.is_seen(12)
+    # Replay folds the journal into a fresh snapshot, so the torn line is gone
+    assert not journal.exists()
+    assert json.loads(snapshot.read_text())["seen_runs"]["octo/app"] == [0, 10, 1]
+
+
+def test_replay_applies_inflight_entries(appdata):
+    state = StateManager(journal=True)
+    state.set_inflight_runs([{"repo": "octo/app", "id": 5, "first_seen": 1.0}])
+
+    restored = StateManager(journal=True)
+
+    assert restored.get_inflight_runs() == [{"repo": "octo/app", "id": 5, "first_seen": 1.0}]
+
+
+def test_appends_after_replay_survive_another_restart(appdata):
+    state = StateManager(journal=True)
+    state.mark_seen("octo/app", [1])
+    restored = StateManager(journal=True)
+    restored.mark_seen("octo/app", [2])
+
+    again = StateManager(journal=True)
+
+    assert again.get_seen_window("octo/app").ids == [1, 2]
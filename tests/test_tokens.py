@@ -0,0 +1,124 @@
+"""Token pool selection, and which token each request of a listing goes out with."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+from conftest import API, api_response
+
+from gh_actions_notifier.github_async import AsyncGitHubClient
+from gh_actions_notifier.tokens import RATE_FLOOR, TokenPool
+
+ORG_TOKEN = {"name": "org", "token": "org-token", "owners": ["Octo"]}
+ANY_TOKEN = {"name": "any", "token": "any-token"}
+NEXT_PAGE = f'<{API}/repositories/42/actions/runs?page=2>; rel="next"'
+
+
+class FakeState:
+    token = "primary-token"
+
+
+def _pool(*entries) -> TokenPool:
+    return TokenPool(FakeState(), list(entries))
+
+
+def test_pick_prefers_the_token_with_most_headroom(clock):
+    pool = _pool(ORG_TOKEN)
+    primary, org = pool.slots
+    assert pool.pick("octo") is primary  # Ties go to the primary token
+    pool.update(primary, remaining=100, reset=clock.now + 60)
+    assert pool.pick("octo") is org
+    assert pool.pick("other") is primary  # org only reaches its owners
+    assert pool.pick(None) is primary  # User endpoints use the primary token
+
+
+def test_pick_skips_disabled_and_rate_limited_tokens(clock):
+    pool = _pool(ORG_TOKEN)
+    primary, org = pool.slots
+    pool.update(primary, remaining=100, reset=clock.now + 60)
+    pool.disable(org)
+    assert pool.pick("octo") is primary
+
+    pool.update(primary, remaining=RATE_FLOOR - 1)
+    assert pool.pick("octo") is None
+    clock.advance(61)  # Past the reset, the full budget is back
+    assert pool.pick("octo") is primary
+
+
+def test_disable_keeps_the_primary_token():
+    pool = _pool(ORG_TOKEN)
+    pool.disable(pool.primary)
+    assert not pool.primary.disabled
+
+
+def _listing(url: str, token: str):
+    """Two pages of runs; the second behind a /repositories/{id} Link URL."""
+    if "/repositories/" in url:
+        return api_response(200, {"workflow_runs": [{"id": 2}, {"id": 1}]})
+    return api_response(200, {"workflow_runs": [{"id": 4}, {"id": 3}]}, {"Link": NEXT_PAGE})
+
+
+def test_listing_keeps_its_token_across_pages(make_client, clock):
+    client = make_client(_listing, [ORG_TOKEN])
+    client.tokens.update(client.tokens.primary, remaining=100, reset=clock.now + 60)
+
+    runs = client.get_completed_runs("octo", "app", per_page=2, until_id=1)
+
+    assert [r["id"] for r in runs] == [4, 3, 2, 1]
+    assert [token for _, token in client.sent] == ["org-token", "org-token"]
+
+
+def test_refused_extra_token_falls_back_to_the_primary_token(make_client, clock):
+    def handler(url, token):
+        if token != "primary-token":
+            return api_response(404, {"message": "Not Found"})
+        return api_response(200, {"id": 7})
+
+    client = make_client(handler, [ANY_TOKEN])
+    client.tokens.update(client.tokens.primary, remaining=100, reset=clock.now + 60)
+
+    assert client.get_run("octo", "app", 7) == {"id": 7}
+    assert [token for _, token in client.sent] == ["any-token", "primary-token"]
+
+
+def test_refused_listing_stays_on_the_primary_token(make_client, clock):
+    def handler(url, token):
+        if token != "primary-token":
+            return api_response(403, {"message": "Resource not accessible by integration"})
+        return _listing(url, token)
+
+    client = make_client(handler, [ANY_TOKEN])
+    client.tokens.update(client.tokens.primary, remaining=100, reset=clock.now + 60)
+
+    runs = client.get_completed_runs("octo", "app", per_page=2, until_id=1)
+
+    assert [r["id"] for r in runs] == [4, 3, 2, 1]
+    assert [token for _, token in client.sent] == ["any-token", "primary-token", "primary-token"]
+
+
+def test_async_listing_keeps_its_token_across_pages(make_client, clock):
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        sent.append(token)
+        resp = _listing(url, token)
+        return httpx.Response(resp.status_code, headers=dict(resp.headers), content=resp.content)
+
+    client = make_client(_listing, [ORG_TOKEN])
+    client.tokens.update(client.tokens.primary, remaining=100, reset=clock.now + 60)
+    async_client = AsyncGitHubClient(client)
+    async_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def list_runs():
+        try:
+            return await async_client.get_completed_runs("octo", "app", per_page=2, until_id=1)
+        finally:
+            await async_client.aclose()
+
+    runs = asyncio.run(list_runs())
+
+    assert [r["id"] for r in runs] == [4, 3, 2, 1]
+    assert sent == ["org-token", "org-token"]
@@ -0,0 +1,122 @@
+"""Webhook receiver, driven by a local client posting signed deliveries."""
+
+from __future__ import annotations
+
+import http.client
+import json
+
+import pytest
+
+from gh_actions_notifier.seen import SeenWindow
+from gh_actions_notifier.webhook import WebhookServer, sign
+
+REPO = "octo/app"  # The fake_github fixture's only repo
+SECRET = "s3cret"
+
+
+@pytest.fixture
+def poller(make_poller, fake_github):
+    for run_id in range(101, 111):
+        fake_github.add_run(REPO, run_id)
+    return make_poller(SeenWindow(100, list(range(101, 111))), blocklist=["octo/legacy"])
+
+
+@pytest.fixture
+def receiver(poller):
+    server = WebhookServer(poller, SECRET, port=0)
+    server.start()
+    yield server
+    server.stop()
+
+
+def _payload(run_id: int, repo: str = REPO, action: str = "completed") -> bytes:
+    run = {
+        "id": run_id,
+        "name": "CI",
+        "status": "completed",
+        "conclusion": "failure",
+        "head_branch": "main",
+        "head_sha": f"sha{run_id}",
+        "html_url": f"https://github.com/{repo}/actions/runs/{run_id}",
+    }
+    payload = {"action": action, "workflow_run": run, "repository": {"full_name": repo}}
+    return json.dumps(payload).encode()
+
+
+def _post(receiver, body: bytes, signature=None, delivery="d1", event="workflow_run") -> int:
+    conn = http.client.HTTPConnection(*receiver.address, timeout=5)
+    headers = {"X-GitHub-Event": event, "X-GitHub-Delivery": delivery}
+    if signature is not None:
+        headers["X-Hub-Signature-256"] = signature
+    try:
+        conn.request("POST", "/", body=body, headers=headers)
+        return conn.getresponse().status
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize(
+    "signature",
+    [None, "", "sha256=" + "0" * 64, sign("wrong", _payload(111)), "sha256=éé"],
+    ids=["missing", "empty", "zeros", "other-secret", "non-ascii"],
+)
+def test_bad_signatures_are_rejected(receiver, notifier, signature):
+    assert _post(receiver, _payload(111), signature) == 401
+    assert notifier.run_ids == []
+
+
+def test_signed_delivery_notifies_once_per_delivery_id(receiver, notifier):
+    body = _payload(111)
+
+    assert _post(receiver, body, sign(SECRET, body), delivery="d1") == 200
+    assert _post(receiver, body, sign(SECRET, body), delivery="d1") == 200
+
+    assert notifier.run_ids == [111]
+
+
+def test_redelivery_under_a_new_id_is_deduplicated_by_run(receiver, notifier):
+    body = _payload(111)
+
+    _post(receiver, body, sign(SECRET, body), delivery="d1")
+    _post(receiver, body, sign(SECRET, body), delivery="d2")
+
+    assert notifier.run_ids == [111]
+
+
+def test_ping_and_other_events_are_acknowledged(receiver, notifier):
+    body = b"{}"
+    assert _post(receiver, body, sign(SECRET, body), event="ping") == 200
+    assert _post(receiver, body, sign(SECRET, body), event="push") == 202
+    in_progress = _payload(111, action="in_progress")
+    assert _post(receiver, in_progress, sign(SECRET, in_progress)) == 202
+    assert notifier.run_ids == []
+
+
+def test_filtered_out_repo_is_not_notified(receiver, notifier):
+    body = _payload(500, repo="octo/legacy")
+
+    assert _post(receiver, body, sign(SECRET, body)) == 200
+
+    assert notifier.run_ids == []
+
+
+def test_poll_does_not_repeat_a_webhook_run(receiver, poller, fake_github, notifier):
+    body = _payload(111)
+    _post(receiver, body, sign(SECRET, body))
+    fake_github.add_run(REPO, 111, conclusion="failure")
+    fake_github.add_run(REPO, 112)
+
+    poller.poll_once()
+
+    assert notifier.run_ids == [111, 112]
+
+
+def test_webhook_does_not_repeat_a_polled_run(receiver, poller, fake_github, notifier):
+    fake_github.add_run(REPO, 111)
+    poller.poll_once()
+    assert notifier.run_ids == [111]
+
+    body = _payload(111)
+    assert _post(receiver, body, sign(SECRET, body)) == 200
+
+    assert notifier.run_ids == [111]